@@ -4,6 +4,8 @@
 启动游戏客户端，连接到服务器并显示游戏界面。
 """
 
+import bisect
+import functools
 import logging
 import sys
 from pathlib import Path
@@ -11,6 +13,7 @@ import math
 import uuid
 import os
 import subprocess
+from collections import deque
 from typing import Any, Callable, Dict, List, Optional
 
 # 添加项目根目录到路径（保留以便直接运行脚本时能找到包）
@@ -27,7 +30,7 @@ from src.shared.constants import (
     WINDOW_HEIGHT, WINDOW_TITLE, WINDOW_WIDTH,
     MSG_CREATE_ROOM, MSG_JOIN_ROOM, MSG_LIST_ROOMS, MSG_KICK_PLAYER, MSG_START_GAME, MSG_ROOM_UPDATE, MSG_LEAVE_ROOM,
     MSG_CHAT, MSG_NEXT_ROUND, MSG_GIVE_SCORE, MSG_GAME_RESULT,
-    DEFAULT_HOST, DEFAULT_PORT
+    DEFAULT_HOST, DEFAULT_PORT, BRUSH_COLORS, BRUSH_SIZES
 )
 from src.client.network import NetworkClient
 from src.client.ui.button import Button
@@ -35,7 +38,9 @@ from src.client.ui.buttons_config import BUTTONS_CONFIG
 from src.client.ui.canvas import Canvas
 from src.client.ui.toolbar import Toolbar
 from src.client.ui.text_input import TextInput
-from src.client.ui.chat import ChatPanel
+from src.client.ui.chat import ChatPanel, clear_font_cache as clear_chat_font_cache
+from src.client.ui.fonts import get_font, clear_font_cache as clear_widget_font_cache
+from src.client.ui.setting_components import make_slider_rect
 # Project root and resource paths
 ROOT = Path(__file__).parent.parent.parent
 SETTINGS_PATH = ROOT / "settings.json"
@@ -53,11 +58,56 @@ LOGO_BREATH_AMPLITUDE = 0.06
 LOGO_BREATH_FREQ = 0.5
 LOGO_SWING_AMP = 4.0
 LOGO_SWING_FREQ = 0.2
+# 呼吸（2s）与摆动（5s）的公共周期为 10s；按整数 tick 相位查表，避免每帧 sin 运算
+LOGO_PHASE_PERIOD_MS = 10000
+LOGO_PHASE_STEPS = 512
+# 相位表：每项为已量化（缩放 1%、角度 1°）的 (scale, angle)，与 LOGO_CACHE 的键一一对应
+LOGO_PHASES = [
+    (
+        round(100 * (1.0 + LOGO_BREATH_AMPLITUDE * math.sin(2 * math.pi * LOGO_BREATH_FREQ * t))) / 100.0,
+        float(round(LOGO_SWING_AMP * math.sin(2 * math.pi * LOGO_SWING_FREQ * t))),
+    )
+    for t in (i * LOGO_PHASE_PERIOD_MS / LOGO_PHASE_STEPS / 1000.0 for i in range(LOGO_PHASE_STEPS))
+]
+# 缩放按 1% 量化、角度按 1° 量化后，一个完整动画周期约 100 个组合，缓存容量需覆盖整个周期
+LOGO_CACHE_MAX = 128
+# 已缩放+旋转的 logo 帧缓存：(scale 百分比, 角度) -> Surface，按插入顺序 FIFO 淘汰
+LOGO_CACHE: Dict[tuple, pygame.Surface] = {}
 # Button entrance animation parameters
 BUTTON_SLIDE_DURATION = 1.0  # seconds
 BUTTON_STAGGER = 0.2  # seconds between staggered starts
+BUTTON_SLIDE_STEP_MS = 16  # resolution of the precomputed slide-in schedule
+
+# 无持续动画的界面在空闲时最多阻塞等待事件的时长（毫秒）
+IDLE_EVENT_WAIT_MS = 100
+# 网络接收线程收到消息后投递的事件，唤醒静态界面上阻塞的 event.wait
+NET_MESSAGE_EVENT = pygame.USEREVENT
+# 有持续动画（logo 呼吸、按钮入场、绘画同步等）的界面
+ANIMATED_SCREENS = ("menu", "play", "creating_room")
+# 内容基本静止的界面：只把本帧变化的区域提交给 display.update，其余界面整屏 flip
+PARTIAL_UPDATE_SCREENS = ("settings", "result")
 
 # App state
+# 设置界面的主题配色，切换主题时整体替换 APP_STATE["palette"]
+THEME_PALETTES: Dict[str, Dict[str, tuple]] = {
+    "light": {
+        "bg": (240, 242, 250),
+        "panel_bg": (255, 255, 255),
+        "panel_border": (180, 200, 220),
+        "title": (50, 80, 150),
+        "label": (60, 60, 60),
+        "value": (80, 80, 80),
+    },
+    "dark": {
+        "bg": (28, 30, 35),
+        "panel_bg": (40, 44, 52),
+        "panel_border": (80, 90, 110),
+        "title": (200, 220, 255),
+        "label": (210, 210, 210),
+        "value": (220, 220, 220),
+    },
+}
+
 APP_STATE: Dict[str, Any] = {
     "screen": "menu",  # menu | room_list | lobby | play | settings | creating_room
     "ui": None,
@@ -73,8 +123,10 @@ APP_STATE: Dict[str, Any] = {
     },
     "net": None,
     "rooms": [],  # List of room info
+    "rooms_version": 0,  # rooms 每次被替换时递增，用于判断房间按钮是否需要重建
     "current_room": None,  # Room info dict
-    "notifications": [],  # List[Dict[str, Any]] with text, color, end_time
+    "players_version": 0,  # current_room 每次更新时递增，用于失效渲染缓存
+    "notifications": deque(),  # Deque[Dict[str, Any]] with text, color, end_time，按 end_time 升序
     # resize 防抖：在窗口调整结束后再重建 UI，减少频繁重建导致的卡顿
     "pending_resize_until": 0,
     "pending_resize_size": None,
@@ -83,6 +135,20 @@ APP_STATE: Dict[str, Any] = {
     "_saved_chat_scroll": None,
     # 创建房间加载界面使用的实时日志
     "creating_logs": [],
+    # 帧脏标志：事件、网络消息、resize 与动画会置为 True，未变化时跳过重绘
+    "_frame_dirty": True,
+    # 本帧登记的无参网络请求（如 "list_rooms"），在帧末由 _flush_net_pending 合并发送
+    "_net_pending": set(),
+    # 本帧按需查询的鼠标位置缓存（每帧开始时清空）
+    "_frame_mouse_pos": None,
+    # 显示器刷新周期（毫秒），启动与显示模式重建时更新，事件轮询据此节流
+    "_frame_period_ms": 16,
+    # 局部刷新：本帧需要提交到屏幕的区域，以及上一帧的组件状态快照 (ui, 帧参数, 状态列表)
+    "dirty_rects": [],
+    "_partial_state": None,
+    "_notification_rects": [],
+    # 当前主题的配色（THEME_PALETTES 中的一项），随主题切换更新
+    "palette": THEME_PALETTES["light"],
 }
 
 
@@ -98,6 +164,13 @@ def load_settings() -> None:
                         APP_STATE["settings"][k] = data[k]
     except Exception as exc:
         logger.warning("加载设置失败: %s", exc)
+    set_theme(APP_STATE["settings"].get("theme", "light"))
+
+
+def set_theme(theme: str) -> None:
+    """切换主题并同步对应的配色表（未知主题按 light 处理）。"""
+    APP_STATE["settings"]["theme"] = theme
+    APP_STATE["palette"] = THEME_PALETTES.get(theme, THEME_PALETTES["light"])
 
 
 def save_settings() -> None:
@@ -113,12 +186,108 @@ def save_settings() -> None:
 
 
 def add_notification(text: str, color=(50, 200, 50), duration=2.0) -> None:
-    """添加一个临时的屏幕通知。"""
-    APP_STATE["notifications"].append({
-        "text": text,
-        "color": color,
-        "end_time": pygame.time.get_ticks() + duration * 1000
-    })
+    """添加一个临时的屏幕通知。
+
+    队列按到期时间保持升序，渲染时只需从左侧弹出已过期的通知。
+    """
+    notifications = APP_STATE["notifications"]
+    end_time = pygame.time.get_ticks() + duration * 1000
+    entry = {"text": text, "color": color, "end_time": end_time}
+    if not notifications or notifications[-1]["end_time"] <= end_time:
+        notifications.append(entry)
+    else:
+        # 持续时间较短的通知插入到对应位置
+        notifications.insert(bisect.bisect_right([n["end_time"] for n in notifications], end_time), entry)
+
+
+@functools.lru_cache(maxsize=512)
+def _render(text: str, font_key: tuple, color: tuple) -> pygame.Surface:
+    """渲染并缓存文本 Surface（抗锯齿），font_key 为 get_font 的 (name, size[, bold]) 参数。"""
+    return get_font(*font_key).render(text, True, color)
+
+
+@functools.lru_cache(maxsize=1024)
+def _text_size(text: str, font_key: tuple) -> tuple:
+    """测量并缓存文本像素尺寸，仅用于布局计算，不做光栅化。"""
+    return get_font(*font_key).size(text)
+
+
+@functools.lru_cache(maxsize=256)
+def _wrap(text: str, max_w: int, font_key: tuple) -> tuple:
+    """按像素宽度折行：二分查找每行能容纳的最长前缀，只调用 font.size。
+
+    每行至少保留一个字符，保证过窄时也能推进。返回行元组（可缓存）。
+    """
+    font = get_font(*font_key)
+    # 常见情况：整段一行即可放下，只需一次 font.size
+    if font.size(text)[0] <= max_w:
+        return (text,)
+    lines = []
+    remaining = text
+    while remaining:
+        lo, hi = 1, len(remaining)
+        best = 1
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            if font.size(remaining[:mid])[0] <= max_w:
+                best = mid
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        lines.append(remaining[:best])
+        remaining = remaining[best:]
+    return tuple(lines) or (text,)
+
+
+def _detect_frame_period_ms() -> int:
+    """根据显示器刷新率计算帧周期（毫秒），无法获取时回退到 16ms（约 60Hz）。"""
+    try:
+        get_rate = getattr(pygame.display, "get_current_refresh_rate", None)
+        rate = int(get_rate()) if get_rate else 0
+    except Exception:
+        rate = 0
+    if rate <= 0:
+        return 16
+    return max(1, 1000 // rate)
+
+
+def queue_net_request(op: str) -> None:
+    """登记一个无参网络请求（同一帧内重复登记只发送一次）。"""
+    APP_STATE["_net_pending"].add(op)
+
+
+def _flush_net_pending() -> None:
+    """将本帧登记的网络请求与暂存的绘画折线一次性发送（未连接时丢弃）。"""
+    pending = APP_STATE["_net_pending"]
+    net = APP_STATE.get("net")
+    if net is not None and net.connected:
+        if pending:
+            net.flush(pending)
+        net.flush_draw()
+    pending.clear()
+
+
+# 各界面的 UI 构建函数（界面名 -> builder(screen_size)），由 main() 在创建窗口后注册
+UI_BUILDERS: Dict[str, Callable[[tuple], Dict[str, Any]]] = {}
+
+
+def _ensure_ui() -> Optional[Dict[str, Any]]:
+    """若当前界面的 UI 尚未构建，则调用已注册的构建函数立即构建。"""
+    ui = APP_STATE["ui"]
+    if ui is None:
+        builder = UI_BUILDERS.get(APP_STATE["screen"])
+        surface = pygame.display.get_surface()
+        if builder is not None and surface is not None:
+            ui = APP_STATE["ui"] = builder(surface.get_size())
+    return ui
+
+
+def _set_screen(name: str) -> Optional[Dict[str, Any]]:
+    """切换界面并在切换时立即构建其 UI，切换后的第一帧无需在渲染路径中构建。"""
+    APP_STATE["screen"] = name
+    APP_STATE["ui"] = None
+    APP_STATE["_frame_dirty"] = True
+    return _ensure_ui()
 
 
 def ensure_player_identity() -> str:
@@ -130,6 +299,12 @@ def ensure_player_identity() -> str:
     return pid
 
 
+def _post_net_message_event() -> None:
+    """（在接收线程中调用）投递 NET_MESSAGE_EVENT；已有未处理的同类事件时不重复投递"""
+    if pygame.display.get_init() and not pygame.event.peek(NET_MESSAGE_EVENT):
+        pygame.event.post(pygame.event.Event(NET_MESSAGE_EVENT))
+
+
 def get_network_client() -> NetworkClient:
     net = APP_STATE.get("net")
     if net is None:
@@ -137,6 +312,8 @@ def get_network_client() -> NetworkClient:
         shost = APP_STATE["settings"].get("server_host", DEFAULT_HOST)
         sport = int(APP_STATE["settings"].get("server_port", DEFAULT_PORT))
         net = NetworkClient(host=shost, port=sport)
+        # 大厅、房间列表等界面依赖网络消息更新，收到消息时立即唤醒主循环
+        net.on_messages = _post_net_message_event
         APP_STATE["net"] = net
     return net
 
@@ -307,9 +484,37 @@ def load_logo(path: Path, screen_size: tuple):
     base_h = max(1, int(base_w * orig_h / orig_w))
     # anchor at top-right with small margin from the screen edge
     anchor_pos = (sw - int(sw * 0.04), int(sh * 0.04))
+    # base size changed: cached animation frames are stale
+    LOGO_CACHE.clear()
     return orig, (base_w, base_h), anchor_pos
 
 
+def get_logo_frame(orig: pygame.Surface, base_size: tuple, scale: float, angle: float) -> pygame.Surface:
+    """Return the logo scaled by `scale` and rotated by `angle`, cached on quantized inputs.
+
+    Scale is quantized to 1% and angle to 1 degree, so steady-state menu frames are a
+    dict lookup + blit instead of smoothscale + rotate.
+    """
+    key = (round(scale * 100), round(angle))
+    frame = LOGO_CACHE.get(key)
+    if frame is not None:
+        return frame
+
+    base_w, base_h = base_size
+    q_scale = key[0] / 100.0
+    size = (max(1, int(base_w * q_scale)), max(1, int(base_h * q_scale)))
+    try:
+        scaled = pygame.transform.smoothscale(orig, size)
+    except Exception:
+        scaled = pygame.transform.scale(orig, size)
+    frame = pygame.transform.rotate(scaled, key[1])
+
+    if len(LOGO_CACHE) >= LOGO_CACHE_MAX:
+        del LOGO_CACHE[next(iter(LOGO_CACHE))]
+    LOGO_CACHE[key] = frame
+    return frame
+
+
 def anchor_to_pos(
     anchor: str, dx: int, dy: int, screen_w: int, screen_h: int, btn_w: int, btn_h: int
 ) -> tuple:
@@ -362,6 +567,43 @@ def resolve_position_and_size(cfg: Dict[str, Any], screen_size: tuple) -> tuple:
     return x, y, w, h
 
 
+def _slide_schedule(start_x: int, target_x: int) -> tuple:
+    """Precompute eased (ease-out cubic) x positions every BUTTON_SLIDE_STEP_MS.
+
+    The last entry is always ``target_x`` so the animation ends exactly on target.
+    """
+    dur_ms = int(BUTTON_SLIDE_DURATION * 1000)
+    xs = []
+    for t_ms in range(0, dur_ms, BUTTON_SLIDE_STEP_MS):
+        eased = 1 - pow(1 - t_ms / dur_ms, 3)
+        xs.append(int(start_x + (target_x - start_x) * eased))
+    xs.append(target_x)
+    return tuple(xs)
+
+
+def update_button_slides(buttons: List[Button], now_ms: int) -> bool:
+    """Move menu buttons along their slide-in schedules; return True once all are done."""
+    all_finished = True
+    for b in buttons:
+        anim = BUTTON_ANIMS.get(id(b))
+        if not anim or anim["finished"]:
+            continue
+        elapsed = now_ms - anim["delay_ms"]
+        if elapsed <= 0:
+            b.set_position(anim["start_x"], anim["y"])
+            all_finished = False
+            continue
+        sched = anim["schedule"]
+        i = elapsed // BUTTON_SLIDE_STEP_MS
+        if i >= len(sched) - 1:
+            b.set_position(sched[-1], anim["y"])
+            anim["finished"] = True
+        else:
+            b.set_position(sched[i], anim["y"])
+            all_finished = False
+    return all_finished
+
+
 def create_buttons_from_config(
     config_list: List[Dict[str, Any]],
     callbacks_map: Dict[str, Callable[..., Any]],
@@ -440,6 +682,8 @@ def create_buttons_from_config(
             "y": y,
             "duration": BUTTON_SLIDE_DURATION,
             "delay": idx * BUTTON_STAGGER,
+            "delay_ms": int(idx * BUTTON_STAGGER * 1000),
+            "schedule": _slide_schedule(start_x, target_x) if screen_filter == "menu" else (target_x,),
             "finished": False if screen_filter == "menu" else True,
         }
 
@@ -450,18 +694,13 @@ def create_buttons_from_config(
 
 def on_start() -> None:
     logger.info("Start pressed")
-    APP_STATE["screen"] = "room_list"
-    APP_STATE["ui"] = None
-    # Connect and list rooms
-    net = get_network_client()
-    if net.connect(APP_STATE["settings"]["player_name"], APP_STATE["settings"].get("player_id")):
-        net.list_rooms()
+    # 进入房间列表时由其构建函数负责连接并拉取列表
+    _set_screen("room_list")
 
 
 def on_settings() -> None:
     logger.info("Settings pressed")
-    APP_STATE["screen"] = "settings"
-    APP_STATE["ui"] = None
+    _set_screen("settings")
 
 
 def on_quit() -> None:
@@ -507,9 +746,6 @@ def build_play_ui(screen_size: tuple) -> Dict[str, Any]:
     # 组件
     canvas = Canvas(canvas_rect)
 
-    # 颜色与画笔大小来自常量
-    from src.shared.constants import BRUSH_COLORS, BRUSH_SIZES
-
     # 获取预加载的音效（如果存在）
     confirm_sound = None
     try:
@@ -525,7 +761,7 @@ def build_play_ui(screen_size: tuple) -> Dict[str, Any]:
     # 尝试从保存的消息恢复（窗口大小改变时）
     saved_messages = APP_STATE.get("_saved_chat_messages")
     if saved_messages:
-        chat.messages = saved_messages
+        chat.messages.extend(saved_messages)
         # 恢复滚动状态
         saved_scroll = APP_STATE.get("_saved_chat_scroll", 0)
         chat.scroll_offset = saved_scroll
@@ -538,7 +774,7 @@ def build_play_ui(screen_size: tuple) -> Dict[str, Any]:
         if old_ui and isinstance(old_ui, dict) and "chat" in old_ui:
             old_chat = old_ui["chat"]
             if hasattr(old_chat, "messages") and old_chat.messages:
-                chat.messages = old_chat.messages[:]
+                chat.messages.extend(old_chat.messages)
                 if hasattr(old_chat, "scroll_offset"):
                     chat.scroll_offset = old_chat.scroll_offset
 
@@ -617,8 +853,6 @@ def build_settings_ui(screen_size: tuple, confirm_sound: Optional[pygame.mixer.S
     slider_w = max(260, min(620, int(sw * 0.46)))
     slider_h = 25
 
-    from src.client.ui.setting_components import make_slider_rect
-
     # 玩家名字输入框
     player_name_label = "玩家名字"
     player_name_input = TextInput(
@@ -791,7 +1025,7 @@ def build_room_list_ui(screen_size: tuple) -> Dict[str, Any]:
         player_id = APP_STATE["settings"].get("player_id") or ensure_player_identity()
         net = get_network_client()
         if net.connect(APP_STATE["settings"]["player_name"], player_id):
-            net.list_rooms()
+            queue_net_request("list_rooms")
         else:
             add_notification("无法连接服务器，检查地址与端口", color=(200, 60, 60))
     refresh_btn.on_click = _on_refresh
@@ -814,8 +1048,7 @@ def build_room_list_ui(screen_size: tuple) -> Dict[str, Any]:
             if net.connect(player_name, player_id):
                 logger.info("连接成功，发送创建房间请求")
                 # 切换到简易加载界面，避免用户误以为卡死
-                APP_STATE["screen"] = "creating_room"
-                APP_STATE["ui"] = None
+                _set_screen("creating_room")
                 # 初始化创建房间日志
                 APP_STATE["creating_logs"] = [
                     "已连接到服务器",
@@ -840,6 +1073,7 @@ def build_room_list_ui(screen_size: tuple) -> Dict[str, Any]:
                             str(player_id): {"name": player_name, "score": 0}
                         }
                     }
+                    _bump_players_version()
                 except Exception:
                     pass
             else:
@@ -862,8 +1096,7 @@ def build_room_list_ui(screen_size: tuple) -> Dict[str, Any]:
         if net:
             net.close()
             APP_STATE["net"] = None
-        APP_STATE["screen"] = "menu"
-        APP_STATE["ui"] = None
+        _set_screen("menu")
     back_btn.on_click = _on_back
 
     return {
@@ -885,13 +1118,21 @@ def build_result_ui(screen_size: tuple) -> Dict[str, Any]:
         font_name="Microsoft YaHei", font_size=22
     )
     def _on_back():
-        APP_STATE["screen"] = "lobby"
-        APP_STATE["ui"] = None
         APP_STATE["game_result"] = None
+        _set_screen("lobby")
     back_btn.on_click = _on_back
 
+    # 排名行半透明背景：金/银/铜/其他，构建时一次性生成，渲染时按名次直接 blit
+    rank_bg_surfs = []
+    for color, alpha in (((255, 215, 0), 120), ((192, 192, 192), 120), ((205, 127, 50), 120), ((220, 220, 220), 80)):
+        surf = pygame.Surface((500, 45))
+        surf.set_alpha(alpha)
+        surf.fill(color)
+        rank_bg_surfs.append(surf)
+
     return {
         "back_btn": back_btn,
+        "rank_bg_surfs": rank_bg_surfs,
     }
 
 
@@ -918,9 +1159,7 @@ def build_lobby_ui(screen_size: tuple) -> Dict[str, Any]:
     def _on_leave():
         net = get_network_client()
         net.leave_room()
-        APP_STATE["screen"] = "room_list"
-        APP_STATE["ui"] = None
-        net.list_rooms()
+        _set_screen("room_list")
     leave_btn.on_click = _on_leave
 
     # 房主设置折叠状态（使用全局 APP_STATE 存储，避免重建 UI 时丢失）
@@ -1041,7 +1280,7 @@ def build_lobby_ui(screen_size: tuple) -> Dict[str, Any]:
             rounds_input.rect.y -= shift
             time_input.rect.y -= shift
             rest_input.rect.y -= shift
-            apply_btn.rect.y -= shift
+            apply_btn.set_position(apply_btn.rect.x, apply_btn.rect.y - shift)
 
     # 聊天面板（放置在大厅底部，横向铺满，避免遮挡玩家列表）
     chat_rect = pygame.Rect(pad, sh - chat_h - pad, sw - pad * 2, chat_h)
@@ -1076,7 +1315,7 @@ def build_lobby_ui(screen_size: tuple) -> Dict[str, Any]:
     send_btn.on_click = _on_send
     chat_input.on_submit = lambda text: _on_send()
 
-    return {
+    ui = {
         "start_btn": start_btn,
         "leave_btn": leave_btn,
         "settings_toggle_btn": settings_toggle_btn,
@@ -1089,45 +1328,438 @@ def build_lobby_ui(screen_size: tuple) -> Dict[str, Any]:
         "chat_input": chat_input,
         "send_btn": send_btn,
     }
+    _layout_lobby_settings_panel(ui)
+    return ui
+
+
+# 设置界面的静态标签：(文本, 位置在 ui 中的键)
+SETTINGS_LABELS = (
+    ("玩家名字:", "player_name_label_pos"),
+    ("音量:", "volume_label_pos"),
+    ("服务器地址:", "server_host_label_pos"),
+    ("主题:", "theme_label_pos"),
+)
+SETTINGS_LABEL_FONT = ("Microsoft YaHei", 24)
+
+
+def _layout_settings_ui(ui: Dict[str, Any], size: tuple) -> None:
+    """预先计算设置界面的面板、标签与音量数值位置，并摆放返回按钮。
+
+    这些位置只取决于窗口尺寸、组件 rect 与标签宽度，在构建 UI 时计算一次即可。
+    """
+    sw, sh = size
+    panel_rect = pygame.Rect(20, 20, sw - 40, sh - 40)
+    ui["settings_panel_rect"] = panel_rect
+
+    # 标签右对齐到对应组件左侧，并与组件垂直居中
+    anchors = {"player_name_label_pos": ui["player_name_input"].rect, "volume_label_pos": ui["volume_slider_rect"]}
+    if ui.get("server_host_input"):
+        anchors["server_host_label_pos"] = ui["server_host_input"].rect
+    for text, pos_key in SETTINGS_LABELS:
+        rect = anchors.get(pos_key)
+        if rect is None:
+            continue
+        label_w, label_h = _text_size(text, SETTINGS_LABEL_FONT)
+        label_x = max(panel_rect.x + 20, rect.x - label_w - 16)
+        label_y = rect.y + (rect.height - label_h) // 2
+        ui[pos_key] = (label_x, label_y)
+
+    theme_btn = ui.get("light_btn") or ui.get("dark_btn")
+    theme_y = theme_btn.rect.y + 6 if theme_btn else panel_rect.y + 220
+    ui["theme_label_pos"] = (panel_rect.x + 20, theme_y)
+
+    slider_rect = ui["volume_slider_rect"]
+    ui["volume_value_pos"] = (slider_rect.right + 16, slider_rect.y - 2)
+
+    # 将返回按钮放置在面板的右上角，避免遮挡面板内部内容
+    if ui.get("back_btn"):
+        bb = ui["back_btn"]
+        margin = 20
+        bb.set_position(panel_rect.right - bb.rect.width - margin, panel_rect.y + margin)
+
+
+def _build_settings_chrome(ui: Dict[str, Any], size: tuple, palette: Dict[str, tuple]) -> pygame.Surface:
+    """将设置界面的静态部分（背景、面板、标题、分隔线与各项标签）绘制到一张整屏 Surface。
+
+    标签位置由 _layout_settings_ui 预先计算；尺寸或主题变化时由调用方重建。
+    """
+    sw, sh = size
+    chrome = pygame.Surface(size).convert()
+    chrome.fill(palette["bg"])
+
+    # 设置面板（白色背景，有边框）与分隔线
+    panel_rect = ui["settings_panel_rect"]
+    pygame.draw.rect(chrome, palette["panel_bg"], panel_rect)
+    pygame.draw.rect(chrome, palette["panel_border"], panel_rect, 3)
+    pygame.draw.line(chrome, (200, 200, 200), (50, 90), (sw - 50, 90), 2)
+
+    # 标题与各项标签
+    label_color = palette["label"]
+    label_blits = [(_render("游戏设置", ("Microsoft YaHei", 40), palette["title"]), (50, 30))]
+    for text, pos_key in SETTINGS_LABELS:
+        if pos_key in ui:
+            label_blits.append((_render(text, SETTINGS_LABEL_FONT, label_color), ui[pos_key]))
+    chrome.blits(label_blits, doreturn=False)
+    return chrome
+
+
+def _layout_lobby_settings_panel(ui: Dict[str, Any]) -> None:
+    """预先计算房主设置面板的几何与标签 Surface（输入框位置只在重建 UI 时变化）。
+
+    结果写入 ui["_settings_panel_rect"]、ui["_settings_label_surfs"]、ui["_settings_label_positions"]，
+    并将“应用设置”按钮水平居中到面板内。
+    """
+    label_key = ("Microsoft YaHei", 20)
+    label_rows = (("轮数", ui["rounds_input"].rect), ("时间/轮", ui["time_input"].rect), ("休息", ui["rest_input"].rect))
+    input_rects = [rect for _, rect in label_rows]
+    apply_btn = ui["apply_btn"]
+
+    # 标签最大宽度，用于为标签预留足够的左侧空间
+    max_label_w = max(_text_size(label, label_key)[0] for label, _ in label_rows)
+
+    # 面板整体区域（包含标题、三个输入框和按钮）；按钮居中会改变面板右边界，迭代到稳定（每次距离减半）
+    panel_rect = None
+    for _ in range(32):
+        panel_left = min(r.x for r in input_rects) - (max_label_w + 30)
+        panel_top = min(r.y for r in input_rects) - 40
+        panel_right = max(max(r.right for r in input_rects), apply_btn.rect.right) + 20
+        panel_bottom = apply_btn.rect.bottom + 20
+        panel_rect = pygame.Rect(panel_left, panel_top, panel_right - panel_left, panel_bottom - panel_top)
+        new_x = panel_left + (panel_rect.width - apply_btn.rect.width) // 2
+        if apply_btn.rect.x == new_x:
+            break
+        apply_btn.set_position(new_x, apply_btn.rect.y)
+
+    # 标题在面板左上角；标签与对应输入框垂直居中，并整体位于输入框左侧，不会被盖住
+    label_surfs = {"房主游戏设置": _render("房主游戏设置", label_key, (60, 60, 80))}
+    label_positions = {"房主游戏设置": (panel_rect.x + 10, panel_rect.y + 10)}
+    for label, rect in label_rows:
+        surf = _render(label, label_key, (60, 60, 60))
+        label_surfs[label] = surf
+        label_positions[label] = (rect.x - surf.get_width() - 10, rect.y + (rect.height - surf.get_height()) // 2)
+
+    ui["_settings_panel_rect"] = panel_rect
+    ui["_settings_label_surfs"] = label_surfs
+    ui["_settings_label_positions"] = label_positions
+
+
+def _collect_widgets(ui: Dict[str, Any], keys) -> List[Any]:
+    """按顺序收集 ui 中存在的组件，用于构建一次性的事件分发列表。"""
+    return [ui[k] for k in keys if ui.get(k) is not None]
+
+
+def _dispatch_mousewheel(ui: Dict[str, Any], event: pygame.event.Event) -> None:
+    """将滚轮事件分发给鼠标所在的可滚动组件（ui["_mousewheel_targets"]）。"""
+    targets = ui.get("_mousewheel_targets")
+    if not targets:
+        return
+    try:
+        # pygame-ce 的 MOUSEWHEEL 自带 pos；否则使用本帧缓存的鼠标位置（每帧最多查询一次 SDL）
+        mouse_pos = getattr(event, "pos", None) or APP_STATE.get("_frame_mouse_pos")
+        if mouse_pos is None:
+            mouse_pos = APP_STATE["_frame_mouse_pos"] = pygame.mouse.get_pos()
+        for widget in targets:
+            if widget.rect.collidepoint(mouse_pos):
+                widget.handle_scroll(event.y)
+    except Exception:
+        pass
+
+
+def _sync_room_buttons(ui: Dict[str, Any]) -> None:
+    """根据 APP_STATE["rooms"] 重建房间按钮（rooms_version 未变化时跳过）。"""
+    rooms = APP_STATE.get("rooms")
+    rooms_version = APP_STATE.get("rooms_version", 0)
+    if ui.get("_rooms_version") == rooms_version:
+        return
+    room_buttons = []
+    start_y = 150
+    stride = 60
+    for i, r in enumerate(rooms or []):
+        rid = r["room_id"]
+        count = r["player_count"]
+        status = r["status"]
+        btn = Button(
+            x=50, y=start_y + i * stride, width=400, height=50,
+            text=f"房间 {rid} ({count}人) - {status}",
+            bg_color=(200, 200, 200), fg_color=(0, 0, 0),
+            font_name="Microsoft YaHei", font_size=20
+        )
+        def _join(rid=rid):
+            net = get_network_client()
+            if net.connect(APP_STATE["settings"]["player_name"], APP_STATE["settings"].get("player_id")):
+                add_notification(f"尝试加入房间 {rid}...", color=(50, 150, 220))
+                net.join_room(rid)
+            else:
+                add_notification("无法连接服务器，检查地址与端口", color=(200, 60, 60))
+        btn.on_click = _join
+        room_buttons.append(btn)
+    ui["room_buttons"] = room_buttons
+    # 房间按钮按固定步长竖直排列，鼠标事件可按 y 坐标直接定位
+    ui["_rooms_top"] = start_y
+    ui["_rooms_stride"] = stride
+    ui["_rooms_hover_idx"] = None
+    ui["_rooms_pressed_idx"] = None
+    ui["_rooms_version"] = rooms_version
+    ui["_event_targets"] = None
+
+
+def _widget_state(widget: Any) -> tuple:
+    """组件的可见状态签名，签名变化说明该组件需要重绘。"""
+    if isinstance(widget, TextInput):
+        return (tuple(widget.rect), widget.text, widget.active, widget.composition_text, widget.comp_start, widget.comp_length)
+    return (tuple(widget.rect), widget.text, widget.hovered, widget.pressed, widget.bg_color, widget.fg_color)
+
+
+def _widget_dirty_rect(widget: Any) -> pygame.Rect:
+    """组件连同阴影所占的屏幕区域（输入框还包括下方的输入法预览面板）。"""
+    rect = widget.rect.inflate(8, 8)
+    if isinstance(widget, TextInput):
+        rect.union_ip(pygame.Rect(widget.rect.x, widget.rect.bottom, widget.rect.width + 3, widget.font.get_height() + 19))
+    return rect
+
+
+def _present_frame(screen_name: str, ui: Optional[Dict[str, Any]], frame_key: tuple) -> None:
+    """提交本帧画面。
+
+    PARTIAL_UPDATE_SCREENS 上只把状态变化的组件与 APP_STATE["dirty_rects"] 中登记的区域
+    交给 display.update；界面、尺寸或主题（frame_key）变化时以及其它界面整屏 flip。
+    """
+    app_state = APP_STATE
+    dirty = app_state["dirty_rects"]
+    if screen_name not in PARTIAL_UPDATE_SCREENS or not ui:
+        app_state["_partial_state"] = None
+        dirty.clear()
+        pygame.display.flip()
+        return
+    widgets = ui.get("_partial_widgets")
+    if widgets is None:
+        widgets = ui["_partial_widgets"] = [w for w in ui.values() if isinstance(w, (Button, TextInput))]
+    states = [_widget_state(w) for w in widgets]
+    prev = app_state["_partial_state"]
+    if prev is None or prev[0] is not ui or prev[1] != frame_key:
+        pygame.display.flip()
+    else:
+        for widget, old, new in zip(widgets, prev[2], states):
+            if old != new:
+                dirty.append(_widget_dirty_rect(widget))
+        if dirty:
+            pygame.display.update(dirty)
+    app_state["_partial_state"] = (ui, frame_key, states)
+    dirty.clear()
+
+
+def _partial_frame_unchanged(screen_name: str, ui: Optional[Dict[str, Any]], frame_key: tuple) -> bool:
+    """判断局部刷新界面上本帧是否与上次提交的画面完全相同（可跳过整帧绘制）。
+
+    只有组件状态、尺寸/主题、音量均未变化，且没有登记的脏区域和显示中的通知时才返回 True。
+    """
+    app_state = APP_STATE
+    prev = app_state["_partial_state"]
+    if screen_name not in PARTIAL_UPDATE_SCREENS or not ui or prev is None:
+        return False
+    if prev[0] is not ui or prev[1] != frame_key:
+        return False
+    if app_state["dirty_rects"] or app_state["notifications"] or app_state["_notification_rects"]:
+        return False
+    if "_drawn_volume" in ui and ui["_drawn_volume"] != app_state["settings"].get("volume"):
+        return False
+    widgets = ui.get("_partial_widgets") or ()
+    return all(_widget_state(w) == old for w, old in zip(widgets, prev[2]))
+
+
+def _canonicalize_room_ids(room: Dict[str, Any]) -> None:
+    """在消息入口处将房间内的玩家 ID 统一为 str，之后可直接用 == 比较，无需反复 str()。"""
+    for key in ("owner_id", "drawer_id"):
+        value = room.get(key)
+        if value is not None and not isinstance(value, str):
+            room[key] = str(value)
+    players = room.get("players")
+    if isinstance(players, dict) and not all(isinstance(pid, str) for pid in players):
+        room["players"] = {str(pid): pdata for pid, pdata in players.items()}
+
+
+def _room_button_at(ui: Dict[str, Any], pos: tuple) -> Optional[int]:
+    """按房间列表的固定步长计算鼠标所在的房间按钮下标（不在任何按钮上时返回 None）。"""
+    buttons = ui.get("room_buttons") or []
+    idx = (pos[1] - ui.get("_rooms_top", 0)) // max(1, ui.get("_rooms_stride", 1))
+    if 0 <= idx < len(buttons) and buttons[idx].rect.collidepoint(pos):
+        return idx
+    return None
+
+
+def _dispatch_room_buttons(ui: Dict[str, Any], event: pygame.event.Event) -> None:
+    """房间按钮事件分发：鼠标事件只交给命中的按钮以及之前悬停/按下的按钮。
+
+    之前悬停/按下的按钮需要收到事件以清除 hovered/pressed 状态；其他事件退回到全量分发。
+    """
+    buttons = ui.get("room_buttons") or []
+    if not buttons:
+        return
+    if event.type not in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+        for btn in buttons:
+            btn.handle_event(event)
+        return
+
+    hit = _room_button_at(ui, event.pos)
+    for idx in {hit, ui.get("_rooms_hover_idx"), ui.get("_rooms_pressed_idx")}:
+        if idx is not None and idx < len(buttons):
+            buttons[idx].handle_event(event)
+
+    if event.type == pygame.MOUSEMOTION:
+        ui["_rooms_hover_idx"] = hit
+    elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+        ui["_rooms_pressed_idx"] = hit
+    elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+        ui["_rooms_pressed_idx"] = None
+
+
+def _set_rooms(rooms: List[Dict[str, Any]]) -> None:
+    """替换房间列表并递增 rooms_version，房间按钮在下一次同步时重建。"""
+    APP_STATE["rooms"] = rooms
+    APP_STATE["rooms_version"] = APP_STATE.get("rooms_version", 0) + 1
+
+
+def _bump_players_version() -> None:
+    """current_room（玩家列表/分数/绘者）变化时递增版本号，供渲染缓存判断失效。"""
+    APP_STATE["players_version"] = APP_STATE.get("players_version", 0) + 1
+
+
+def _build_kick_buttons(current_room: Dict[str, Any], self_id: Optional[str]) -> List[Button]:
+    """为房主构建玩家列表旁的“踢出”按钮（非房主返回空列表）。"""
+    players = current_room.get("players") or {}
+    owner_id = current_room.get("owner_id")
+    kick_buttons = []
+    if self_id and owner_id == self_id:
+        start_y = 150
+        idx = 0
+        for pid, pdata in players.items():
+            if pid == self_id:
+                idx += 1
+                continue
+            btn = Button(
+                x=400, y=start_y + idx * 40, width=60, height=30,
+                text="踢出", bg_color=(200, 50, 50), fg_color=(255, 255, 255),
+                font_name="Microsoft YaHei", font_size=16
+            )
+            def _kick(pid=pid):
+                net = get_network_client()
+                net.kick_player(pid)
+            btn.on_click = _kick
+            kick_buttons.append(btn)
+            idx += 1
+    return kick_buttons
+
+
+def _apply_ui_dirty(ui: Optional[Dict[str, Any]]) -> None:
+    """根据网络消息标记的脏标志，一次性刷新受影响的子组件。
+
+    - _dirty_players / _dirty_owner：重建大厅踢人按钮与玩家行缓存
+    - _dirty_room_meta：同步大厅设置输入框与游戏 HUD（倒计时、词语、绘者）
+    - _dirty_rooms：重建房间列表按钮
+    """
+    app_state = APP_STATE
+    dirty_players = app_state.get("_dirty_players", False)
+    dirty_owner = app_state.get("_dirty_owner", False)
+    dirty_meta = app_state.get("_dirty_room_meta", False)
+    dirty_rooms = app_state.get("_dirty_rooms", False)
+    if not (dirty_players or dirty_owner or dirty_meta or dirty_rooms):
+        return
+    app_state["_dirty_players"] = False
+    app_state["_dirty_owner"] = False
+    app_state["_dirty_room_meta"] = False
+    app_state["_dirty_rooms"] = False
+    if not ui:
+        return
+
+    screen = app_state["screen"]
+    if screen == "room_list":
+        if dirty_rooms:
+            _sync_room_buttons(ui)
+        return
+    current_room = app_state.get("current_room") or {}
+    self_id = (app_state.get("settings") or {}).get("player_id")
+
+    if screen == "lobby":
+        if dirty_players or dirty_owner:
+            ui["kick_buttons"] = _build_kick_buttons(current_room, self_id)
+            ui["_event_targets"] = None
+            # 房主标签与玩家行在下一帧渲染时重建
+            ui.pop("_lobby_row_surfs", None)
+        if dirty_meta:
+            # 服务器下发的配置覆盖未在编辑中的输入框
+            for key, fields, default in (
+                ("rounds_input", ("max_rounds",), 3),
+                ("time_input", ("round_duration", "round_time"), 60),
+                ("rest_input", ("rest_time",), 10),
+            ):
+                inp = ui.get(key)
+                if inp is None or inp.active:
+                    continue
+                value = next((current_room.get(f) for f in fields if current_room.get(f)), default)
+                try:
+                    inp.text = str(int(value))
+                except Exception:
+                    pass
+    elif screen == "play" and dirty_meta and "hud" in ui:
+        # 更新 HUD（倒计时 + 词语），以服务器状态为准，保证所有玩家统一
+        hud = ui["hud"]
+        hud["is_drawer"] = (self_id == current_room.get("drawer_id"))
+        # 如果是绘者，显示服务器给的词语；否则隐藏
+        hud["current_word"] = current_room.get("current_word") if hud["is_drawer"] else None
+
+        # 同步回合时长与剩余时间，保证中途加入的玩家看到一致的倒计时
+        try:
+            if "round_duration" in current_room:
+                hud["round_time_total"] = float(current_room.get("round_duration") or hud.get("round_time_total", 60))
+            if "time_left" in current_room:
+                hud["round_time_left"] = float(current_room.get("time_left") or hud.get("round_time_left", 60))
+        except Exception:
+            pass
 
 
 def process_network_messages(ui: Optional[Dict[str, Any]]) -> None:
-    """从网络事件队列消费消息并更新 UI。"""
-    net = APP_STATE.get("net")
+    """从网络事件队列消费消息并更新 UI。
+
+    热循环中频繁访问的 APP_STATE 字段在函数入口处绑定为局部变量，
+    只有在分支切换界面时才同步回写 screen。
+    """
+    app_state = APP_STATE
+    net = app_state.get("net")
     if net is None:
         return
 
-    self_id = APP_STATE.get("settings", {}).get("player_id")
+    settings = app_state.get("settings") or {}
+    self_id = settings.get("player_id")
+    screen = app_state["screen"]
+    notify = add_notification
 
     for msg in net.drain_events():
+        app_state["_frame_dirty"] = True
+        msg_type = msg.type
         data = msg.data or {}
 
         # 服务器使用 ack 封装事件：统一处理
-        if msg.type == "ack":
+        if msg_type == "ack":
             event = data.get("event")
             if event == MSG_LIST_ROOMS and data.get("ok"):
-                APP_STATE["rooms"] = data.get("rooms", [])
-                if APP_STATE["screen"] == "room_list":
-                    APP_STATE["ui"] = None
+                _set_rooms(data.get("rooms", []))
+                app_state["_dirty_rooms"] = True
                 # 不显示通知，UI 更新本身就是反馈
             elif event == MSG_CREATE_ROOM and data.get("ok"):
                 # 创建房间成功时，向加载界面追加日志
                 try:
-                    logs = APP_STATE.get("creating_logs")
+                    logs = app_state.get("creating_logs")
                     if isinstance(logs, list):
                         room_id = data.get("room_id") or "?"
                         logs.append(f"服务器已创建房间 (ID={room_id})")
                         logs.append("正在进入房间大厅...")
                 except Exception:
                     pass
-                APP_STATE["screen"] = "lobby"
-                APP_STATE["ui"] = None
                 # 预填充房间状态，等待服务器广播覆盖
                 try:
-                    self_id = APP_STATE.get("settings", {}).get("player_id")
                     room_id = data.get("room_id")
-                    player_name = APP_STATE["settings"].get("player_name", "玩家")
-                    APP_STATE["current_room"] = {
+                    player_name = settings.get("player_name", "玩家")
+                    app_state["current_room"] = {
                         "room_id": room_id,
                         "owner_id": self_id,
                         "status": "waiting",
@@ -1135,85 +1767,71 @@ def process_network_messages(ui: Optional[Dict[str, Any]]) -> None:
                             str(self_id): {"name": player_name, "score": 0}
                         }
                     }
+                    _bump_players_version()
                 except Exception:
                     pass
-                add_notification("房间创建成功，已进入大厅", color=(50, 180, 80))
+                screen = "lobby"
+                ui = _set_screen(screen)
+                notify("房间创建成功，已进入大厅", color=(50, 180, 80))
             elif event == MSG_JOIN_ROOM:
                 if data.get("ok"):
                     # 预填充当前房间的最小状态，等待服务器广播覆盖
                     try:
-                        self_id = APP_STATE.get("settings", {}).get("player_id")
                         room_id = data.get("room_id")
-                        player_name = APP_STATE["settings"].get("player_name", "玩家")
-                        APP_STATE["current_room"] = {
+                        player_name = settings.get("player_name", "玩家")
+                        app_state["current_room"] = {
                             "room_id": room_id,
                             "status": "waiting",
                             "players": {
                                 str(self_id): {"name": player_name, "score": 0}
                             }
                         }
+                        _bump_players_version()
                     except Exception:
                         pass
-                    APP_STATE["screen"] = "lobby"
-                    APP_STATE["ui"] = None
-                    add_notification("加入房间成功，已进入大厅", color=(50, 180, 80))
+                    screen = "lobby"
+                    ui = _set_screen(screen)
+                    notify("加入房间成功，已进入大厅", color=(50, 180, 80))
                 else:
-                    add_notification(f"加入房间失败: {data.get('msg', '未知错误')}", color=(200, 50, 50))
+                    notify(f"加入房间失败: {data.get('msg', '未知错误')}", color=(200, 50, 50))
             elif event == MSG_LEAVE_ROOM and data.get("ok"):
-                APP_STATE["screen"] = "room_list"
-                APP_STATE["ui"] = None
-                APP_STATE["current_room"] = None
-                net.list_rooms()
+                app_state["current_room"] = None
+                _bump_players_version()
+                screen = "room_list"
+                ui = _set_screen(screen)
                 # 不显示额外通知，返回房间列表本身就是反馈
             continue
 
         # 房间状态更新（兼容老的 room_state）
-        if msg.type == MSG_ROOM_UPDATE or msg.type == "room_state":
-            APP_STATE["current_room"] = data
-
-            # 更新 HUD（倒计时 + 词语），以服务器状态为准，保证所有玩家统一
-            if APP_STATE["screen"] == "play" and ui and "hud" in ui:
-                hud = ui["hud"]
-                player_id = APP_STATE["settings"].get("player_id")
-                drawer_id = data.get("drawer_id")
-                hud["is_drawer"] = (player_id == drawer_id)
-                # 如果是绘者，显示服务器给的词语；否则隐藏
-                if hud["is_drawer"]:
-                    hud["current_word"] = data.get("current_word")
-                else:
-                    hud["current_word"] = None
-
-                # 同步回合时长与剩余时间，保证中途加入的玩家看到一致的倒计时
-                try:
-                    if "round_duration" in data:
-                        hud["round_time_total"] = float(data.get("round_duration") or hud.get("round_time_total", 60))
-                    if "time_left" in data:
-                        hud["round_time_left"] = float(data.get("time_left") or hud.get("round_time_left", 60))
-                except Exception:
-                    pass
-
-            if APP_STATE["screen"] == "lobby":
-                APP_STATE["ui"] = None
-            if data.get("status") == "playing" and APP_STATE["screen"] == "lobby":
-                APP_STATE["screen"] = "play"
-                APP_STATE["ui"] = None
+        if msg_type == MSG_ROOM_UPDATE or msg_type == "room_state":
+            prev_owner = (app_state.get("current_room") or {}).get("owner_id")
+            _canonicalize_room_ids(data)
+            app_state["current_room"] = data
+            _bump_players_version()
+            # 只标记脏数据，UI 刷新在本帧消息全部处理完后由 _apply_ui_dirty 统一完成
+            app_state["_dirty_players"] = True
+            app_state["_dirty_room_meta"] = True
+            if data.get("owner_id") != prev_owner:
+                app_state["_dirty_owner"] = True
+
+            if screen == "lobby" and data.get("status") == "playing":
+                screen = "play"
+                ui = _set_screen(screen)
             continue
 
         # 服务器主动广播的房间列表更新（无需客户端手动刷新）
-        if msg.type == "rooms_update":
-            rooms = data.get("rooms", [])
-            APP_STATE["rooms"] = rooms
-            if APP_STATE.get("screen") == "room_list":
-                # 重建UI以刷新房间按钮列表
-                APP_STATE["ui"] = None
+        if msg_type == "rooms_update":
+            _set_rooms(data.get("rooms", []))
+            # 房间按钮在本帧消息处理完后由 _apply_ui_dirty 统一重建
+            app_state["_dirty_rooms"] = True
             continue
 
         # 服务器发送的 event 类型消息（游戏事件）
-        if msg.type == "event":
+        if msg_type == "event":
             event_type = data.get("type")
             if event_type == MSG_START_GAME and data.get("ok"):
-                APP_STATE["screen"] = "play"
-                APP_STATE["ui"] = None
+                screen = "play"
+                ui = _set_screen(screen)
                 drawer_name = data.get("drawer_name") or "某人"
                 # 优先使用服务器提供的 round_number/max_rounds，保证与房主设置一致
                 try:
@@ -1222,10 +1840,10 @@ def process_network_messages(ui: Optional[Dict[str, Any]]) -> None:
                     round_num = 1
                 try:
                     # 若事件中未显式提供，则退回到 current_room 的 max_rounds 或默认 3
-                    max_rounds = int(data.get("max_rounds") or (APP_STATE.get("current_room") or {}).get("max_rounds") or 3)
+                    max_rounds = int(data.get("max_rounds") or (app_state.get("current_room") or {}).get("max_rounds") or 3)
                 except Exception:
                     max_rounds = 3
-                add_notification(f"游戏开始！第{round_num}/{max_rounds}轮，{drawer_name}是绘画者", color=(50, 200, 50))
+                notify(f"游戏开始！第{round_num}/{max_rounds}轮，{drawer_name}是绘画者", color=(50, 200, 50))
                 continue
             if event_type == MSG_NEXT_ROUND:
                 drawer_name = data.get("drawer_name") or "某人"
@@ -1234,10 +1852,10 @@ def process_network_messages(ui: Optional[Dict[str, Any]]) -> None:
                 except Exception:
                     round_num = 1
                 try:
-                    max_rounds = int(data.get("max_rounds") or (APP_STATE.get("current_room") or {}).get("max_rounds") or 3)
+                    max_rounds = int(data.get("max_rounds") or (app_state.get("current_room") or {}).get("max_rounds") or 3)
                 except Exception:
                     max_rounds = 3
-                add_notification(f"第{round_num}/{max_rounds}轮开始，{drawer_name}是绘画者", color=(80, 150, 200))
+                notify(f"第{round_num}/{max_rounds}轮开始，{drawer_name}是绘画者", color=(80, 150, 200))
                 # 清空画布
                 if ui and "canvas" in ui:
                     ui["canvas"].clear()
@@ -1245,48 +1863,48 @@ def process_network_messages(ui: Optional[Dict[str, Any]]) -> None:
             if event_type == "guess_correct":
                 player_name = data.get("player_name", "某人")
                 word = data.get("word", "")
-                add_notification(f"🎉 {player_name} 猜对了：{word}！", color=(50, 200, 50))
+                notify(f"🎉 {player_name} 猜对了：{word}！", color=(50, 200, 50))
                 continue
             if event_type == MSG_GIVE_SCORE:
                 player_name = data.get("player_name", "某人")
                 score = data.get("score", 0)
-                add_notification(f"{player_name} 获得 {score} 分", color=(80, 150, 200))
+                notify(f"{player_name} 获得 {score} 分", color=(80, 150, 200))
                 continue
             if event_type == MSG_KICK_PLAYER:
-                APP_STATE["screen"] = "room_list"
-                APP_STATE["ui"] = None
-                APP_STATE["current_room"] = None
-                add_notification("你被踢出了房间", color=(200, 50, 50))
-                net.list_rooms()
+                app_state["current_room"] = None
+                _bump_players_version()
+                screen = "room_list"
+                ui = _set_screen(screen)
+                notify("你被踢出了房间", color=(200, 50, 50))
                 continue
 
         # 游戏结果
-        if msg.type == MSG_GAME_RESULT:
-            APP_STATE["game_result"] = data.get("ranking", [])
-            APP_STATE["screen"] = "result"
-            APP_STATE["ui"] = None
-            add_notification("游戏结束！查看最终排名", color=(200, 150, 50))
+        if msg_type == MSG_GAME_RESULT:
+            app_state["game_result"] = data.get("ranking", [])
+            screen = "result"
+            ui = _set_screen(screen)
+            notify("游戏结束！查看最终排名", color=(200, 150, 50))
             continue
 
         # 聊天
-        if msg.type == MSG_CHAT and ui and "chat" in ui:
+        if msg_type == MSG_CHAT and ui and "chat" in ui:
             by_id = data.get("by") or data.get("by_id")
             name = data.get("by_name") or by_id or "玩家"
             # 跳过自己发送的消息（因为已经在本地显示了）
-            if by_id and self_id and str(by_id) == str(self_id):
+            if by_id and by_id == self_id:
                 continue
             text = str(data.get("text") or "").replace("\n", " ")
             try:
                 ui["chat"].add_message(name, text)
             except Exception:
                 pass
-        elif msg.type == "draw_sync":
+        elif msg_type == "draw_sync":
             # 处理远程绘画同步
             # 若 UI 尚未初始化（例如刚切换到 play 时），直接丢弃该帧以避免崩溃
             if not ui:
                 continue
             by_id = data.get("by")
-            if by_id and self_id and str(by_id) == str(self_id):
+            if by_id and by_id == self_id:
                 # 跳过自己的绘画动作（已在本地显示）
                 continue
             draw_data = data.get("data", {})
@@ -1296,28 +1914,19 @@ def process_network_messages(ui: Optional[Dict[str, Any]]) -> None:
                     canvas.apply_remote_action(draw_data)
             except Exception:
                 pass
-        elif msg.type == "room_state":
-            if not ui:
-                continue
-            hud = ui.get("hud")
-            if hud:
-                try:
-                    hud["round_time_left"] = data.get("time_left", hud.get("round_time_left", 60))
-                except Exception:
-                    pass
 
         # 错误反馈
-        if msg.type == "error":
+        if msg_type == "error":
             err = data.get("msg") or "操作失败"
             # 在创建房间加载界面中，将错误写入实时日志
             try:
-                if APP_STATE.get("screen") == "creating_room":
-                    logs = APP_STATE.get("creating_logs")
+                if screen == "creating_room":
+                    logs = app_state.get("creating_logs")
                     if isinstance(logs, list):
                         logs.append(f"错误: {err}")
             except Exception:
                 pass
-            add_notification(f"错误: {err}", color=(200, 60, 60))
+            notify(f"错误: {err}", color=(200, 60, 60))
             continue
 
 
@@ -1339,10 +1948,7 @@ def update_and_draw_hud(screen: pygame.Surface, ui: Dict[str, Any]) -> None:
     pygame.draw.rect(screen, (200, 200, 200), rect, 2)
 
     # 内容：时间、词、模式、颜色与大小
-    try:
-        font = pygame.font.SysFont("Microsoft YaHei", 20)
-    except Exception:
-        font = pygame.font.SysFont(None, 20)
+    font = get_font("Microsoft YaHei", 20)
 
     # 时间
     t_left = int(hud.get("round_time_left", 60))
@@ -1388,7 +1994,6 @@ def main() -> None:
 
         # 初始化SDL文本输入支持（用于中文输入法）
         try:
-            import os
             os.environ['SDL_IME_SHOW_UI'] = '1'
             # 重新初始化显示模块以应用环境变量
             pygame.display.quit()
@@ -1399,6 +2004,8 @@ def main() -> None:
         # 加载持久化设置并确保玩家标识
         load_settings()
         ensure_player_identity()
+        # 记录已持久化的音量，滑块松开时仅在变化后写文件
+        APP_STATE["_last_saved_vol"] = APP_STATE["settings"].get("volume")
 
         # 预加载音效
         confirm_sound = None
@@ -1433,18 +2040,17 @@ def main() -> None:
         RESIZE_DEBOUNCE_MS = 140
 
         def on_back():
-            APP_STATE["screen"] = "menu"
-            APP_STATE["ui"] = None
+            _set_screen("menu")
             nonlocal logo_orig, logo_base_size, logo_anchor, buttons
             logo_orig, logo_base_size, logo_anchor = load_logo(LOGO_PATH, screen.get_size())
             buttons = create_buttons_from_config(BUTTONS_CONFIG, CALLBACKS, screen.get_size(), logo_anchor, screen_filter="menu", click_sound=confirm_sound)
 
         def on_light_theme():
-            APP_STATE["settings"]["theme"] = "light"
+            set_theme("light")
             save_settings()
 
         def on_dark_theme():
-            APP_STATE["settings"]["theme"] = "dark"
+            set_theme("dark")
             save_settings()
 
         def on_fullscreen():
@@ -1459,7 +2065,9 @@ def main() -> None:
                 else:
                     screen = pygame.display.set_mode((1280, 720), pygame.RESIZABLE)
                 logo_orig, logo_base_size, logo_anchor = load_logo(LOGO_PATH, screen.get_size())
+                APP_STATE["_frame_period_ms"] = _detect_frame_period_ms()
                 APP_STATE["ui"] = None
+                _ensure_ui()
             except Exception:
                 pass
 
@@ -1473,6 +2081,112 @@ def main() -> None:
                         cb(txt)
                     ui["input"].text = ""
 
+        # 各界面的 UI 构建函数：由 _set_screen 在切换界面时调用，渲染路径只读取已构建的 UI
+        def _build_play(size: tuple) -> Dict[str, Any]:
+            ui = build_play_ui(size)
+            # create play-specific buttons from config and attach to ui
+            play_buttons = create_buttons_from_config(BUTTONS_CONFIG, CALLBACKS, size, logo_anchor, screen_filter="play", click_sound=confirm_sound)
+            for pb in play_buttons:
+                cid = getattr(pb, "_cfg_id", None)
+                if cid == "play_back":
+                    ui["back_btn"] = pb
+                elif cid == "play_send":
+                    ui["send_btn"] = pb
+            # 初次进入游戏界面时，用服务器的 current_room 状态同步 HUD，
+            # 确保中途加入的玩家看到与已有玩家一致的回合、倒计时与词语。
+            try:
+                current_room = APP_STATE.get("current_room") or {}
+                hud = ui.get("hud")
+                if isinstance(hud, dict) and current_room:
+                    # 同步回合时长与剩余时间
+                    rd = current_room.get("round_duration")
+                    if isinstance(rd, (int, float)):
+                        hud["round_time_total"] = float(rd)
+                    tl = current_room.get("time_left")
+                    if isinstance(tl, (int, float)):
+                        hud["round_time_left"] = float(tl)
+
+                    # 同步绘者身份与当前词语
+                    drawer_id = current_room.get("drawer_id")
+                    self_id = APP_STATE.get("settings", {}).get("player_id")
+                    hud["is_drawer"] = bool(self_id and drawer_id == self_id)
+                    if hud["is_drawer"]:
+                        hud["current_word"] = current_room.get("current_word")
+                    else:
+                        hud["current_word"] = None
+            except Exception:
+                pass
+            return ui
+
+        def _build_settings(size: tuple) -> Dict[str, Any]:
+            ui = build_settings_ui(size, confirm_sound=confirm_sound)
+            # attach settings buttons from config
+            settings_buttons = create_buttons_from_config(BUTTONS_CONFIG, CALLBACKS, size, logo_anchor, screen_filter="settings", click_sound=confirm_sound)
+            for sb in settings_buttons:
+                cid = getattr(sb, "_cfg_id", None)
+                if cid == "settings_back":
+                    ui["back_btn"] = sb
+                elif cid == "settings_light":
+                    ui["light_btn"] = sb
+                elif cid == "settings_dark":
+                    ui["dark_btn"] = sb
+                elif cid == "settings_fullscreen":
+                    ui["fullscreen_btn"] = sb
+            _layout_settings_ui(ui, size)
+            return ui
+
+        def _build_room_list(size: tuple) -> Dict[str, Any]:
+            ui = build_room_list_ui(size)
+            _sync_room_buttons(ui)
+            # 进入房间列表时自动拉取一次列表
+            try:
+                player_id = APP_STATE["settings"].get("player_id") or ensure_player_identity()
+                net = get_network_client()
+                if net.connect(APP_STATE["settings"]["player_name"], player_id):
+                    queue_net_request("list_rooms")
+                else:
+                    add_notification("无法连接服务器，检查地址与端口", color=(200, 60, 60))
+            except Exception:
+                pass
+            return ui
+
+        def _build_lobby(size: tuple) -> Dict[str, Any]:
+            ui = build_lobby_ui(size)
+            ui["kick_buttons"] = _build_kick_buttons(
+                APP_STATE.get("current_room") or {}, APP_STATE.get("settings", {}).get("player_id")
+            )
+            return ui
+
+        def _build_creating_room(size: tuple) -> Dict[str, Any]:
+            # 在左上角放置一个返回按钮，允许用户中断等待并回到房间列表
+            back_btn = Button(
+                x=50,
+                y=50,
+                width=160,
+                height=45,
+                text="返回房间列表",
+                bg_color=(200, 100, 100),
+                fg_color=(255, 255, 255),
+                font_name="Microsoft YaHei",
+                font_size=20,
+            )
+
+            def _on_back_from_creating() -> None:
+                # 返回房间列表（其构建函数会重新拉取一次列表）
+                _set_screen("room_list")
+
+            back_btn.on_click = _on_back_from_creating
+            return {"back_btn": back_btn}
+
+        UI_BUILDERS.update({
+            "play": _build_play,
+            "settings": _build_settings,
+            "room_list": _build_room_list,
+            "lobby": _build_lobby,
+            "creating_room": _build_creating_room,
+            "result": build_result_ui,
+        })
+
         CALLBACKS.update({
             "on_back": on_back,
             "on_light_theme": on_light_theme,
@@ -1483,13 +2197,40 @@ def main() -> None:
 
         clock = pygame.time.Clock()
         running = True
+        # SDL 事件队列每帧最多处理一次，不快于显示器刷新率
+        APP_STATE["_frame_period_ms"] = _detect_frame_period_ms()
+        last_event_pump = -APP_STATE["_frame_period_ms"]
 
         buttons = create_buttons_from_config(BUTTONS_CONFIG, CALLBACKS, screen.get_size(), logo_anchor, screen_filter="menu", click_sound=confirm_sound)
+        # 菜单按钮入场动画是否已全部结束（按钮列表被重建时重置）
+        slide_buttons: Optional[List[Button]] = None
+        slides_done = False
 
         while running:
-            for event in pygame.event.get():
+            now_ms = pygame.time.get_ticks()
+            if now_ms - last_event_pump >= APP_STATE["_frame_period_ms"]:
+                if APP_STATE["screen"] in ANIMATED_SCREENS or APP_STATE.get("pending_resize_until", 0):
+                    # 动画界面/防抖期间不额外阻塞，帧节奏由 clock.tick 控制
+                    events = pygame.event.get()
+                else:
+                    # 静态界面阻塞等待首个事件（最多 100ms），让进程在空闲时休眠；
+                    # 网络消息到达时接收线程会投递 NET_MESSAGE_EVENT 提前唤醒
+                    first_event = pygame.event.wait(IDLE_EVENT_WAIT_MS)
+                    events = pygame.event.get()
+                    if first_event.type != pygame.NOEVENT:
+                        events.insert(0, first_event)
+                last_event_pump = pygame.time.get_ticks()
+            else:
+                events = ()
+            if events:
+                APP_STATE["_frame_dirty"] = True
+            APP_STATE["_frame_mouse_pos"] = None
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.WINDOWEXPOSED:
+                    # 窗口内容可能被系统丢弃，下一帧整屏提交
+                    APP_STATE["_partial_state"] = None
                 elif event.type == pygame.VIDEORESIZE:
                     # 记录待处理的尺寸（不在每次事件中重建显示），等待防抖期结束后一次性调用 set_mode
                     APP_STATE["pending_resize_size"] = event.size
@@ -1499,7 +2240,8 @@ def main() -> None:
                     if ui and isinstance(ui, dict) and "chat" in ui:
                         chat = ui["chat"]
                         if hasattr(chat, "messages"):
-                            APP_STATE["_saved_chat_messages"] = chat.messages[:]
+                            # 保存引用而非切片副本：拖动窗口时会连续触发大量 VIDEORESIZE
+                            APP_STATE["_saved_chat_messages"] = chat.messages
                             if hasattr(chat, "scroll_offset"):
                                 APP_STATE["_saved_chat_scroll"] = chat.scroll_offset
                 else:
@@ -1507,40 +2249,29 @@ def main() -> None:
                     if APP_STATE["screen"] == "menu":
                         for b in buttons:
                             b.handle_event(event)
-
-                        # 进入 play/settings 时在渲染阶段统一构建 UI（含配置按钮）
-                        if APP_STATE["screen"] in ("play", "settings"):
-                            APP_STATE["ui"] = None
                     elif APP_STATE["screen"] == "play":
-                        ui = APP_STATE["ui"]
-                        if ui is None:
-                            ui = build_play_ui(screen.get_size())
-                            # create play-specific buttons from config and attach to ui
-                            play_buttons = create_buttons_from_config(BUTTONS_CONFIG, CALLBACKS, screen.get_size(), logo_anchor, screen_filter="play", click_sound=confirm_sound)
-                            for pb in play_buttons:
-                                cid = getattr(pb, "_cfg_id", None)
-                                if cid == "play_back":
-                                    ui["back_btn"] = pb
-                                elif cid == "play_send":
-                                    ui["send_btn"] = pb
-                            APP_STATE["ui"] = ui
+                        ui = _ensure_ui()
 
                         # 更新画布权限：只有绘画者可以绘画
                         current_room = APP_STATE.get("current_room") or {}
                         drawer_id = current_room.get("drawer_id")
                         self_id = APP_STATE.get("settings", {}).get("player_id")
-                        is_drawer = drawer_id and self_id and str(drawer_id) == str(self_id)
+                        is_drawer = bool(self_id and drawer_id == self_id)
 
                         if "canvas" in ui:
                             ui["canvas"].drawing_enabled = is_drawer
                         if "hud" in ui:
                             ui["hud"]["is_drawer"] = is_drawer
 
+                        # 事件分发列表随 UI 一起重建，避免每个事件重复查询与判空
+                        targets = ui.get("_event_targets")
+                        if targets is None:
+                            targets = ui["_event_targets"] = _collect_widgets(ui, ("back_btn", "send_btn"))
+                            ui["_mousewheel_targets"] = _collect_widgets(ui, ("chat",))
+
                         # 处理按钮事件
-                        if ui.get("back_btn"):
-                            ui["back_btn"].handle_event(event)
-                        if ui.get("send_btn"):
-                            ui["send_btn"].handle_event(event)
+                        for widget in targets:
+                            widget.handle_event(event)
 
                         # 先处理鼠标事件到组件（工具栏、画布、输入框）
                         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -1551,23 +2282,15 @@ def main() -> None:
                             ui["toolbar"].handle_event(event)
                             ui["canvas"].handle_event(event)
                             ui["input"].handle_event(event)
-                        elif event.type == pygame.MOUSEWHEEL and ui:
-                            # 处理聊天框的滚轮事件（只在 UI 已初始化时）
-                            try:
-                                chat_rect = ui.get("chat").rect if ui.get("chat") else None
-                                mouse_pos = pygame.mouse.get_pos()
-                                if chat_rect and chat_rect.collidepoint(mouse_pos):
-                                    # 如果鼠标在聊天框上，处理滚轮
-                                    ui["chat"].handle_scroll(event.y)
-                            except Exception:
-                                pass
+                        elif event.type == pygame.MOUSEWHEEL:
+                            # 鼠标在聊天框上时处理滚轮
+                            _dispatch_mousewheel(ui, event)
                         else:
                             # 其他事件（键盘等）
                             ui["input"].handle_event(event)
                             ui["canvas"].handle_event(event)
                         # 快捷键（输入框未激活时）
                         if event.type == pygame.KEYDOWN and not ui["input"].active:
-                            from src.shared.constants import BRUSH_COLORS, BRUSH_SIZES
                             if event.key in (pygame.K_e,):
                                 ui["canvas"].set_mode("erase" if ui["canvas"].mode == "draw" else "draw")
                             elif event.key in (pygame.K_k,):
@@ -1592,57 +2315,16 @@ def main() -> None:
                                     ui["canvas"].set_color(chosen)
                                     ui["toolbar"].set_selected_color(chosen)
                     elif APP_STATE["screen"] == "room_list":
-                        ui = APP_STATE["ui"]
-                        need_rebuild_rooms = False
-                        if ui is None:
-                            ui = build_room_list_ui(screen.get_size())
-                            APP_STATE["ui"] = ui
-                            need_rebuild_rooms = True
-                            # 进入房间列表时自动拉取一次列表
-                            try:
-                                player_id = APP_STATE["settings"].get("player_id") or ensure_player_identity()
-                                net = get_network_client()
-                                if net.connect(APP_STATE["settings"]["player_name"], player_id):
-                                    net.list_rooms()
-                                else:
-                                    add_notification("无法连接服务器，检查地址与端口", color=(200, 60, 60))
-                            except Exception:
-                                pass
-
-                        # 每次都根据 APP_STATE["rooms"] 重建房间按钮，确保刷新生效
-                        if need_rebuild_rooms or ui.get("_rooms_version") != id(APP_STATE.get("rooms")):
-                            rooms = APP_STATE.get("rooms", [])
-                            room_buttons = []
-                            start_y = 150
-                            for i, r in enumerate(rooms):
-                                rid = r["room_id"]
-                                count = r["player_count"]
-                                status = r["status"]
-                                btn = Button(
-                                    x=50, y=start_y + i * 60, width=400, height=50,
-                                    text=f"房间 {rid} ({count}人) - {status}",
-                                    bg_color=(200, 200, 200), fg_color=(0, 0, 0),
-                                    font_name="Microsoft YaHei", font_size=20
-                                )
-                                def _join(rid=rid):
-                                    net = get_network_client()
-                                    if net.connect(APP_STATE["settings"]["player_name"], APP_STATE["settings"].get("player_id")):
-                                        add_notification(f"尝试加入房间 {rid}...", color=(50, 150, 220))
-                                        net.join_room(rid)
-                                    else:
-                                        add_notification("无法连接服务器，检查地址与端口", color=(200, 60, 60))
-                                btn.on_click = _join
-                                room_buttons.append(btn)
-                            ui["room_buttons"] = room_buttons
-                            ui["_rooms_version"] = id(APP_STATE.get("rooms"))
+                        ui = _ensure_ui()
 
                         # 事件分发：确保 ui 存在后再处理
                         if ui:
-                            if ui.get("refresh_btn"): ui["refresh_btn"].handle_event(event)
-                            if ui.get("create_btn"): ui["create_btn"].handle_event(event)
-                            if ui.get("back_btn"): ui["back_btn"].handle_event(event)
-                            for btn in ui.get("room_buttons", []):
-                                btn.handle_event(event)
+                            targets = ui.get("_event_targets")
+                            if targets is None:
+                                targets = ui["_event_targets"] = _collect_widgets(ui, ("refresh_btn", "create_btn", "back_btn"))
+                            for widget in targets:
+                                widget.handle_event(event)
+                            _dispatch_room_buttons(ui, event)
                         # 定时自动刷新房间列表（每2秒）
                         if APP_STATE.get("screen") == "room_list":
                             last = APP_STATE.get("rooms_last_refresh", 0)
@@ -1653,163 +2335,104 @@ def main() -> None:
                                     player_id = APP_STATE["settings"].get("player_id") or ensure_player_identity()
                                     net = get_network_client()
                                     if net.connected or net.connect(APP_STATE["settings"]["player_name"], player_id):
-                                        net.list_rooms()
+                                        queue_net_request("list_rooms")
                                 except Exception:
                                     pass
 
                     elif APP_STATE["screen"] == "lobby":
-                        ui = APP_STATE["ui"]
-                        if ui is None:
-                            ui = build_lobby_ui(screen.get_size())
-                            APP_STATE["ui"] = ui
-                            # Rebuild kick buttons if owner
-                            current_room = APP_STATE.get("current_room") or {}
-                            players = current_room.get("players") or {}
-                            owner_id = current_room.get("owner_id")
-                            self_id = APP_STATE.get("settings", {}).get("player_id")
-
-                            kick_buttons = []
-                            if str(owner_id) == str(self_id):
-                                start_y = 150
-                                idx = 0
-                                for pid, pdata in players.items():
-                                    if str(pid) == str(self_id):
-                                        idx += 1
-                                        continue
-                                    btn = Button(
-                                        x=400, y=start_y + idx * 40, width=60, height=30,
-                                        text="踢出", bg_color=(200, 50, 50), fg_color=(255, 255, 255),
-                                        font_name="Microsoft YaHei", font_size=16
-                                    )
-                                    def _kick(pid=pid):
-                                        net = get_network_client()
-                                        net.kick_player(pid)
-                                    btn.on_click = _kick
-                                    kick_buttons.append(btn)
-                                    idx += 1
-                            ui["kick_buttons"] = kick_buttons
-
-                        # 开始游戏按钮对所有人可点击，服务器侧仍做权限校验
-                        if ui.get("start_btn"): ui["start_btn"].handle_event(event)
-
-                        # 房主设置折叠/展开按钮
+                        ui = _ensure_ui()
+
+                        # 事件分发列表：(组件, 分组)，分组 owner 仅房主可用，
+                        # owner_settings 仅房主且设置面板展开时可用
+                        targets = ui.get("_event_targets")
+                        if targets is None:
+                            # 开始游戏按钮对所有人可点击，服务器侧仍做权限校验
+                            targets = [(w, None) for w in _collect_widgets(ui, ("start_btn",))]
+                            targets += [(w, "owner") for w in _collect_widgets(ui, ("settings_toggle_btn",))]
+                            targets += [
+                                (w, "owner_settings")
+                                for w in _collect_widgets(ui, ("rounds_input", "time_input", "rest_input", "apply_btn"))
+                            ]
+                            targets += [(w, None) for w in _collect_widgets(ui, ("leave_btn", "chat_input", "send_btn"))]
+                            targets += [(w, None) for w in ui.get("kick_buttons", [])]
+                            ui["_event_targets"] = targets
+                            ui["_mousewheel_targets"] = _collect_widgets(ui, ("chat",))
+
                         current_room = APP_STATE.get("current_room") or {}
                         owner_id = current_room.get("owner_id")
                         self_id = APP_STATE.get("settings", {}).get("player_id")
-                        is_owner = owner_id and self_id and str(owner_id) == str(self_id)
-                        if is_owner and ui.get("settings_toggle_btn"):
-                            ui["settings_toggle_btn"].handle_event(event)
-
-                        # 仅房主可编辑游戏参数
-                        if is_owner and not APP_STATE.get("_lobby_settings_collapsed", False):
-                            if ui.get("rounds_input"): ui["rounds_input"].handle_event(event)
-                            if ui.get("time_input"): ui["time_input"].handle_event(event)
-                            if ui.get("rest_input"): ui["rest_input"].handle_event(event)
-                            if ui.get("apply_btn"): ui["apply_btn"].handle_event(event)
-
-                        if ui.get("leave_btn"): ui["leave_btn"].handle_event(event)
-                        if ui.get("chat_input"): ui["chat_input"].handle_event(event)
-                        if ui.get("send_btn"): ui["send_btn"].handle_event(event)
+                        is_owner = bool(self_id and owner_id == self_id)
+                        for widget, group in targets:
+                            if group is None:
+                                widget.handle_event(event)
+                            elif is_owner and (group == "owner" or not APP_STATE.get("_lobby_settings_collapsed", False)):
+                                # 折叠状态可能被同一事件中的折叠按钮切换，逐项读取
+                                widget.handle_event(event)
                         # 聊天框滚轮
-                        if event.type == pygame.MOUSEWHEEL and ui.get("chat"):
-                            try:
-                                chat_rect = ui["chat"].rect
-                                mouse_pos = pygame.mouse.get_pos()
-                                if chat_rect.collidepoint(mouse_pos):
-                                    ui["chat"].handle_scroll(event.y)
-                            except Exception:
-                                pass
-                        for btn in ui.get("kick_buttons", []):
-                            btn.handle_event(event)
+                        if event.type == pygame.MOUSEWHEEL:
+                            _dispatch_mousewheel(ui, event)
 
                     elif APP_STATE["screen"] == "creating_room":
                         # 创建房间加载界面：处理“返回房间列表”按钮，并在超时情况下尝试重启本地服务器
-                        ui = APP_STATE["ui"]
-                        if ui is None:
-                            # 在右上角放置一个返回按钮，允许用户中断等待并回到房间列表
-                            back_btn = Button(
-                                x=50,
-                                y=50,
-                                width=160,
-                                height=45,
-                                text="返回房间列表",
-                                bg_color=(200, 100, 100),
-                                fg_color=(255, 255, 255),
-                                font_name="Microsoft YaHei",
-                                font_size=20,
-                            )
-
-                            def _on_back_from_creating() -> None:
-                                # 返回房间列表并重新拉取一次列表
-                                APP_STATE["screen"] = "room_list"
-                                APP_STATE["ui"] = None
-                                try:
-                                    player_id = APP_STATE["settings"].get("player_id") or ensure_player_identity()
-                                    net = get_network_client()
-                                    if net.connected or net.connect(APP_STATE["settings"]["player_name"], player_id):
-                                        net.list_rooms()
-                                except Exception:
-                                    pass
+                        ui = _ensure_ui()
 
-                            back_btn.on_click = _on_back_from_creating
-                            ui = {"back_btn": back_btn}
-                            APP_STATE["ui"] = ui
-
-                        if ui.get("back_btn"):
-                            ui["back_btn"].handle_event(event)
+                        targets = ui.get("_event_targets")
+                        if targets is None:
+                            targets = ui["_event_targets"] = _collect_widgets(ui, ("back_btn",))
+                        for widget in targets:
+                            widget.handle_event(event)
 
                     elif APP_STATE["screen"] == "result":
                         ui = APP_STATE["ui"]
-                        if ui and ui.get("back_btn"):
-                            ui["back_btn"].handle_event(event)
+                        if ui:
+                            targets = ui.get("_event_targets")
+                            if targets is None:
+                                targets = ui["_event_targets"] = _collect_widgets(ui, ("back_btn",))
+                            for widget in targets:
+                                widget.handle_event(event)
 
                     elif APP_STATE["screen"] == "settings":
-                        ui = APP_STATE["ui"]
-                        if ui is None:
-                            ui = build_settings_ui(screen.get_size(), confirm_sound=confirm_sound)
-                            # attach settings buttons from config
-                            settings_buttons = create_buttons_from_config(BUTTONS_CONFIG, CALLBACKS, screen.get_size(), logo_anchor, screen_filter="settings", click_sound=confirm_sound)
-                            for sb in settings_buttons:
-                                cid = getattr(sb, "_cfg_id", None)
-                                if cid == "settings_back":
-                                    ui["back_btn"] = sb
-                                elif cid == "settings_light":
-                                    ui["light_btn"] = sb
-                                elif cid == "settings_dark":
-                                    ui["dark_btn"] = sb
-                                elif cid == "settings_fullscreen":
-                                    ui["fullscreen_btn"] = sb
-                            APP_STATE["ui"] = ui
-
-                        # 处理设置界面事件
-                        ui["player_name_input"].handle_event(event)
-                        if ui.get("server_host_input"):
-                            ui["server_host_input"].handle_event(event)
-
-                        # 处理按钮事件
-                        for btn_key in ["back_btn", "light_btn", "dark_btn", "fullscreen_btn", "confirm_name_btn", "confirm_host_btn", "server_lan_btn", "server_remote_btn"]:
-                            if ui.get(btn_key):
-                                ui[btn_key].handle_event(event)
-
-                        # 音量滑块拖动
+                        ui = _ensure_ui()
+
+                        # 处理设置界面事件：输入框在前，按钮在后
+                        targets = ui.get("_event_targets")
+                        if targets is None:
+                            targets = ui["_event_targets"] = _collect_widgets(ui, (
+                                "player_name_input", "server_host_input",
+                                "back_btn", "light_btn", "dark_btn", "fullscreen_btn",
+                                "confirm_name_btn", "confirm_host_btn", "server_lan_btn", "server_remote_btn",
+                            ))
+                        for widget in targets:
+                            widget.handle_event(event)
+
+                        # 音量滑块拖动：拖动过程中只更新内存中的音量，松开鼠标时再写入设置文件
                         if event.type == pygame.MOUSEMOTION and pygame.mouse.get_pressed()[0]:
                             if ui["volume_slider_rect"].collidepoint(event.pos):
                                 rel_x = event.pos[0] - ui["volume_slider_rect"].x
                                 vol = max(0, min(100, int(rel_x / ui["volume_slider_rect"].width * 100)))
                                 APP_STATE["settings"]["volume"] = vol
+                                # 动态调整点击音效音量（音量未变化时跳过）
+                                if vol != APP_STATE.get("_last_applied_vol"):
+                                    try:
+                                        snd = APP_STATE.get("confirm_sound")
+                                        if snd:
+                                            snd.set_volume(vol / 100.0)
+                                        APP_STATE["_last_applied_vol"] = vol
+                                    except Exception:
+                                        pass
+                        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                            vol = APP_STATE["settings"].get("volume")
+                            if vol != APP_STATE.get("_last_saved_vol"):
                                 save_settings()
-                                # 动态调整点击音效音量
-                                try:
-                                    snd = APP_STATE.get("confirm_sound")
-                                    if snd:
-                                        snd.set_volume(vol / 100.0)
-                                except Exception:
-                                    pass
+                            APP_STATE["_last_saved_vol"] = vol
 
             if APP_STATE["screen"] == "play":
                 process_network_messages(APP_STATE.get("ui"))
             elif APP_STATE["screen"] in ("room_list", "lobby", "creating_room"):
                 process_network_messages(APP_STATE.get("ui"))
+            # 本帧网络消息处理完毕后统一应用 UI 刷新，并合并发送本帧登记的网络请求
+            _apply_ui_dirty(APP_STATE.get("ui"))
+            _flush_net_pending()
 
             # 如果存在待处理的 resize 且防抖期已过，则执行一次性的重建操作
             now_tick = pygame.time.get_ticks()
@@ -1833,97 +2456,62 @@ def main() -> None:
                             BUTTONS_CONFIG, CALLBACKS, pending_size, logo_anchor, screen_filter="menu", click_sound=confirm_sound
                         )
                     elif APP_STATE["screen"] in ("play", "settings"):
-                        # 在渲染阶段重建 UI（play/settings 会在后续逻辑中重建）
+                        # 按新尺寸立即重建 play/settings 的 UI
                         APP_STATE["ui"] = None
+                        _ensure_ui()
                 except Exception:
                     pass
                 APP_STATE["pending_resize_size"] = None
                 APP_STATE["pending_resize_until"] = 0
+                # 显示模式已重建，释放旧字体对象；窗口可能已移到刷新率不同的显示器
+                clear_widget_font_cache()
+                APP_STATE["_frame_period_ms"] = _detect_frame_period_ms()
+                APP_STATE["_frame_dirty"] = True
+
+            # 帧跳过：动画界面、待构建的 UI 与显示中的通知（需按时消失）始终重绘，
+            # 其他情况下没有事件/网络消息就不重绘
+            if APP_STATE["screen"] in ANIMATED_SCREENS or APP_STATE["ui"] is None or APP_STATE["notifications"]:
+                APP_STATE["_frame_dirty"] = True
+            # 局部刷新界面（设置/结果）上的事件若没有改变任何可见状态（如在空白处移动鼠标），同样跳过
+            sw, sh = screen.get_size()
+            theme = APP_STATE["settings"].get("theme", "light")
+            if APP_STATE["_frame_dirty"] and _partial_frame_unchanged(APP_STATE["screen"], APP_STATE["ui"], (sw, sh, theme)):
+                APP_STATE["_frame_dirty"] = False
+            if not APP_STATE["_frame_dirty"]:
+                clock.tick(60)
+                continue
+            # 在绘制前清除标志，绘制过程中产生的新变化会触发下一帧
+            APP_STATE["_frame_dirty"] = False
+
+            # 上面取得的窗口尺寸与主题（sw, sh, theme）在本帧各界面分支中共享，避免重复查询
 
             screen.fill((245, 248, 255))  # 淡蓝白色背景，更柔和
 
             if APP_STATE["screen"] == "menu":
                 if logo_orig is not None:
-                    # Animate: breathing (scale) + small swing (rotation)
-                    base_w, base_h = logo_base_size
-                    t = pygame.time.get_ticks() / 1000.0
-                    scale = 1.0 + LOGO_BREATH_AMPLITUDE * math.sin(2 * math.pi * LOGO_BREATH_FREQ * t)
-                    angle = LOGO_SWING_AMP * math.sin(2 * math.pi * LOGO_SWING_FREQ * t)
-
-                    sw_scaled = max(1, int(base_w * scale))
-                    sh_scaled = max(1, int(base_h * scale))
-                    try:
-                        scaled = pygame.transform.smoothscale(logo_orig, (sw_scaled, sh_scaled))
-                    except Exception:
-                        scaled = pygame.transform.scale(logo_orig, (sw_scaled, sh_scaled))
+                    # Animate: breathing (scale) + small swing (rotation), looked up by integer phase
+                    phase = (pygame.time.get_ticks() % LOGO_PHASE_PERIOD_MS) * LOGO_PHASE_STEPS // LOGO_PHASE_PERIOD_MS
+                    scale, angle = LOGO_PHASES[phase]
 
-                    rotated = pygame.transform.rotate(scaled, angle)
+                    rotated = get_logo_frame(logo_orig, logo_base_size, scale, angle)
                     rrect = rotated.get_rect()
                     # place logo using top-right anchor
                     rrect.topright = logo_anchor
                     screen.blit(rotated, rrect)
 
-                # Update button slide-in animations
-                now = pygame.time.get_ticks() / 1000.0
-                for b in buttons:
-                    anim = BUTTON_ANIMS.get(id(b))
-                    if anim and not anim.get("finished", False):
-                        elapsed = now - anim.get("delay", 0)
-                        dur = anim.get("duration", 0.5)
-                        if elapsed <= 0:
-                            b.set_position(anim["start_x"], anim["y"])
-                        else:
-                            prog = min(1.0, elapsed / dur)
-                            eased = 1 - pow(1 - prog, 3)
-                            sx = anim["start_x"]
-                            tx = anim["target_x"]
-                            cur_x = int(sx + (tx - sx) * eased)
-                            b.set_position(cur_x, anim["y"])
-                            if prog >= 1.0:
-                                anim["finished"] = True
+                # Update button slide-in animations (skipped entirely once every button has arrived)
+                if slide_buttons is not buttons:
+                    slide_buttons = buttons
+                    slides_done = False
+                if not slides_done:
+                    slides_done = update_button_slides(buttons, pygame.time.get_ticks())
 
                 for b in buttons:
                     b.draw(screen)
             elif APP_STATE["screen"] == "play":
-                ui = APP_STATE["ui"]
-                if ui is None:
-                    ui = build_play_ui(screen.get_size())
-                    # create play-specific buttons from config and attach to ui
-                    play_buttons = create_buttons_from_config(BUTTONS_CONFIG, CALLBACKS, screen.get_size(), logo_anchor, screen_filter="play", click_sound=confirm_sound)
-                    for pb in play_buttons:
-                        cid = getattr(pb, "_cfg_id", None)
-                        if cid == "play_back":
-                            ui["back_btn"] = pb
-                        elif cid == "play_send":
-                            ui["send_btn"] = pb
-                    # 初次进入游戏界面时，用服务器的 current_room 状态同步 HUD，
-                    # 确保中途加入的玩家看到与已有玩家一致的回合、倒计时与词语。
-                    try:
-                        current_room = APP_STATE.get("current_room") or {}
-                        hud = ui.get("hud")
-                        if isinstance(hud, dict) and current_room:
-                            # 同步回合时长与剩余时间
-                            rd = current_room.get("round_duration")
-                            if isinstance(rd, (int, float)):
-                                hud["round_time_total"] = float(rd)
-                            tl = current_room.get("time_left")
-                            if isinstance(tl, (int, float)):
-                                hud["round_time_left"] = float(tl)
-
-                            # 同步绘者身份与当前词语
-                            drawer_id = current_room.get("drawer_id")
-                            self_id = APP_STATE.get("settings", {}).get("player_id")
-                            hud["is_drawer"] = bool(drawer_id and self_id and str(drawer_id) == str(self_id))
-                            if hud["is_drawer"]:
-                                hud["current_word"] = current_room.get("current_word")
-                            else:
-                                hud["current_word"] = None
-                    except Exception:
-                        pass
-                    APP_STATE["ui"] = ui
+                ui = _ensure_ui()
 
                 # 根据主题绘制背景
-                theme = APP_STATE["settings"].get("theme", "light")
                 if theme == "dark":
                     screen.fill((28, 30, 35))
                 else:
@@ -1941,96 +2529,90 @@ def main() -> None:
                     ui["back_btn"].draw(screen)
 
                 # 显示玩家得分排行：使用画布左侧预留区域，始终显示积分榜面板
-                current_room = APP_STATE.get("current_room") or {}
-                players = current_room.get("players", {})
                 if ui.get("canvas"):
-                    try:
-                        font_score = pygame.font.SysFont("Microsoft YaHei", 20)
-                    except:
-                        font_score = pygame.font.SysFont(None, 20)
-
-                    canvas_rect = ui["canvas"].rect
-                    # 画布左侧预留约 180 像素作为积分榜区域，这里整体贴着左侧边缘
-                    score_x = max(10, canvas_rect.x - 180)
-                    score_y = canvas_rect.y + 10
-
-                    # 绘制积分榜面板背景（始终显示）
-                    panel_w = 170
-                    panel_h = max(60, 50 + len(players) * 36)  # 根据玩家数量动态调整高度
-                    panel_rect = pygame.Rect(score_x - 5, score_y - 5, panel_w, panel_h)
-                    pygame.draw.rect(screen, (250, 250, 255), panel_rect)
-                    pygame.draw.rect(screen, (180, 180, 200), panel_rect, 2)
+                    score_key = ("Microsoft YaHei", 20)
+                    # 排序与换行布局只在玩家数据变化（players_version 递增）时重算，其余帧直接回放绘制列表
+                    players_version = APP_STATE.get("players_version", 0)
+                    if ui.get("_score_cache_ver") != players_version or "_score_draw_list" not in ui:
+                        current_room = APP_STATE.get("current_room") or {}
+                        players = current_room.get("players", {})
+                        font_score = get_font(*score_key)
 
-                    # 标题
-                    title = font_score.render("得分榜", True, (60, 60, 60))
-                    screen.blit(title, (score_x + 40, score_y))
+                        canvas_rect = ui["canvas"].rect
+                        # 画布左侧预留约 180 像素作为积分榜区域，这里整体贴着左侧边缘
+                        score_x = max(10, canvas_rect.x - 180)
+                        score_y = canvas_rect.y + 10
 
-                    # 排序玩家
-                    sorted_players = sorted(players.items(), key=lambda x: x[1].get("score", 0), reverse=True)
+                        # 积分榜面板背景（始终显示）
+                        panel_w = 170
+                        panel_h = max(60, 50 + len(players) * 36)  # 根据玩家数量动态调整高度
+                        panel_rect = pygame.Rect(score_x - 5, score_y - 5, panel_w, panel_h)
 
-                    # 当前绘制起始 y 位置（支持根据内容高度动态累积）
-                    row_y = score_y + 40
-                    max_name_width = 120  # 名字区域最大宽度，超出时自动换行
+                        # 排序玩家
+                        sorted_players = sorted(players.items(), key=lambda x: x[1].get("score", 0), reverse=True)
 
-                    for pid, pdata in sorted_players:
-                        name = pdata.get("name", "玩家")
-                        score = pdata.get("score", 0)
+                        # 当前绘制起始 y 位置（支持根据内容高度动态累积）
+                        row_y = score_y + 40
+                        max_name_width = 120  # 名字区域最大宽度，超出时自动换行
                         drawer_id = current_room.get("drawer_id")
-                        is_drawer = (pid == drawer_id)
-
-                        # 名字前缀：标记当前绘画者
-                        prefix = "正在创作 " if is_drawer else ""
-                        full_name = f"{prefix}{name}"
-
-                        # 简单按字符宽度自动换行，保证文本不延伸到画板上
-                        lines = []
-                        current_line = ""
-                        for ch in full_name:
-                            test = current_line + ch
-                            if not current_line:
-                                current_line = ch
-                                continue
-                            test_surf = font_score.render(test, True, (40, 40, 40))
-                            if test_surf.get_width() <= max_name_width:
-                                current_line = test
-                            else:
-                                lines.append(current_line)
-                                current_line = ch
-                        if current_line:
-                            lines.append(current_line)
-                        if not lines:
-                            lines = [full_name]
-
                         line_height = font_score.get_height()
-                        text_h = line_height * len(lines)
 
-                        # 背景（高度根据行数自适应，完全在画布左侧的单独区域内）
-                        bg_height = max(28, text_h + 6)
-                        bg_rect = pygame.Rect(score_x, row_y - 5, 160, bg_height)
-                        color = (255, 250, 200) if is_drawer else (245, 245, 245)
-                        pygame.draw.rect(screen, color, bg_rect)
-                        pygame.draw.rect(screen, (200, 200, 200), bg_rect, 1)
-
-                        # 名字多行绘制
-                        for li, line in enumerate(lines):
-                            line_surf = font_score.render(line, True, (40, 40, 40))
-                            screen.blit(line_surf, (score_x + 5, row_y + li * line_height))
+                        # 每项: (bg_rect, bg_color, [(line_surf, pos), ...], score_surf, score_pos)
+                        draw_list = []
+                        for pid, pdata in sorted_players:
+                            name = pdata.get("name", "玩家")
+                            score = pdata.get("score", 0)
+                            is_drawer = (pid == drawer_id)
+
+                            # 名字前缀：标记当前绘画者
+                            prefix = "正在创作 " if is_drawer else ""
+                            full_name = f"{prefix}{name}"
+
+                            # 按像素宽度自动换行，保证文本不延伸到画板上
+                            lines = _wrap(full_name, max_name_width, score_key)
+                            text_h = line_height * len(lines)
+
+                            # 背景（高度根据行数自适应，完全在画布左侧的单独区域内）
+                            bg_height = max(28, text_h + 6)
+                            bg_rect = pygame.Rect(score_x, row_y - 5, 160, bg_height)
+                            color = (255, 250, 200) if is_drawer else (245, 245, 245)
+
+                            # 名字多行
+                            line_blits = [
+                                (_render(line, score_key, (40, 40, 40)), (score_x + 5, row_y + li * line_height))
+                                for li, line in enumerate(lines)
+                            ]
+
+                            # 分数垂直居中绘制在背景右侧
+                            score_txt = _render(f"{score}", score_key, (40, 40, 40))
+                            score_y_center = row_y + (bg_height - score_txt.get_height()) // 2
+                            draw_list.append((bg_rect, color, line_blits, score_txt, (score_x + 120, score_y_center)))
+
+                            # 为下一名玩家向下偏移，预留少量行间距
+                            row_y += bg_height + 4
+
+                        ui["_score_panel"] = (panel_rect, (score_x + 40, score_y))
+                        ui["_score_draw_list"] = draw_list
+                        ui["_score_cache_ver"] = players_version
+
+                    panel_rect, title_pos = ui["_score_panel"]
+                    pygame.draw.rect(screen, (250, 250, 255), panel_rect)
+                    pygame.draw.rect(screen, (180, 180, 200), panel_rect, 2)
 
-                        # 分数垂直居中绘制在背景右侧
-                        score_txt = font_score.render(f"{score}", True, (40, 40, 40))
-                        score_y_center = row_y + (bg_height - score_txt.get_height()) // 2
-                        screen.blit(score_txt, (score_x + 120, score_y_center))
+                    # 标题
+                    screen.blit(_render("得分榜", score_key, (60, 60, 60)), title_pos)
 
-                        # 为下一名玩家向下偏移，预留少量行间距
-                        row_y += bg_height + 4
+                    for bg_rect, color, line_blits, score_txt, score_pos in ui["_score_draw_list"]:
+                        pygame.draw.rect(screen, color, bg_rect)
+                        pygame.draw.rect(screen, (200, 200, 200), bg_rect, 1)
+                        for line_surf, pos in line_blits:
+                            screen.blit(line_surf, pos)
+                        screen.blit(score_txt, score_pos)
 
                 # 移除“下一轮”按钮显示
             elif APP_STATE["screen"] == "room_list":
                 process_network_messages(APP_STATE.get("ui"))
-                ui = APP_STATE["ui"]
-                if ui is None:
-                    ui = build_room_list_ui(screen.get_size())
-                    APP_STATE["ui"] = ui
+                ui = _ensure_ui()
 
                 if ui:
                     if ui.get("refresh_btn"): ui["refresh_btn"].draw(screen)
@@ -2040,19 +2622,15 @@ def main() -> None:
                         btn.draw(screen)
 
                     # Title
-                    try:
-                        font = pygame.font.SysFont("Microsoft YaHei", 40)
-                    except:
-                        font = pygame.font.SysFont(None, 40)
-                    title = font.render("房间列表", True, (0, 0, 0))
-                    screen.blit(title, (screen.get_width() // 2 - title.get_width() // 2, 50))
+                    title = _render("房间列表", ("Microsoft YaHei", 40), (0, 0, 0))
+                    screen.blit(title, (sw // 2 - title.get_width() // 2, 50))
 
             elif APP_STATE["screen"] == "creating_room":
                 # 创建房间加载界面：显示主提示、返回按钮和实时日志
                 process_network_messages(APP_STATE.get("ui"))
                 screen.fill((240, 242, 250))
 
-                ui = APP_STATE.get("ui") or {}
+                ui = _ensure_ui() or {}
 
                 # 若在创建房间加载界面停留超过 3 秒，自动尝试重启本地服务器一次
                 try:
@@ -2081,23 +2659,14 @@ def main() -> None:
                 except Exception:
                     pass
 
-                try:
-                    font_title = pygame.font.SysFont("Microsoft YaHei", 40)
-                    font_tip = pygame.font.SysFont("Microsoft YaHei", 24)
-                    font_log = pygame.font.SysFont("Microsoft YaHei", 20)
-                except Exception:
-                    font_title = pygame.font.SysFont(None, 40)
-                    font_tip = pygame.font.SysFont(None, 24)
-                    font_log = pygame.font.SysFont(None, 20)
-
                 text = "正在创建房间..."
-                title = font_title.render(text, True, (50, 80, 150))
-                tx = (screen.get_width() - title.get_width()) // 2
-                ty = screen.get_height() // 2 - 80
+                title = _render(text, ("Microsoft YaHei", 40), (50, 80, 150))
+                tx = (sw - title.get_width()) // 2
+                ty = sh // 2 - 80
                 screen.blit(title, (tx, ty))
 
-                tip_txt = font_tip.render("如长时间无响应，可点击左上角返回房间列表", True, (100, 100, 110))
-                tip_x = (screen.get_width() - tip_txt.get_width()) // 2
+                tip_txt = _render("如长时间无响应，可点击左上角返回房间列表", ("Microsoft YaHei", 24), (100, 100, 110))
+                tip_x = (sw - tip_txt.get_width()) // 2
                 tip_y = ty + 60
                 screen.blit(tip_txt, (tip_x, tip_y))
 
@@ -2108,8 +2677,8 @@ def main() -> None:
                 line_spacing = 26
                 visible_logs = logs[-max_lines:]
                 for i, line in enumerate(visible_logs):
-                    log_surf = font_log.render(str(line), True, (80, 80, 90))
-                    lx = (screen.get_width() - log_surf.get_width()) // 2
+                    log_surf = _render(str(line), ("Microsoft YaHei", 20), (80, 80, 90))
+                    lx = (sw - log_surf.get_width()) // 2
                     ly = start_y + i * line_spacing
                     screen.blit(log_surf, (lx, ly))
 
@@ -2119,14 +2688,11 @@ def main() -> None:
 
             elif APP_STATE["screen"] == "lobby":
                 process_network_messages(APP_STATE.get("ui"))
-                ui = APP_STATE["ui"]
-                if ui is None:
-                    ui = build_lobby_ui(screen.get_size())
-                    APP_STATE["ui"] = ui
+                _apply_ui_dirty(APP_STATE.get("ui"))
+                ui = _ensure_ui()
 
                 if ui:
                     # 背景按主题
-                    theme = APP_STATE["settings"].get("theme", "light")
                     if theme == "dark":
                         screen.fill((28, 30, 35))
                         title_color = (200, 220, 255)
@@ -2136,12 +2702,11 @@ def main() -> None:
                         title_color = (0, 0, 0)
                         text_color = (0, 0, 0)
 
-                    sw, sh = screen.get_size()
                     # 检查是否为房主
                     current_room = APP_STATE.get("current_room") or {}
                     owner_id = current_room.get("owner_id")
                     self_id = APP_STATE.get("settings", {}).get("player_id")
-                    is_owner = owner_id and self_id and str(owner_id) == str(self_id)
+                    is_owner = bool(self_id and owner_id == self_id)
 
                     # 显示“开始游戏”按钮（非房主点击后由服务器拒绝）
                     if ui.get("start_btn"): ui["start_btn"].draw(screen)
@@ -2150,45 +2715,38 @@ def main() -> None:
                         btn.draw(screen)
 
                     # Room Info（允许 current_room 为 None，使用空字典兜底）
-                    current_room = APP_STATE.get("current_room") or {}
                     rid = current_room.get("room_id", "Unknown")
-                    try:
-                        font = pygame.font.SysFont("Microsoft YaHei", 30)
-                        font_p = pygame.font.SysFont("Microsoft YaHei", 24)
-                    except:
-                        font = pygame.font.SysFont(None, 30)
-                        font_p = pygame.font.SysFont(None, 24)
-
-                    title = font.render(f"房间: {rid}", True, title_color)
-                    screen.blit(title, (screen.get_width() // 2 - title.get_width() // 2, 50))
-                    # 显示房主
-                    owner_id = current_room.get("owner_id")
-                    owner_name = None
-                    if owner_id:
-                        try:
-                            owner_name = (current_room.get("players", {}) or {}).get(str(owner_id), {}).get("name")
-                        except Exception:
-                            owner_name = None
-                    try:
-                        font_owner = pygame.font.SysFont("Microsoft YaHei", 22)
-                    except:
-                        font_owner = pygame.font.SysFont(None, 22)
-                    owner_label = f"房主: {owner_name or '未指定'}"
-                    owner_txt = font_owner.render(owner_label, True, text_color)
-                    screen.blit(owner_txt, (100, 110))
-
-                    # Player List
-                    players = current_room.get("players", {})
-                    start_y = 150
-                    idx = 0
-                    # 积分榜始终在前：按分数降序显示
-                    sorted_players = sorted(players.items(), key=lambda x: x[1].get("score", 0), reverse=True)
-                    for pid, pdata in sorted_players:
-                        name = pdata.get("name", "Unknown")
-                        score = pdata.get("score", 0)
-                        txt = font_p.render(f"{name} - {score}分", True, text_color)
-                        screen.blit(txt, (100, start_y + idx * 40))
-                        idx += 1
+                    title = _render(f"房间: {rid}", ("Microsoft YaHei", 30), title_color)
+                    screen.blit(title, (sw // 2 - title.get_width() // 2, 50))
+                    # 房主标签与玩家列表只在玩家数据变化时重建（_apply_ui_dirty 会清除缓存）
+                    if "_lobby_row_surfs" not in ui:
+                        # 显示房主
+                        owner_id = current_room.get("owner_id")
+                        owner_name = None
+                        if owner_id:
+                            try:
+                                owner_name = (current_room.get("players", {}) or {}).get(owner_id, {}).get("name")
+                            except Exception:
+                                owner_name = None
+                        owner_label = f"房主: {owner_name or '未指定'}"
+                        ui["_owner_surf"] = _render(owner_label, ("Microsoft YaHei", 22), text_color)
+
+                        # Player List
+                        players = current_room.get("players", {})
+                        start_y = 150
+                        # 积分榜始终在前：按分数降序显示
+                        sorted_players = sorted(players.items(), key=lambda x: x[1].get("score", 0), reverse=True)
+                        row_surfs = []
+                        for idx, (pid, pdata) in enumerate(sorted_players):
+                            name = pdata.get("name", "Unknown")
+                            score = pdata.get("score", 0)
+                            txt = _render(f"{name} - {score}分", ("Microsoft YaHei", 24), text_color)
+                            row_surfs.append((txt, (100, start_y + idx * 40)))
+                        ui["_lobby_row_surfs"] = row_surfs
+
+                    screen.blit(ui["_owner_surf"], (100, 110))
+                    for surf, pos in ui["_lobby_row_surfs"]:
+                        screen.blit(surf, pos)
 
                     # 游戏参数设置（仅房主）
                     # 房主设置面板：放到画面右侧竖直排列，并支持折叠
@@ -2199,70 +2757,19 @@ def main() -> None:
                         ui["settings_toggle_btn"].draw(screen)
 
                     if is_owner and not collapsed:
-                        try:
-                            font_s = pygame.font.SysFont("Microsoft YaHei", 20)
-                        except:
-                            font_s = pygame.font.SysFont(None, 20)
-
-                        # 使用输入框的位置来对齐文字和背景面板
-                        rounds_rect = ui["rounds_input"].rect
-                        time_rect = ui["time_input"].rect
-                        rest_rect = ui["rest_input"].rect
-
-                        # 预先计算标签最大宽度，用于为标签预留足够的左侧空间
-                        label_texts = ["轮数", "时间/轮", "休息"]
-                        max_label_w = 0
-                        for text in label_texts:
-                            surf = font_s.render(text, True, (60, 60, 60))
-                            if surf.get_width() > max_label_w:
-                                max_label_w = surf.get_width()
-
-                        # 面板整体区域（包含标题、三个输入框和按钮）
-                        panel_left = min(rounds_rect.x, time_rect.x, rest_rect.x) - (max_label_w + 30)
-                        panel_top = min(rounds_rect.y, time_rect.y, rest_rect.y) - 40
-                        panel_right = max(
-                            rounds_rect.right,
-                            time_rect.right,
-                            rest_rect.right,
-                            ui["apply_btn"].rect.right,
-                        ) + 20
-                        panel_bottom = ui["apply_btn"].rect.bottom + 20
-                        panel_rect = pygame.Rect(
-                            panel_left,
-                            panel_top,
-                            panel_right - panel_left,
-                            panel_bottom - panel_top,
-                        )
-
-                        # 背景与边框
+                        # 面板几何与标签 Surface 在构建大厅 UI 时已计算好，这里只做绘制
+                        panel_rect = ui["_settings_panel_rect"]
                         pygame.draw.rect(screen, (245, 245, 250), panel_rect)
                         pygame.draw.rect(screen, (200, 200, 220), panel_rect, 1)
 
-                        # 标题
-                        title_txt = font_s.render("房主游戏设置", True, (60, 60, 80))
-                        screen.blit(title_txt, (panel_left + 10, panel_top + 10))
-
-                        # 标签与输入框：根据 TextInput 位置对齐
-                        def _draw_label(label: str, target_rect: pygame.Rect) -> None:
-                            # 标签与对应输入框右对齐到同一“行”，并整体位于输入框左侧，不会被盖住
-                            label_surf = font_s.render(label, True, (60, 60, 60))
-                            ly = target_rect.y + (target_rect.height - label_surf.get_height()) // 2
-                            lx = target_rect.x - label_surf.get_width() - 10
-                            screen.blit(label_surf, (lx, ly))
-
-                        _draw_label("轮数", rounds_rect)
-                        _draw_label("时间/轮", time_rect)
-                        _draw_label("休息", rest_rect)
+                        # 标题与标签
+                        for label, label_surf in ui["_settings_label_surfs"].items():
+                            screen.blit(label_surf, ui["_settings_label_positions"][label])
 
                         ui["rounds_input"].draw(screen)
                         ui["time_input"].draw(screen)
                         ui["rest_input"].draw(screen)
-                        # 让“应用设置”按钮在设置面板内水平居中，并同步更新文字位置
-                        apply_btn = ui["apply_btn"]
-                        new_x = panel_left + (panel_rect.width - apply_btn.rect.width) // 2
-                        if apply_btn.rect.x != new_x:
-                            apply_btn.set_position(new_x, apply_btn.rect.y)
-                        apply_btn.draw(screen)
+                        ui["apply_btn"].draw(screen)
 
                     # 聊天面板
                     if ui.get("chat"):
@@ -2274,154 +2781,85 @@ def main() -> None:
 
             elif APP_STATE["screen"] == "result":
                 # 游戏结果界面
-                ui = APP_STATE["ui"]
-                if ui is None:
-                    ui = build_result_ui(screen.get_size())
-                    APP_STATE["ui"] = ui
+                ui = _ensure_ui()
 
                 screen.fill((240, 245, 250))
 
                 # 标题
-                try:
-                    font_title = pygame.font.SysFont("Microsoft YaHei", 50, bold=True)
-                    font_rank = pygame.font.SysFont("Microsoft YaHei", 32)
-                    font_name = pygame.font.SysFont("Microsoft YaHei", 28)
-                except:
-                    font_title = pygame.font.SysFont(None, 50)
-                    font_rank = pygame.font.SysFont(None, 32)
-                    font_name = pygame.font.SysFont(None, 28)
-
-                title = font_title.render("🏆 游戏结束 - 最终排名 🏆", True, (200, 100, 50))
+                title_key = ("Microsoft YaHei", 50, True)
+                rank_key = ("Microsoft YaHei", 32)
+                name_key = ("Microsoft YaHei", 28)
+
+                title = _render("🏆 游戏结束 - 最终排名 🏆", title_key, (200, 100, 50))
                 screen.blit(title, (sw // 2 - title.get_width() // 2, 80))
 
                 # 显示排名
                 ranking = APP_STATE.get("game_result", [])
                 start_y = 200
-                colors = [(255, 215, 0), (192, 192, 192), (205, 127, 50)]  # 金银铜
+                rank_bg_surfs = ui["rank_bg_surfs"]  # 金银铜 + 其他
 
+                # 每行按 背景、排名、名字、分数 的顺序收集，循环结束后一次 blits 提交
+                blit_seq = []
                 for i, player_data in enumerate(ranking[:10]):  # 最多显示前10名
                     rank = i + 1
                     name = player_data.get("name", "玩家")
                     score = player_data.get("score", 0)
+                    row_y = start_y + i * 50
 
                     # 背景框
-                    bg_color = colors[i] if i < 3 else (220, 220, 220)
-                    bg_alpha = 120 if i < 3 else 80
-                    bg_rect = pygame.Rect(sw // 2 - 250, start_y + i * 50, 500, 45)
-                    s = pygame.Surface((bg_rect.width, bg_rect.height))
-                    s.set_alpha(bg_alpha)
-                    s.fill(bg_color)
-                    screen.blit(s, bg_rect.topleft)
+                    blit_seq.append((rank_bg_surfs[min(i, 3)], (sw // 2 - 250, row_y)))
 
                     # 排名
-                    rank_txt = font_rank.render(f"#{rank}", True, (60, 60, 60) if i >= 3 else (40, 40, 40))
-                    screen.blit(rank_txt, (sw // 2 - 230, start_y + i * 50 + 8))
+                    rank_txt = _render(f"#{rank}", rank_key, (60, 60, 60) if i >= 3 else (40, 40, 40))
+                    blit_seq.append((rank_txt, (sw // 2 - 230, row_y + 8)))
 
                     # 名字
-                    name_txt = font_name.render(name, True, (20, 20, 20))
-                    screen.blit(name_txt, (sw // 2 - 150, start_y + i * 50 + 10))
+                    name_txt = _render(name, name_key, (20, 20, 20))
+                    blit_seq.append((name_txt, (sw // 2 - 150, row_y + 10)))
 
                     # 分数
-                    score_txt = font_name.render(f"{score} 分", True, (20, 20, 20))
-                    screen.blit(score_txt, (sw // 2 + 150, start_y + i * 50 + 10))
+                    score_txt = _render(f"{score} 分", name_key, (20, 20, 20))
+                    blit_seq.append((score_txt, (sw // 2 + 150, row_y + 10)))
+                screen.blits(blit_seq, doreturn=False)
 
                 # 返回按钮
                 if ui.get("back_btn"):
                     ui["back_btn"].draw(screen)
 
             elif APP_STATE["screen"] == "settings":
-                ui = APP_STATE["ui"]
-                if ui is None:
-                    ui = build_settings_ui(screen.get_size())
-                    # attach settings buttons from config
-                    settings_buttons = create_buttons_from_config(BUTTONS_CONFIG, CALLBACKS, screen.get_size(), logo_anchor, screen_filter="settings", click_sound=confirm_sound)
-                    for sb in settings_buttons:
-                        cid = getattr(sb, "_cfg_id", None)
-                        if cid == "settings_back":
-                            ui["back_btn"] = sb
-                        elif cid == "settings_light":
-                            ui["light_btn"] = sb
-                        elif cid == "settings_dark":
-                            ui["dark_btn"] = sb
-                        elif cid == "settings_fullscreen":
-                            ui["fullscreen_btn"] = sb
-                    APP_STATE["ui"] = ui
-
-                # 根据主题绘制设置界面背景
-                theme = APP_STATE["settings"].get("theme", "light")
-                if theme == "dark":
-                    bg_color = (28, 30, 35)
-                    panel_bg = (40, 44, 52)
-                    panel_border = (80, 90, 110)
-                    title_color = (200, 220, 255)
-                    label_color = (210, 210, 210)
-                    value_color = (220, 220, 220)
-                else:
-                    bg_color = (240, 242, 250)
-                    panel_bg = (255, 255, 255)
-                    panel_border = (180, 200, 220)
-                    title_color = (50, 80, 150)
-                    label_color = (60, 60, 60)
-                    value_color = (80, 80, 80)
-                screen.fill(bg_color)
-
-                # 绘制设置面板（白色背景，有边框）
-                panel_rect = pygame.Rect(20, 20, screen.get_width() - 40, screen.get_height() - 40)
-                pygame.draw.rect(screen, panel_bg, panel_rect)
-                pygame.draw.rect(screen, panel_border, panel_rect, 3)
-
-                # 将返回按钮放置在面板的右上角，避免遮挡面板内部内容
-                if ui.get("back_btn"):
-                    try:
-                        bb = ui["back_btn"]
-                        margin = 20
-                        new_x = panel_rect.right - bb.rect.width - margin
-                        new_y = panel_rect.y + margin
-                        bb.set_position(new_x, new_y)
-                    except Exception:
-                        pass
+                ui = _ensure_ui()
 
-                try:
-                    font_title = pygame.font.SysFont("Microsoft YaHei", 40)
-                    font_label = pygame.font.SysFont("Microsoft YaHei", 24)
-                    font_value = pygame.font.SysFont("Microsoft YaHei", 20)
-                except Exception:
-                    font_title = pygame.font.SysFont(None, 40)
-                    font_label = pygame.font.SysFont(None, 24)
-                    font_value = pygame.font.SysFont(None, 20)
+                # 背景、面板、标题、分隔线与静态标签预先绘制在 chrome 上，仅在尺寸或主题变化时重建
+                panel_rect = ui["settings_panel_rect"]
+                slider_rect = ui["volume_slider_rect"]
+                chrome_key = (sw, sh, theme)
+                if ui.get("_chrome_key") != chrome_key:
+                    ui["chrome_surf"] = _build_settings_chrome(ui, (sw, sh), APP_STATE["palette"])
+                    ui["_chrome_key"] = chrome_key
+                screen.blit(ui["chrome_surf"], (0, 0))
 
-                # 标题
-                title = font_title.render("游戏设置", True, title_color)
-                screen.blit(title, (50, 30))
-
-                # 分隔线
-                pygame.draw.line(screen, (200, 200, 200), (50, 90), (screen.get_width() - 50, 90), 2)
-
-                # 玩家名字标签与输入框
-                pn_rect = ui["player_name_input"].rect
-                label = font_label.render("玩家名字:", True, label_color)
-                label_x = max(panel_rect.x + 20, pn_rect.x - label.get_width() - 16)
-                label_y = pn_rect.y + (pn_rect.height - label.get_height()) // 2
-                screen.blit(label, (label_x, label_y))
+                # 音量百分比显示（音量变化时登记滑块与数值所在的区域）
+                vol = APP_STATE["settings"]["volume"]
+                if vol != ui.get("_drawn_volume"):
+                    ui["_drawn_volume"] = vol
+                    APP_STATE["dirty_rects"].append(
+                        pygame.Rect(slider_rect.x - 12, slider_rect.y - 12, panel_rect.right - slider_rect.x + 12, slider_rect.height + 24)
+                    )
+                vol_label = _render(f"音量: {vol}%", ("Microsoft YaHei", 20), APP_STATE["palette"]["value"])
+                screen.blit(vol_label, ui["volume_value_pos"])
+
+                # 玩家名字输入框
                 ui["player_name_input"].draw(screen)
                 if ui.get("confirm_name_btn"):
                     ui["confirm_name_btn"].draw(screen)
 
                 # 难度设置已从界面移除
 
-                # 音量标签与滑块
-                slider_rect = ui["volume_slider_rect"]
-                label = font_label.render("音量:", True, label_color)
-                label_x = max(panel_rect.x + 20, slider_rect.x - label.get_width() - 16)
-                label_y = slider_rect.y + (slider_rect.height - label.get_height()) // 2
-                screen.blit(label, (label_x, label_y))
-
                 # 音量滑块背景
                 pygame.draw.rect(screen, (220, 220, 220), slider_rect)
                 pygame.draw.rect(screen, (150, 170, 220), slider_rect, 2)
 
                 # 音量进度条
-                vol = APP_STATE["settings"]["volume"]
                 progress_rect = pygame.Rect(slider_rect.x, slider_rect.y, slider_rect.width * vol / 100, slider_rect.height)
                 pygame.draw.rect(screen, (100, 150, 255), progress_rect)
 
@@ -2430,17 +2868,8 @@ def main() -> None:
                 pygame.draw.circle(screen, (50, 100, 200), (int(slider_x), int(slider_rect.centery)), 10)
                 pygame.draw.circle(screen, (100, 150, 255), (int(slider_x), int(slider_rect.centery)), 8)
 
-                # 音量百分比显示
-                vol_label = font_value.render(f"音量: {vol}%", True, value_color)
-                screen.blit(vol_label, (slider_rect.right + 16, slider_rect.y - 2))
-
-                # 服务器地址标签与输入框
+                # 服务器地址输入框与按钮
                 if ui.get("server_host_input"):
-                    sh_rect = ui["server_host_input"].rect
-                    label = font_label.render("服务器地址:", True, label_color)
-                    label_x = max(panel_rect.x + 20, sh_rect.x - label.get_width() - 16)
-                    label_y = sh_rect.y + (sh_rect.height - label.get_height()) // 2
-                    screen.blit(label, (label_x, label_y))
                     ui["server_host_input"].draw(screen)
                     if ui.get("confirm_host_btn"):
                         ui["confirm_host_btn"].draw(screen)
@@ -2451,27 +2880,19 @@ def main() -> None:
                     if ui.get("server_remote_btn"):
                         ui["server_remote_btn"].draw(screen)
 
-                # 主题切换标签与按钮
-                theme_y = None
-                if ui.get("light_btn"):
-                    theme_y = ui["light_btn"].rect.y
-                elif ui.get("dark_btn"):
-                    theme_y = ui["dark_btn"].rect.y
-                theme_label = font_label.render("主题:", True, label_color)
-                if theme_y is None:
-                    screen.blit(theme_label, (panel_rect.x + 20, panel_rect.y + 220))
-                else:
-                    screen.blit(theme_label, (panel_rect.x + 20, theme_y + 6))
+                # 主题切换按钮
                 if ui.get("light_btn"):
                     ui["light_btn"].draw(screen)
                 if ui.get("dark_btn"):
                     ui["dark_btn"].draw(screen)
                 # 全屏切换按钮
                 if ui.get("fullscreen_btn"):
-                    # 动态刷新文案，避免显示状态不一致
+                    # 全屏状态变化时才刷新文案（update_text 会重新渲染按钮文字）
                     try:
                         is_fs = bool(APP_STATE["settings"].get("fullscreen", False))
-                        ui["fullscreen_btn"].update_text(f"全屏: {'是' if is_fs else '否'}")
+                        if is_fs != ui.get("_last_fs_state"):
+                            ui["fullscreen_btn"].update_text(f"全屏: {'是' if is_fs else '否'}")
+                            ui["_last_fs_state"] = is_fs
                     except Exception:
                         pass
                     ui["fullscreen_btn"].draw(screen)
@@ -2484,29 +2905,45 @@ def main() -> None:
 
             # 绘制通知
             now_ms = pygame.time.get_ticks()
-            APP_STATE["notifications"] = [n for n in APP_STATE["notifications"] if n["end_time"] > now_ms]
-            for i, n in enumerate(APP_STATE["notifications"]):
-                try:
-                    n_font = pygame.font.SysFont("Microsoft YaHei", 24, bold=True)
-                except Exception:
-                    n_font = pygame.font.SysFont(None, 24)
-
-                txt_surf = n_font.render(n["text"], True, n["color"])
+            notifications = APP_STATE["notifications"]
+            while notifications and notifications[0]["end_time"] <= now_ms:
+                notifications.popleft()
+            # 通知出现、移动或消失时，新旧位置都需要提交
+            notification_rects = []
+            for i, n in enumerate(notifications):
+                txt_surf = n.get("_surf")
+                if txt_surf is None:
+                    # 首次绘制时渲染文本并记录背景框尺寸，之后每帧直接复用
+                    txt_surf = n["_surf"] = _render(n["text"], ("Microsoft YaHei", 24, True), n["color"])
+                    n["_bg_rect_size"] = (txt_surf.get_width() + 30, txt_surf.get_height() + 20)
                 # 居中显示在屏幕顶部
-                tx = (screen.get_width() - txt_surf.get_width()) // 2
+                tx = (sw - txt_surf.get_width()) // 2
                 ty = 50 + i * 50
                 # 绘制背景框
-                bg_rect = pygame.Rect(tx - 15, ty - 10, txt_surf.get_width() + 30, txt_surf.get_height() + 20)
+                bg_rect = pygame.Rect((tx - 15, ty - 10), n["_bg_rect_size"])
                 pygame.draw.rect(screen, (255, 255, 255), bg_rect, border_radius=8)
                 pygame.draw.rect(screen, n["color"], bg_rect, 2, border_radius=8)
                 screen.blit(txt_surf, (tx, ty))
+                notification_rects.append(bg_rect)
+            APP_STATE["dirty_rects"].extend(APP_STATE["_notification_rects"])
+            APP_STATE["dirty_rects"].extend(notification_rects)
+            APP_STATE["_notification_rects"] = notification_rects
 
-            pygame.display.flip()
+            _present_frame(APP_STATE["screen"], APP_STATE.get("ui"), (sw, sh, theme))
             clock.tick(60)
 
     except Exception as exc:  # pragma: no cover - main runtime errors
         logger.error("客户端错误: %s", exc, exc_info=True)
     finally:
+        # 界面构建函数引用了本次 main() 的局部状态，退出时注销
+        UI_BUILDERS.clear()
+        # 字体与文本 Surface 依赖 pygame 模块状态，退出前一并释放
+        LOGO_CACHE.clear()
+        _render.cache_clear()
+        _text_size.cache_clear()
+        _wrap.cache_clear()
+        clear_chat_font_cache()
+        clear_widget_font_cache()
         pygame.quit()
         logger.info("客户端已关闭")
 
@@ -3,11 +3,12 @@
 """
 from __future__ import annotations
 
+import selectors
 import socket
 import threading
 import uuid
 from queue import SimpleQueue, Empty
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from src.shared.constants import (
     BUFFER_SIZE, 
@@ -28,6 +29,17 @@ from src.shared.constants import (
 )
 from src.shared.protocols import Message
 
+# 接收线程等待数据的超时（秒）：到期后检查 _running，使 close() 后线程能及时退出
+RECV_POLL_INTERVAL = 0.25
+
+# 接收缓冲区中已解析的前缀超过该字节数（或超过缓冲区一半）时才整体前移
+RECV_COMPACT_THRESHOLD = 64 * 1024
+
+# 可由 flush() 合并发送的无参请求：请求名 -> 消息类型
+BATCHABLE_REQUESTS: Dict[str, str] = {
+    "list_rooms": MSG_LIST_ROOMS,
+}
+
 
 class NetworkClient:
     """线程驱动的轻量客户端，用于房间聊天等同步。"""
@@ -39,7 +51,16 @@ class NetworkClient:
         self._recv_thread: Optional[threading.Thread] = None
         self._running = threading.Event()
         self._buf = bytearray()
+        self._head = 0  # _buf 中尚未解析部分的起始下标
+        # recv_into 的预分配读缓冲区，避免每次 recv 都分配新的 bytes
+        self._rbuf = bytearray(BUFFER_SIZE)
+        self._rview = memoryview(self._rbuf)
+        # 待合并发送的连续线段：折线顶点与其画笔样式 (color, size, mode)
+        self._draw_points: List[List[int]] = []
+        self._draw_style: Optional[Tuple[Any, ...]] = None
         self.events: SimpleQueue[Message] = SimpleQueue()
+        # 每批新消息入队后在接收线程中调用一次，用于唤醒阻塞等待界面事件的主循环
+        self.on_messages: Optional[Callable[[], None]] = None
         self.player_id: Optional[str] = None
         self.player_name: Optional[str] = None
         self.room_id: str = "default"
@@ -118,7 +139,11 @@ class NetworkClient:
 
     def send_draw(self, payload: Dict[str, Any]) -> None:
         """发送绘画同步消息到服务器
-        
+
+        首尾相接且样式相同的 "line" 动作先暂存为折线，由 flush_draw()
+        （每帧一次）合并成一条 "points" 消息发送；其他动作会先冲刷暂存的折线，
+        以保证远端的绘制顺序不变。
+
         Args:
             payload: 绘画动作数据，包括kind、颜色、大小等
         """
@@ -126,8 +151,54 @@ class NetworkClient:
             return
         if not self.connected:
             return
+        if payload.get("kind") == "line" and payload.get("from") and payload.get("to"):
+            style = (tuple(payload.get("color") or ()), payload.get("size"), payload.get("mode"))
+            start = list(payload["from"])
+            end = list(payload["to"])
+            points = self._draw_points
+            if not (points and style == self._draw_style and points[-1] == start):
+                self.flush_draw()
+                points = self._draw_points
+                points.append(start)
+                self._draw_style = style
+            points.append(end)
+            return
+        self.flush_draw()
         self._send(Message(MSG_DRAW, payload))
 
+    def flush_draw(self) -> None:
+        """发送暂存的折线（只有一段时仍按 "line" 发送）。"""
+        points = self._draw_points
+        if not points:
+            return
+        color, size, mode = self._draw_style or ((), None, None)
+        if len(points) == 2:
+            payload: Dict[str, Any] = {"kind": "line", "from": points[0], "to": points[1]}
+        else:
+            payload = {"kind": "points", "points": points}
+        # 只写入原始线段中带有的样式字段，缺省的字段仍然省略
+        if color:
+            payload["color"] = list(color)
+        if size is not None:
+            payload["size"] = size
+        if mode is not None:
+            payload["mode"] = mode
+        self._draw_points = []
+        self._draw_style = None
+        if self.connected:
+            self._send(Message(MSG_DRAW, payload))
+
+    def flush(self, ops: Iterable[str]) -> None:
+        """将本帧登记的无参请求（如 "list_rooms"）拼接后一次写入 socket。
+
+        未知的请求名会被忽略；同名请求由调用方（集合）去重。
+        """
+        payload = b"".join(
+            self._encode(Message(BATCHABLE_REQUESTS[op], {})) for op in ops if op in BATCHABLE_REQUESTS
+        )
+        if payload:
+            self._send_bytes(payload)
+
     def drain_events(self) -> List[Message]:
         items: List[Message] = []
         while True:
@@ -139,54 +210,108 @@ class NetworkClient:
 
     def close(self) -> None:
         self._running.clear()
-        try:
-            if self.sock:
-                try:
-                    self.sock.shutdown(socket.SHUT_RDWR)
-                except OSError:
-                    pass
-                self.sock.close()
-        finally:
-            self.sock = None
+        # 先取出再置空，避免与接收线程同时关闭时访问到 None
+        sock, self.sock = self.sock, None
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
 
     # 内部方法
+    @staticmethod
+    def _encode(msg: Message) -> bytes:
+        return msg.to_bytes() + b"\n"
+
     def _send(self, msg: Message) -> None:
+        self._send_bytes(self._encode(msg))
+
+    def _send_bytes(self, payload: bytes) -> None:
         if not self.sock:
             return
         try:
-            payload = msg.to_json() + "\n"
-            self.sock.sendall(payload.encode("utf-8"))
+            self.sock.sendall(payload)
         except OSError:
             self.close()
 
     def _recv_loop(self) -> None:
+        sock = self.sock
+        if sock is None:
+            return
+        sel = selectors.DefaultSelector()
         try:
-            while self._running.is_set() and self.sock:
-                data = self.sock.recv(BUFFER_SIZE)
-                if not data:
-                    break
-                self._buf.extend(data)
+            sel.register(sock, selectors.EVENT_READ)
+            closed = False
+            while self._running.is_set() and not closed:
+                if not sel.select(timeout=RECV_POLL_INTERVAL):
+                    continue
+                # 一次唤醒内读完所有已到达的数据（直接追加到 _buf），再统一解析
+                buf = self._buf
+                start = len(buf)
                 while True:
-                    try:
-                        idx = self._buf.index(ord("\n"))
-                    except ValueError:
+                    n = sock.recv_into(self._rview)
+                    if not n:
+                        closed = True
                         break
-                    raw = self._buf[:idx]
-                    del self._buf[: idx + 1]
-                    self._handle_raw(raw)
-        except OSError:
+                    buf += self._rview[:n]
+                    if not sel.select(timeout=0):
+                        break
+                if len(buf) > start:
+                    self._parse_lines(start)
+        except (OSError, ValueError):
+            # close() 在其他线程关闭 socket 时，select/recv 会抛出异常
             pass
         finally:
-            self.close()
+            sel.close()
+            if self.sock is sock:
+                self.close()
+
+    def _feed(self, data: bytes) -> None:
+        """追加收到的数据并解析其中完整的行消息。"""
+        start = len(self._buf)
+        self._buf.extend(data)
+        self._parse_lines(start)
 
-    def _handle_raw(self, raw: bytes) -> None:
+    def _parse_lines(self, start: int) -> None:
+        """解析 _buf 中完整的行消息；start 之前的未解析数据已确认没有换行符。
+
+        通过 _head 记录解析位置，不再每条消息都删除缓冲区前缀；
+        只有已解析部分足够大时才一次性前移剩余数据。每条消息以
+        memoryview 切片交给解析器，不复制字节。
+        """
+        buf = self._buf
+        head = self._head
+        queued = False
+        # memoryview 存在期间不能改变 buf 大小，需在前移之前释放
+        with memoryview(buf) as view:
+            while True:
+                idx = buf.find(b"\n", start)
+                if idx < 0:
+                    break
+                queued = self._handle_raw(view[head:idx]) or queued
+                head = start = idx + 1
+        if head >= len(buf):
+            buf.clear()
+            head = 0
+        elif head > RECV_COMPACT_THRESHOLD or head > len(buf) // 2:
+            del buf[:head]
+            head = 0
+        self._head = head
+        if queued and self.on_messages is not None:
+            try:
+                self.on_messages()
+            except Exception:
+                pass
+
+    def _handle_raw(self, raw: memoryview) -> bool:
+        """解析一条消息并放入事件队列；返回是否成功入队。"""
         try:
-            text = raw.decode("utf-8", errors="replace")
-            msg = Message.from_json(text)
-            self.events.put(msg)
+            self.events.put(Message.from_bytes(raw))
         except Exception:
             # 忽略无法解析的消息
-            pass
+            return False
+        return True
 
 
 __all__ = ["NetworkClient"]
@@ -13,11 +13,48 @@
 from __future__ import annotations
 
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 import pygame
 
+from src.client.ui.fonts import get_font
+
+# 与上一个采样点的曼哈顿距离小于该值时丢弃新点
+MIN_POINT_DISTANCE = 2
+# 笔划结束时 Ramer–Douglas–Peucker 简化的容差（像素）
+SIMPLIFY_EPSILON = 1.0
+
+
+def _simplify_rdp(points: List[Tuple[int, int]], epsilon: float) -> List[Tuple[int, int]]:
+	"""Ramer–Douglas–Peucker 折线简化（迭代实现，避免长笔划递归过深）"""
+	n = len(points)
+	if n < 3:
+		return points
+	keep = [False] * n
+	keep[0] = keep[-1] = True
+	stack = [(0, n - 1)]
+	while stack:
+		first, last = stack.pop()
+		(x1, y1), (x2, y2) = points[first], points[last]
+		dx, dy = x2 - x1, y2 - y1
+		norm = (dx * dx + dy * dy) ** 0.5
+		max_dist, index = 0.0, first
+		for i in range(first + 1, last):
+			px, py = points[i]
+			if norm:
+				dist = abs(dy * (px - x1) - dx * (py - y1)) / norm
+			else:
+				dist = ((px - x1) ** 2 + (py - y1) ** 2) ** 0.5
+			if dist > max_dist:
+				max_dist, index = dist, i
+		if max_dist > epsilon:
+			keep[index] = True
+			stack.append((first, index))
+			stack.append((index, last))
+	return [p for p, k in zip(points, keep) if k]
+
 
 @dataclass
 class Stroke:
@@ -37,6 +74,8 @@ class Canvas:
 		self.height = height
 		self._strokes: List[Stroke] = []
 		self._current: Optional[Stroke] = None
+		# // 已完成笔划的合成层（透明底），渲染时整体贴图，只实时绘制当前笔划
+		self._committed = pygame.Surface((width, height), pygame.SRCALPHA)
 		# // 同步回调：将绘图事件发送给网络层（ClientGame.send_draw）
 		self._sync_cb = sync_cb
 
@@ -53,6 +92,10 @@ class Canvas:
 		if not self._current:
 			return
 		p = (int(pos[0]), int(pos[1]))
+		# // 与上一点几乎重合的采样不增加可见信息，直接丢弃（不绘制也不同步）
+		lx, ly = self._current.points[-1]
+		if abs(p[0] - lx) + abs(p[1] - ly) < MIN_POINT_DISTANCE:
+			return
 		self._current.points.append(p)
 		if self._sync_cb:
 			self._sync_cb({"kind": "point", "point": [p[0], p[1]]})
@@ -62,7 +105,10 @@ class Canvas:
 		if not self._current:
 			return
 		self._current.is_active = False
+		# // 存档前简化折线，后续每帧重绘时线段更少
+		self._current.points = _simplify_rdp(self._current.points, SIMPLIFY_EPSILON)
 		self._strokes.append(self._current)
+		self._draw_stroke(self._committed, self._current)
 		if self._sync_cb:
 			self._sync_cb({"kind": "end"})
 		self._current = None
@@ -71,12 +117,12 @@ class Canvas:
 		# // 清空本地画布（不强制同步，由上层决定是否广播）
 		self._strokes.clear()
 		self._current = None
+		self._committed.fill((0, 0, 0, 0))
 
 	# 渲染
 	def render(self, surface: pygame.Surface) -> None:
-		# // 逐笔划绘制到传入的表面上
-		for s in self._strokes:
-			self._draw_stroke(surface, s)
+		# // 已完成的笔划来自合成层，不再逐笔划重绘
+		surface.blit(self._committed, (0, 0))
 		# // 当前笔划也绘制，避免拖尾
 		if self._current:
 			self._draw_stroke(surface, self._current)
@@ -89,44 +135,41 @@ class Canvas:
 		if n == 1:
 			pygame.draw.circle(surface, stroke.color, pts[0], max(1, stroke.size // 2))
 			return
-		# // 使用相邻点连线近似笔划
-		for i in range(1, n):
-			pygame.draw.line(surface, stroke.color, pts[i - 1], pts[i], stroke.size)
+		# // 使用相邻点连线近似笔划（一次 C 调用绘制整条折线，像素与逐段 draw.line 相同）
+		pygame.draw.lines(surface, stroke.color, False, pts, stroke.size)
 
 
 class ChatBuffer:
 	"""聊天缓冲：记录消息并负责渲染"""
 
+	DEFAULT_FG = (20, 20, 20)
+
 	def __init__(self, capacity: int = 50, font: Optional[pygame.font.Font] = None):
 		self.capacity = max(10, capacity)
-		self._messages: List[Tuple[str, str, float]] = []  # (by, text, ts)
+		# (by, text, ts, 渲染好的 "by: text" 表面, 渲染所用颜色)；有界 deque 自动淘汰最旧的消息
+		self._messages: Deque[Tuple[str, str, float, pygame.Surface, Tuple[int, int, int]]] = deque(maxlen=self.capacity)
 		if font is None:
 			# Use Chinese font by default
-			try:
-				font = pygame.font.SysFont("Microsoft YaHei", 18)
-			except Exception:
-				try:
-					font = pygame.font.SysFont("SimHei", 18)
-				except Exception:
-					font = pygame.font.SysFont(None, 18)
+			font = get_font(None, 18)
 		self._font = font
 
 	def add(self, by: str, text: str) -> None:
-		# // 追加消息并按容量裁剪
-		self._messages.append((by, text, time.time()))
-		if len(self._messages) > self.capacity:
-			overflow = len(self._messages) - self.capacity
-			del self._messages[:overflow]
+		# // 追加消息（超出容量时 deque 丢弃最旧的一条）；消息内容不再变化，在此处一次性渲染
+		surf = self._font.render(f"{by}: {text}", True, self.DEFAULT_FG)
+		self._messages.append((by, text, time.time(), surf, self.DEFAULT_FG))
 
-	def render(self, surface: pygame.Surface, rect: pygame.Rect, fg=(20, 20, 20)) -> None:
+	def render(self, surface: pygame.Surface, rect: pygame.Rect, fg=DEFAULT_FG) -> None:
 		# // 将消息逐行绘制到指定矩形区域内
 		x, y = rect.left + 6, rect.top + 6
 		line_h = self._font.get_linesize() + 4
 		max_lines = max(1, rect.height // line_h)
-		# // 只渲染末尾若干行
-		for by, text, _ in self._messages[-max_lines:]:
-			msg = f"{by}: {text}"
-			surf = self._font.render(msg, True, fg)
+		messages = self._messages
+		# // 只渲染末尾若干行（按下标遍历，不复制列表）；颜色变化时才重新渲染
+		for i in range(max(0, len(messages) - max_lines), len(messages)):
+			by, text, ts, surf, surf_fg = messages[i]
+			if surf_fg != fg:
+				surf = self._font.render(f"{by}: {text}", True, fg)
+				messages[i] = (by, text, ts, surf, fg)
 			surface.blit(surf, (x, y))
 			y += line_h
 
@@ -137,24 +180,27 @@ class HudRenderer:
 	def __init__(self, title_font: Optional[pygame.font.Font] = None, item_font: Optional[pygame.font.Font] = None):
 		if title_font is None:
 			# Use Chinese font by default
-			try:
-				title_font = pygame.font.SysFont("Microsoft YaHei", 24)
-			except Exception:
-				try:
-					title_font = pygame.font.SysFont("SimHei", 24)
-				except Exception:
-					title_font = pygame.font.SysFont(None, 24)
+			title_font = get_font(None, 24)
 		if item_font is None:
 			# Use Chinese font by default
-			try:
-				item_font = pygame.font.SysFont("Microsoft YaHei", 20)
-			except Exception:
-				try:
-					item_font = pygame.font.SysFont("SimHei", 20)
-				except Exception:
-					item_font = pygame.font.SysFont(None, 20)
+			item_font = get_font(None, 20)
 		self._title_font = title_font
 		self._item_font = item_font
+		# // 行高在字体确定后不变，预先计算
+		self._title_lh = title_font.get_linesize() + 4
+		self._item_lh = item_font.get_linesize() + 3
+		self._rows_offset = self._title_lh + item_font.get_linesize() + 6
+		# // 文本未变化时复用上次渲染的表面：(文本, 表面)
+		self._title_cache: Optional[Tuple[str, pygame.Surface]] = None
+		self._meta_cache: Optional[Tuple[str, pygame.Surface]] = None
+		self._row_cache: Dict[str, Tuple[str, pygame.Surface]] = {}
+
+	@staticmethod
+	def _cached(font: pygame.font.Font, cache: Optional[Tuple[str, pygame.Surface]], text: str, color) -> Tuple[str, pygame.Surface]:
+		# // 文本与缓存一致时直接返回缓存，否则重新渲染
+		if cache is not None and cache[0] == text:
+			return cache
+		return text, font.render(text, True, color)
 
 	def render(self, surface: pygame.Surface, room_state: Dict[str, Any], rect: pygame.Rect) -> None:
 		# // 标题与基本信息
@@ -164,22 +210,31 @@ class HudRenderer:
 		time_left = int(room_state.get("time_left", 0) or 0)
 
 		# // 渲染房间标题
-		surf_title = self._title_font.render(title, True, (10, 10, 10))
-		surface.blit(surf_title, (rect.left + 6, rect.top + 6))
+		self._title_cache = self._cached(self._title_font, self._title_cache, title, (10, 10, 10))
+		surface.blit(self._title_cache[1], (rect.left + 6, rect.top + 6))
 
 		# // 渲染回合与计时
 		meta = f"Round {round_idx}  Drawer: {drawer or '-'}  Time: {time_left}s"
-		surf_meta = self._item_font.render(meta, True, (30, 30, 30))
-		surface.blit(surf_meta, (rect.left + 6, rect.top + 6 + self._title_font.get_linesize() + 4))
+		self._meta_cache = self._cached(self._item_font, self._meta_cache, meta, (30, 30, 30))
+		surface.blit(self._meta_cache[1], (rect.left + 6, rect.top + 6 + self._title_lh))
 
-		# // 记分板
-		y = rect.top + 6 + self._title_font.get_linesize() + self._item_font.get_linesize() + 10
+		# // 记分板：按玩家缓存分数行，分数或名字不变时不重新渲染
+		y = rect.top + 6 + self._rows_offset
 		players: Dict[str, Dict[str, Any]] = room_state.get("players", {}) or {}
+		row_cache = self._row_cache
+		if len(row_cache) > len(players):
+			# // 清理已离开玩家的缓存
+			for pid in [pid for pid in row_cache if pid not in players]:
+				del row_cache[pid]
+		x = rect.left + 6
+		blit_seq = []
 		for pid, p in players.items():
 			line = f"{p.get('name', pid)}: {int(p.get('score', 0))}"
-			surf_line = self._item_font.render(line, True, (40, 40, 40))
-			surface.blit(surf_line, (rect.left + 6, y))
-			y += self._item_font.get_linesize() + 3
+			entry = row_cache[pid] = self._cached(self._item_font, row_cache.get(pid), line, (40, 40, 40))
+			blit_seq.append((entry[1], (x, y)))
+			y += self._item_lh
+		# // 所有分数行一次提交
+		surface.blits(blit_seq, doreturn=False)
 
 
 __all__ = [
@@ -1,6 +1,8 @@
 import os
 import pygame
-from typing import Optional, Callable
+from typing import Callable, Dict, Optional, Tuple
+
+from src.client.ui.fonts import get_font
 
 
 class Button:
@@ -12,6 +14,10 @@ class Button:
     to a .ttf file) to improve rendering of non-ASCII characters.
     """
 
+    # 预绘制外观四周留出的像素；宽或高小于 MIN_CHROME_SIZE 的按钮不预绘制
+    CHROME_MARGIN = 10
+    MIN_CHROME_SIZE = 8
+
     def __init__(
         self,
         x,
@@ -44,6 +50,10 @@ class Button:
         # 按钮状态
         self.pressed: bool = False
         self.hovered: bool = False
+        # 各状态（常态/悬停/按下）预先绘制好的外观：(pressed, 背景色) -> (Surface, 是否含文字)
+        # 尺寸或文字变化时整体失效
+        self._state_surfs: Dict[tuple, Tuple[pygame.Surface, bool]] = {}
+        self._state_base: Optional[tuple] = None
 
         # 点击回调（可选）
         self.on_click: Optional[Callable[[], None]] = on_click
@@ -69,31 +79,10 @@ class Button:
                 # 若加载失败则静默忽略，让按钮仍然可用
                 self.click_sound = None
 
-        # Try to load the requested font. If a path is provided and exists,
-        # use pygame.font.Font. Otherwise attempt pygame.font.SysFont, and
-        # finally fall back to the default font.
-        try:
-            if font_name:
-                # If provided value looks like a path, try Font()
-                import os
-
-                if os.path.exists(font_name):
-                    self.font = pygame.font.Font(font_name, font_size)
-                else:
-                    self.font = pygame.font.SysFont(font_name, font_size)
-            else:
-                # No font specified, use Microsoft YaHei for Chinese support
-                try:
-                    self.font = pygame.font.SysFont("Microsoft YaHei", font_size)
-                except Exception:
-                    # Fallback to SimHei if Microsoft YaHei is not available
-                    try:
-                        self.font = pygame.font.SysFont("SimHei", font_size)
-                    except Exception:
-                        # Last resort: system default
-                        self.font = pygame.font.SysFont(None, font_size)
-        except Exception:
-            self.font = pygame.font.Font(None, font_size)
+        # Load the requested font (a .ttf path or a system font name; Microsoft
+        # YaHei by default) from the shared cache, so buttons with the same
+        # font spec share one Font object.
+        self.font = get_font(font_name, font_size)
 
         self.text_surface = self.font.render(text, True, self.fg_color)
         self.text_rect = self.text_surface.get_rect(center=self.rect.center)
@@ -128,42 +117,89 @@ class Button:
                         except Exception:
                             pass
 
-    def draw(self, screen):
-        """Draw the button on the given screen with shadow and rounded corners."""
-        # Determine current background color based on state
-        current_bg = self.bg_color
-        if self.hovered and self.hover_bg_color:
-            current_bg = self.hover_bg_color
+    def _text_pos(self):
+        """Top-left of the text, shifted when the button is pressed."""
+        if self.pressed:
+            # 文本下移右移一像素或两像素，营造按下效果
+            return (self.text_rect.x + 2, self.text_rect.y + 2)
+        return self.text_rect.topleft
 
-        # 根据是否按下绘制不同的视觉效果：按下时缩短阴影并将文本向右下偏移，边框更深，模拟凹陷
+    def _build_state_surface(self, current_bg) -> Tuple[pygame.Surface, bool]:
+        """Pre-draw the button for the current state into a transparent surface.
+
+        The button rect sits at (CHROME_MARGIN, CHROME_MARGIN) inside the
+        surface; the margin holds the shadow offset. The text is baked in
+        only when it stays clear of the rounded (transparent) corners, so
+        blending matches drawing it straight onto the screen; otherwise the
+        caller blits it separately. Returns (surface, text_baked).
+        """
+        w, h = self.rect.size
+        m = self.CHROME_MARGIN
+        surf = pygame.Surface((w + 2 * m, h + 2 * m), pygame.SRCALPHA)
+        self._draw_chrome(surf, pygame.Rect(m, m, w, h), current_bg)
+        tx, ty = self._text_pos()
+        text_rect = self.text_surface.get_rect(topleft=(tx, ty))
+        if self.rect.inflate(-16, 0).contains(text_rect) or self.rect.inflate(0, -16).contains(text_rect):
+            surf.blit(self.text_surface, (tx - self.rect.x + m, ty - self.rect.y + m))
+            return surf, True
+        return surf, False
+
+    def _draw_chrome(self, surface, rect, current_bg) -> None:
+        """Draw shadow, background and border for `rect` onto `surface`."""
+        # 根据是否按下绘制不同的视觉效果：按下时缩短阴影，边框更深，模拟凹陷
         if self.pressed:
             shadow_offset = 2
             # 按下时阴影靠内，背景颜色略微变暗
-            shadow_rect = pygame.Rect(self.rect.x + shadow_offset, self.rect.y + shadow_offset, self.rect.width, self.rect.height)
-            pygame.draw.rect(screen, (130, 130, 130), shadow_rect, border_radius=8)
+            shadow_rect = rect.move(shadow_offset, shadow_offset)
+            pygame.draw.rect(surface, (130, 130, 130), shadow_rect, border_radius=8)
 
             # 背景（略微加深）
-            darker = tuple(max(0, c - 20) for c in current_bg)
-            pygame.draw.rect(screen, darker, self.rect, border_radius=8)
+            r, g, b = current_bg[:3]
+            darker = (max(0, r - 20), max(0, g - 20), max(0, b - 20))
+            pygame.draw.rect(surface, darker, rect, border_radius=8)
             # 内部浅色边框模拟内凹
-            inner = self.rect.inflate(-4, -4)
-            pygame.draw.rect(screen, (90, 90, 90), self.rect, 2, border_radius=8)
-            pygame.draw.rect(screen, (200, 200, 200), inner, 2, border_radius=6)
-
-            # 文本下移右移一像素或两像素，营造按下效果
-            pressed_text_pos = (self.text_rect.x + 2, self.text_rect.y + 2)
-            screen.blit(self.text_surface, pressed_text_pos)
+            inner = rect.inflate(-4, -4)
+            pygame.draw.rect(surface, (90, 90, 90), rect, 2, border_radius=8)
+            pygame.draw.rect(surface, (200, 200, 200), inner, 2, border_radius=6)
         else:
             # 常态：明显阴影和常规边框
             shadow_offset = 4
-            shadow_rect = pygame.Rect(self.rect.x + shadow_offset, self.rect.y + shadow_offset, self.rect.width, self.rect.height)
-            pygame.draw.rect(screen, (150, 150, 150), shadow_rect, border_radius=8)
+            shadow_rect = rect.move(shadow_offset, shadow_offset)
+            pygame.draw.rect(surface, (150, 150, 150), shadow_rect, border_radius=8)
+
+            pygame.draw.rect(surface, current_bg, rect, border_radius=8)
+            pygame.draw.rect(surface, (100, 100, 100), rect, 2, border_radius=8)  # 边框
+
+    def draw(self, screen):
+        """Draw the button on the given screen with shadow and rounded corners.
 
-            pygame.draw.rect(screen, current_bg, self.rect, border_radius=8)
-            pygame.draw.rect(screen, (100, 100, 100), self.rect, 2, border_radius=8)  # 边框
+        Each visual state (normal/hover/pressed) is rendered once and reused
+        until the size or text changes.
+        """
+        # Determine current background color based on state
+        current_bg = self.bg_color
+        if self.hovered and self.hover_bg_color:
+            current_bg = self.hover_bg_color
 
-            # 文本居中
-            screen.blit(self.text_surface, self.text_rect)
+        if min(self.rect.size) < self.MIN_CHROME_SIZE:
+            # 极小的按钮上圆角边框会画到 rect 之外很远，直接绘制
+            self._draw_chrome(screen, self.rect, current_bg)
+            screen.blit(self.text_surface, self._text_pos())
+            return
+
+        base = (self.rect.size, self.text_surface, self.text_rect.x - self.rect.x, self.text_rect.y - self.rect.y)
+        if base != self._state_base:
+            self._state_surfs.clear()
+            self._state_base = base
+        state = (self.pressed, tuple(current_bg))
+        entry = self._state_surfs.get(state)
+        if entry is None:
+            entry = self._state_surfs[state] = self._build_state_surface(current_bg)
+        surf, text_baked = entry
+        m = self.CHROME_MARGIN
+        screen.blit(surf, (self.rect.x - m, self.rect.y - m))
+        if not text_baked:
+            screen.blit(self.text_surface, self._text_pos())
 
     def is_hovered(self, mouse_pos):
         """Check if the button is hovered by the mouse."""
@@ -196,9 +196,10 @@ class Canvas:
         
         Args:
             action: 绘画动作字典，可包含:
-                - kind: "paint", "line", "clear"
+                - kind: "paint", "line", "points", "clear"
                 - pos: 点的坐标 (仅paint)
                 - from, to: 线的起终点 (仅line)
+                - points: 折线的顶点列表 (仅points，由多段连续的 line 合并而来)
                 - color: RGB颜色值
                 - size: 笔的大小
                 - mode: "draw" 或 "erase"
@@ -219,6 +220,13 @@ class Canvas:
             size = action.get("size", self.brush_size)
             if pos_from and pos_to:
                 pygame.draw.line(self.surface, color, pos_from, pos_to, size * 2)
+        elif kind == "points":
+            points = action.get("points") or []
+            color = action.get("color", self.brush_color)
+            size = action.get("size", self.brush_size)
+            # 一次绘制整条折线，像素与本地逐段 _line_to 的效果一致
+            if len(points) >= 2:
+                pygame.draw.lines(self.surface, color, False, points, size * 2)
         elif kind == "clear":
             bg_color = action.get("bg_color", self.bg_color)
             self.surface.fill(bg_color)
\ No newline at end of file
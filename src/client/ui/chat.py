@@ -1,5 +1,26 @@
+import bisect
+import functools
+import itertools
 import pygame
-from typing import List, Tuple, Optional
+from collections import deque
+from typing import Deque, Dict, List, Tuple, Optional
+
+from src.client.ui.fonts import get_font
+
+# (字体名, 字号) -> {字符: 步进宽度}，换行时按字符累加估算行宽
+_ADVANCES: Dict[Tuple[Optional[str], int], Dict[str, int]] = {}
+
+
+@functools.lru_cache(maxsize=2048)
+def _render_line(font_key: Tuple[Optional[str], int], text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+    """渲染一行文本并缓存结果：内容 Surface 重建时，未变化的行直接复用"""
+    return get_font(*font_key).render(text, True, color)
+
+
+def clear_font_cache() -> None:
+    """释放缓存的文本 Surface 与字符宽度（pygame.quit() 前调用）"""
+    _render_line.cache_clear()
+    _ADVANCES.clear()
 
 
 class ChatPanel:
@@ -14,6 +35,9 @@ class ChatPanel:
     - 新消息自动滚动到底部
     """
 
+    # 历史消息上限（deque 的 maxlen，超出时自动丢弃最旧的消息）
+    MAX_MESSAGES = 200
+
     def __init__(self, rect: pygame.Rect, font_size: int = 18, font_name: Optional[str] = None) -> None:
         """初始化聊天面板
 
@@ -24,22 +48,15 @@ class ChatPanel:
         """
         self.rect = rect
 
-        # 尝试加载指定字体，失败则使用默认的中文字体
-        try:
-            # 如果没有指定字体，默认使用 Microsoft YaHei（Windows 中文字体）
-            if font_name is None:
-                font_name = "Microsoft YaHei"
-            self.font = pygame.font.SysFont(font_name, font_size)
-        except Exception:
-            # 如果 Microsoft YaHei 失败，尝试其他中文字体
-            try:
-                self.font = pygame.font.SysFont("SimHei", font_size)
-            except Exception:
-                # 最后的备选方案
-                self.font = pygame.font.SysFont(None, font_size)
-
-        # 消息列表：每个消息是 (用户名, 文本) 元组
-        self.messages: List[Tuple[str, str]] = []  # (user, text)
+        # 字体按 (名称, 字号) 共享，渲染结果由 _render_line 缓存
+        self._font_key = (font_name or "Microsoft YaHei", font_size)
+        self.font = get_font(*self._font_key)
+
+        # 消息队列：每个消息是 (用户名, 文本) 元组，有界 deque 自动淘汰旧消息
+        self.messages: Deque[Tuple[str, str]] = deque(maxlen=self.MAX_MESSAGES)  # (user, text)
+        # add_message 挤出的旧消息条数：messages[i] 的固定序号为 _dropped + i，
+        # 淘汰旧消息时其余消息的序号（及气泡底色、渲染缓存键）保持不变
+        self._dropped = 0
         
         # 滚动参数
         self.scroll_offset = 0  # 滚动偏移量（像素）
@@ -54,6 +71,33 @@ class ChatPanel:
         self.border_color = (200, 200, 200)  # 灰色边框
         self.scrollbar_color = (180, 180, 180)  # 滚动条颜色
 
+        # 气泡内边距
+        self.bubble_pad_x = 10
+        self.bubble_pad_y = 4
+
+        # 消息内容缓存：全部消息预先合成到一张 Surface，滚动时只改变 blit 的源区域
+        self._version = 0  # 消息或布局变化时递增
+        self._content_surface: Optional[pygame.Surface] = None
+        self._content_key: Optional[tuple] = None
+        self._content_height = 0
+        # 单条消息预先绘制的气泡与文字：(固定序号, (user, text)) -> Surface，宽度变化时清空
+        self._message_surfs: Dict[Tuple[int, Tuple[str, str]], pygame.Surface] = {}
+
+        # 整个面板（阴影、背景、边框、可见消息、滚动条）的缓存：
+        # 消息、滚动位置、尺寸与颜色都未变化时，draw() 只需一次 blit
+        self._panel_surface: Optional[pygame.Surface] = None
+        self._panel_key: Optional[tuple] = None
+
+        # 每条消息按当前宽度换行后的行列表，以消息元组 (user, text) 为键，宽度变化时清空；
+        # 总高度按布局键缓存，新增消息时增量更新
+        self._lines_cache: Dict[Tuple[str, str], List[str]] = {}
+        self._total_height = 0
+        self._height_key: Optional[tuple] = None
+
+    def _layout_key(self) -> tuple:
+        """消息与布局的签名（messages 可能被外部直接 extend，因此包含长度）"""
+        return (self._version, len(self.messages), self.content_width)
+
     def resize(self, rect: pygame.Rect) -> None:
         """调整聊天框大小（窗口改变时调用）
         
@@ -61,8 +105,15 @@ class ChatPanel:
             rect: 新的矩形区域
         """
         self.rect = rect
-        # 重新计算内容宽度
-        self.content_width = rect.width - 2 * self.content_margin - 20
+        # 重新计算内容宽度；宽度不变时换行结果、总高度与内容 Surface 都仍然有效
+        content_width = rect.width - 2 * self.content_margin - 20
+        if content_width != self.content_width:
+            self.content_width = content_width
+            self._version += 1
+            self._lines_cache.clear()
+            self._message_surfs.clear()
+            # 唯一需要整体重新换行的情况：在此一次性重算总高度
+            self._get_total_height()
         # 重新计算滚动位置（确保不会超出范围）
         self._scroll_to_bottom()
 
@@ -73,10 +124,21 @@ class ChatPanel:
             user: 发送者名字（如 "你", "对方", "系统"）
             text: 消息内容
         """
-        self.messages.append((user, text))  # 添加消息到列表末尾
-        # 限制历史消息数量不超过 200 条（防止内存溢出）
-        if len(self.messages) > 200:
-            self.messages = self.messages[-200:]
+        # 总高度缓存有效时增量更新：减去将被挤出的最旧消息，加上新消息
+        total = self._total_height if self._height_key == self._layout_key() else None
+        if len(self.messages) == self.messages.maxlen:
+            self._dropped += 1
+            if total is not None:
+                total -= self._message_height(*self.messages[0])
+        # 添加消息到队列末尾（超过 MAX_MESSAGES 时 deque 自动丢弃最旧的一条）
+        message = (user, text)
+        self.messages.append(message)
+        self._version += 1
+        # 在此一次性拼接并换行，之后的高度计算与内容重建都直接复用
+        lines = self._message_lines(message)
+        if total is not None:
+            self._total_height = total + len(lines) * self.line_height
+            self._height_key = self._layout_key()
         # 新消息到达时，自动滚动到底部
         self._scroll_to_bottom()
 
@@ -85,6 +147,10 @@ class ChatPanel:
         
         算法：贪心算法，每行尽可能多地放入字符，直到超过最大宽度
         优点：不丢失字符，完全保留原始文本
+
+        先由字符步进宽度的前缀和二分查找估算断点（累加与查找都在 C 层完成），
+        再用 font.size 校正（字距调整可能使实际宽度与累加值略有不同），
+        通常每行只需一两次 font.size 调用。
         
         Args:
             text: 要换行的文本
@@ -95,45 +161,66 @@ class ChatPanel:
         """
         if not text or max_width <= 0:
             return [""]
-        
+
         lines = []
-        remaining_text = text
-        
-        while remaining_text:
-            # 二分查找最多能放入多少个字符
-            left, right = 1, len(remaining_text)
-            best_length = 1
-            
-            while left <= right:
-                mid = (left + right) // 2
-                line_part = remaining_text[:mid]
-                width = self.font.size(line_part)[0]
-                
-                if width <= max_width:
-                    # 这个长度可以放入
-                    best_length = mid
-                    left = mid + 1
-                else:
-                    # 这个长度超出，需要减少
-                    right = mid - 1
-            
+        font_size = self.font.size
+        # offsets[i] 为前 i 个字符的步进宽度之和（步进非负，序列单调不减）
+        offsets = list(itertools.accumulate(self._char_advances(text), initial=0))
+        start, n = 0, len(text)
+
+        while start < n:
+            # 估算这一行最多能放入的字符数：累计宽度不超过 max_width 的最远位置
+            end = bisect.bisect_right(offsets, offsets[start] + max_width, start) - 1
+            end = max(end, start + 1)
+            # 以实际排版宽度校正估算值
+            while end < n and font_size(text[start:end + 1])[0] <= max_width:
+                end += 1
+            while end > start + 1 and font_size(text[start:end])[0] > max_width:
+                end -= 1
+
             # 获取这一行的文本
-            line = remaining_text[:best_length]
-            lines.append(line)
-            
-            # 剩余文本
-            remaining_text = remaining_text[best_length:]
-        
+            lines.append(text[start:end])
+            start = end
+
         return lines if lines else [""]
 
+    def _char_advances(self, text: str) -> List[int]:
+        """返回 text 中每个字符的步进宽度（按字符缓存，字体缺字时退回 font.size）"""
+        table = _ADVANCES.setdefault(self._font_key, {})
+        missing = {ch for ch in text if ch not in table}
+        if missing:
+            chars = "".join(missing)
+            for ch, metric in zip(chars, self.font.metrics(chars)):
+                table[ch] = metric[4] if metric else self.font.size(ch)[0]
+        return [table[ch] for ch in text]
+
+    def _message_lines(self, message: Tuple[str, str]) -> List[str]:
+        """单条消息 "user: text" 按当前宽度换行后的行列表（缓存）"""
+        lines = self._lines_cache.get(message)
+        if lines is None:
+            if len(self._lines_cache) > 2 * self.MAX_MESSAGES:
+                # 已淘汰的消息不再需要，超出一定数量后整体重建
+                self._lines_cache.clear()
+            user, text = message
+            lines = self._lines_cache[message] = self._wrap_text(f"{user}: {text}", self.content_width)
+        return lines
+
+    def _message_height(self, user: str, text: str) -> int:
+        """单条消息换行后的高度"""
+        return len(self._message_lines((user, text))) * self.line_height
+
     def _get_total_height(self) -> int:
-        """计算所有消息的总高度"""
-        total_height = 0
-        for user, text in self.messages:
-            line = f"{user}: {text}"
-            wrapped_lines = self._wrap_text(line, self.content_width)
-            total_height += len(wrapped_lines) * self.line_height
-        return total_height
+        """返回所有消息的总高度
+
+        总高度由 add_message 增量维护、resize 在宽度变化时重算，这里通常直接返回；
+        只有 messages 被外部直接修改（如窗口重建后 extend 恢复）时才整体重算。
+        """
+        key = self._layout_key()
+        if self._height_key != key:
+            line_count = sum(len(self._message_lines(message)) for message in self.messages)
+            self._total_height = line_count * self.line_height
+            self._height_key = key
+        return self._total_height
 
     def _scroll_to_bottom(self) -> None:
         """自动滚动到底部，显示最新消息"""
@@ -153,100 +240,157 @@ class ChatPanel:
         # 增加或减少滚动偏移
         self.scroll_offset = max(0, min(max_scroll, self.scroll_offset - delta * 20))
 
+    def _get_content_surface(self) -> pygame.Surface:
+        """返回合成了全部消息的内容 Surface，仅在消息或宽度变化后重建
+
+        内容 Surface 顶部与底部各多留 bubble_pad_y 像素，容纳首行/末行气泡超出文字的部分。
+        """
+        # messages 也可能被外部直接 extend（如窗口重建后恢复），因此同时以长度作为键
+        key = (self._version, len(self.messages), self.content_width)
+        if self._content_surface is not None and self._content_key == key:
+            return self._content_surface
+
+        # 逐条消息复用预先绘制好的 Surface，按顺序一次 blits 合成
+        # （相邻消息的气泡只在对方文字之外的边缘重叠，与逐行绘制结果相同）
+        message_surfs: Dict[Tuple[int, Tuple[str, str]], pygame.Surface] = {}
+        blits = []
+        line_count = 0
+        for seq, message in enumerate(self.messages, self._dropped):
+            surf_key = (seq, message)
+            surf = self._message_surfs.get(surf_key)
+            if surf is None:
+                surf = self._render_message(message, seq % 2 == 0)
+            message_surfs[surf_key] = surf
+            blits.append((surf, (0, line_count * self.line_height)))
+            line_count += len(self._message_lines(message))
+        # 只保留当前仍在队列中的消息
+        self._message_surfs = message_surfs
+
+        self._content_height = line_count * self.line_height
+        surface = pygame.Surface((max(1, self.content_width), self._content_height + 2 * self.bubble_pad_y))
+        surface.fill(self.bg_color)
+        surface.blits(blits, doreturn=False)
+
+        self._content_surface = surface
+        self._content_key = key
+        return surface
+
+    def _render_message(self, message: Tuple[str, str], even: bool) -> pygame.Surface:
+        """绘制单条消息的气泡与文字（顶部与底部各多留 bubble_pad_y 像素给气泡）
+
+        Args:
+            message: (用户名, 文本)
+            even: 固定序号是否为偶数（决定气泡底色）
+        """
+        pad_y = self.bubble_pad_y
+        lines = self._message_lines(message)
+        surface = pygame.Surface(
+            (max(1, self.content_width), len(lines) * self.line_height + 2 * pad_y), pygame.SRCALPHA
+        )
+        bubble_color = (245, 248, 255) if even else (252, 252, 252)
+
+        # 先绘制全部气泡背景，文本收集后一次 blits 提交；空行不绘制气泡，只占一个行高
+        text_blits = []
+        y = pad_y
+        for wrapped_line in lines:
+            if wrapped_line:
+                surf = _render_line(self._font_key, wrapped_line, (40, 40, 40))
+                bubble_rect = pygame.Rect(0, y - pad_y, self.content_width, surf.get_height() + pad_y * 2)
+                pygame.draw.rect(surface, bubble_color, bubble_rect, border_radius=6)
+                pygame.draw.rect(surface, (230, 230, 230), bubble_rect, 1, border_radius=6)
+                text_blits.append((surf, (self.bubble_pad_x, y)))
+            y += self.line_height
+        surface.blits(text_blits, doreturn=False)
+        return surface
+
+    def _panel_state_key(self) -> tuple:
+        """面板外观的签名：scroll_offset 与 messages 可能被外部直接修改，因此都纳入键中"""
+        return (
+            self._layout_key(), self.scroll_offset, self.rect.size,
+            self.bg_color, self.border_color, self.scrollbar_color,
+        )
+
     def draw(self, screen: pygame.Surface) -> None:
         """每帧渲染聊天面板到屏幕
 
-        - 绘制圆角背景与阴影
-        - 绘制边框
-        - 显示所有消息（自动换行、支持滚动）
-        - 绘制滚动条
+        面板内容未变化时直接 blit 缓存的面板 Surface，否则先重新合成。
 
         Args:
             screen: pygame 屏幕 Surface 对象
         """
+        key = self._panel_state_key()
+        if self._panel_surface is None or self._panel_key != key:
+            self._panel_surface = self._render_panel()
+            self._panel_key = key
+        screen.blit(self._panel_surface, self.rect.topleft)
+
+    def _render_panel(self) -> pygame.Surface:
+        """合成整个面板（坐标相对于面板左上角，右下多留 3 像素给阴影）
+
+        - 绘制圆角背景与阴影
+        - 绘制边框
+        - 显示所有消息（自动换行、支持滚动）：blit 缓存的内容 Surface 的可见区域
+        - 绘制滚动条
+        """
+        rect = pygame.Rect(0, 0, self.rect.width, self.rect.height)
+        panel = pygame.Surface((rect.width + 3, rect.height + 3), pygame.SRCALPHA)
         # 阴影
-        shadow = pygame.Rect(self.rect.x + 3, self.rect.y + 3, self.rect.width, self.rect.height)
-        pygame.draw.rect(screen, (210, 210, 210), shadow, border_radius=8)
+        shadow = pygame.Rect(rect.x + 3, rect.y + 3, rect.width, rect.height)
+        pygame.draw.rect(panel, (210, 210, 210), shadow, border_radius=8)
         # 背景圆角
-        pygame.draw.rect(screen, self.bg_color, self.rect, border_radius=8)
+        pygame.draw.rect(panel, self.bg_color, rect, border_radius=8)
         # 边框
-        pygame.draw.rect(screen, self.border_color, self.rect, 2, border_radius=8)
+        pygame.draw.rect(panel, self.border_color, rect, 2, border_radius=8)
 
-        # 创建裁剪区域，确保内容不超出面板
+        # 内容可见区域（留20像素给滚动条）
         clip_rect = pygame.Rect(
-            self.rect.x + self.content_margin,
-            self.rect.y + self.content_margin,
-            self.rect.width - 2 * self.content_margin - 20,  # 留20像素给滚动条
-            self.rect.height - 2 * self.content_margin
+            rect.x + self.content_margin,
+            rect.y + self.content_margin,
+            rect.width - 2 * self.content_margin - 20,
+            rect.height - 2 * self.content_margin
         )
-        screen.set_clip(clip_rect)
-
-        # 绘制消息
-        y = self.rect.y + self.content_margin - self.scroll_offset
-        bubble_pad_x = 10
-        bubble_pad_y = 4
-
-        for msg_idx, (user, text) in enumerate(self.messages):
-            line = f"{user}: {text}"
-            wrapped_lines = self._wrap_text(line, self.content_width)
-
-            for line_idx, wrapped_line in enumerate(wrapped_lines):
-                surf = self.font.render(wrapped_line, True, (40, 40, 40))
-                
-                # 只绘制在可见区域内的行
-                if y + surf.get_height() >= self.rect.y and y <= self.rect.y + self.rect.height:
-                    # 气泡背景
-                    bubble_rect = pygame.Rect(
-                        self.rect.x + self.content_margin,
-                        y - bubble_pad_y,
-                        self.content_width,
-                        surf.get_height() + bubble_pad_y * 2
-                    )
-                    bubble_color = (245, 248, 255) if msg_idx % 2 == 0 else (252, 252, 252)
-                    pygame.draw.rect(screen, bubble_color, bubble_rect, border_radius=6)
-                    pygame.draw.rect(screen, (230, 230, 230), bubble_rect, 1, border_radius=6)
-                    
-                    # 绘制文本
-                    screen.blit(surf, (self.rect.x + self.content_margin + bubble_pad_x, y))
-                
-                y += self.line_height
-
-        # 取消裁剪
-        screen.set_clip(None)
+
+        # 消息：滚动偏移只影响源区域，不需要重新渲染
+        content = self._get_content_surface()
+        area = pygame.Rect(0, self.scroll_offset + self.bubble_pad_y, clip_rect.width, clip_rect.height)
+        panel.blit(content, clip_rect.topleft, area)
 
         # 绘制滚动条
-        self._draw_scrollbar(screen)
+        self._draw_scrollbar(panel, rect)
+        return panel
 
-    def _draw_scrollbar(self, screen: pygame.Surface) -> None:
+    def _draw_scrollbar(self, surface: pygame.Surface, rect: pygame.Rect) -> None:
         """绘制滚动条
         
         Args:
-            screen: pygame 屏幕 Surface 对象
+            surface: 目标 Surface
+            rect: 面板在 surface 上的矩形区域
         """
-        total_height = self._get_total_height()
-        visible_height = self.rect.height - 2 * self.content_margin
+        # 内容缓存刚刚刷新过，直接复用其总高度
+        total_height = self._content_height
+        visible_height = rect.height - 2 * self.content_margin
         
         # 如果内容高度 <= 可见高度，不需要滚动条
         if total_height <= visible_height:
             return
         
         # 滚动条轨道
-        scrollbar_x = self.rect.right - 12
+        scrollbar_x = rect.right - 12
         scrollbar_track = pygame.Rect(
             scrollbar_x,
-            self.rect.y + self.content_margin,
+            rect.y + self.content_margin,
             10,
             visible_height
         )
-        pygame.draw.rect(screen, (235, 235, 235), scrollbar_track)
+        pygame.draw.rect(surface, (235, 235, 235), scrollbar_track)
         
         # 滚动条拇指（滑块）
         thumb_height = max(20, visible_height * visible_height // total_height)
         thumb_y = (self.scroll_offset * visible_height // total_height)
         thumb = pygame.Rect(
             scrollbar_x,
-            self.rect.y + self.content_margin + thumb_y,
+            rect.y + self.content_margin + thumb_y,
             10,
             thumb_height
         )
-        pygame.draw.rect(screen, self.scrollbar_color, thumb, border_radius=5)
+        pygame.draw.rect(surface, self.scrollbar_color, thumb, border_radius=5)
@@ -0,0 +1,48 @@
+"""
+共享字体缓存
+
+同一 (字体名, 字号, 粗体) 只通过 SDL_ttf 加载一次，所有控件共用同一个字体对象
+（及其字形缓存），避免每个控件重复打开并解析字体文件。
+"""
+
+import functools
+import os
+from typing import Optional
+
+import pygame
+
+
+@functools.lru_cache(maxsize=64)
+def get_font(name: Optional[str], size: int, bold: bool = False) -> pygame.font.Font:
+    """按 (名称, 字号, 粗体) 获取字体
+
+    - name 为已存在的 .ttf 路径时使用 pygame.font.Font 加载
+    - 否则按系统字体加载；未指定时默认 Microsoft YaHei（中文支持），
+      失败则依次回退到 SimHei 与系统默认字体
+    """
+    try:
+        if name and os.path.exists(name):
+            font = pygame.font.Font(name, size)
+            font.set_bold(bold)
+            return font
+        try:
+            return pygame.font.SysFont(name or "Microsoft YaHei", size, bold=bold)
+        except Exception:
+            # 如果 Microsoft YaHei 失败，尝试其他中文字体
+            try:
+                return pygame.font.SysFont("SimHei", size, bold=bold)
+            except Exception:
+                # 最后的备选方案
+                return pygame.font.SysFont(None, size, bold=bold)
+    except Exception:
+        font = pygame.font.Font(None, size)
+        font.set_bold(bold)
+        return font
+
+
+def clear_font_cache() -> None:
+    """释放缓存的字体对象（pygame.quit() 前调用）"""
+    get_font.cache_clear()
+
+
+__all__ = ["get_font", "clear_font_cache"]
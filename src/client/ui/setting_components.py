@@ -1,4 +1,7 @@
 from typing import Tuple
+
+import pygame
+
 from src.client.ui.button import Button
 
 
@@ -9,8 +12,4 @@ def make_button(x: int, y: int, width: int, height: int, text: str, bg_color: Tu
 
 def make_slider_rect(x: int, y: int, width: int, height: int):
     """Create a pygame.Rect to represent a slider area used in settings."""
-    try:
-        import pygame
-    except Exception:
-        raise
     return pygame.Rect(x, y, width, height)
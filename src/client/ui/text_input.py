@@ -1,5 +1,35 @@
+import functools
 import pygame
-from typing import Callable, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.client.ui.fonts import get_font
+
+
+@functools.lru_cache(maxsize=32)
+def _chrome_surface(
+    size: Tuple[int, int],
+    bg_color: Tuple[int, ...],
+    border_color: Tuple[int, int, int],
+    shadow_color: Tuple[int, int, int] = (200, 200, 200),
+) -> pygame.Surface:
+    """阴影、圆角背景与边框（右下多留 3 像素给阴影），同尺寸同配色的输入框/组字面板共用一张"""
+    width, height = size
+    surf = pygame.Surface((width + 3, height + 3), pygame.SRCALPHA)
+    rect = pygame.Rect(0, 0, width, height)
+    pygame.draw.rect(surf, shadow_color, rect.move(3, 3), border_radius=6)
+    pygame.draw.rect(surf, bg_color, rect, border_radius=6)
+    pygame.draw.rect(surf, border_color, rect, 2, border_radius=6)
+    return surf
+
+
+# 占位符文字颜色
+PLACEHOLDER_COLOR = (130, 130, 130)
+
+# 输入框最多容纳的字符数
+MAX_TEXT_LENGTH = 64
+
+# 每个输入框缓存的文本 Surface 数量上限（超出时按插入顺序淘汰最早的一项）
+TEXT_CACHE_SIZE = 64
 
 
 class TextInput:
@@ -34,8 +64,9 @@ class TextInput:
             placeholder: 占位符文本（输入框为空时显示）
         """
         self.rect = rect
-        self.text = ""  # 当前输入的文本
-        self.placeholder = placeholder  # 占位符
+        # 当前输入的文本：按字符存放在列表中，读取 text 时才拼接（结果缓存到下次修改）
+        self._chars: List[str] = []
+        self._text_str: Optional[str] = ""
         self.text_color = text_color
         self.bg_color = bg_color
         self.active = False  # 是否激活（获得焦点）
@@ -45,24 +76,52 @@ class TextInput:
         self.comp_start: int = 0
         self.comp_length: int = 0
         
-        # 尝试加载指定字体，失败则使用中文字体
-        try:
-            # 如果没有指定字体，默认使用 Microsoft YaHei（Windows 中文字体）
-            if font_name is None:
-                font_name = "Microsoft YaHei"
-            self.font = pygame.font.SysFont(font_name, font_size)
-        except Exception:
-            # 如果 Microsoft YaHei 失败，尝试其他中文字体
-            try:
-                self.font = pygame.font.SysFont("SimHei", font_size)
-            except Exception:
-                # 最后的备选方案
-                self.font = pygame.font.SysFont(None, font_size)
+        # 从共享缓存加载字体（默认 Microsoft YaHei，失败时回退到其他中文字体）
+        self.font = get_font(font_name, font_size)
+
+        # 占位符（输入框为空时显示）：内容固定，设置时一次性渲染
+        self.placeholder = placeholder
+
+        # 文本渲染缓存：(文本, 颜色) -> Surface，内容不变时复用之前渲染的结果
+        self._text_cache: Dict[Tuple[str, Tuple[int, int, int]], pygame.Surface] = {}
+        # 文本宽度缓存：组字选区的前缀/选中部分只需测量，不必渲染
+        self._width_cache: Dict[str, int] = {}
+
+        # 外观与文字合成后的整体 Surface 及其相对 rect 左上角的偏移，状态不变时每帧只需一次 blit
+        self._composite: Optional[pygame.Surface] = None
+        self._composite_offset: Tuple[int, int] = (0, 0)
+        self._composite_key: Optional[tuple] = None
+        # 组字预览面板的合成结果，按 (组字串, 选区, 输入框宽度) 缓存
+        self._comp_panel_surf: Optional[pygame.Surface] = None
+        self._comp_panel_offset: Tuple[int, int] = (0, 0)
+        self._comp_panel_key: Optional[tuple] = None
         
         # 提交回调函数：在用户按 Enter 提交时触发
         # 回调参数为提交的文本内容
         self.on_submit: Optional[Callable[[str], None]] = None
 
+    @property
+    def placeholder(self) -> str:
+        """占位符文本"""
+        return self._placeholder
+
+    @placeholder.setter
+    def placeholder(self, value: str) -> None:
+        self._placeholder = value
+        self._placeholder_surf = self.font.render(value, True, PLACEHOLDER_COLOR)
+
+    @property
+    def text(self) -> str:
+        """当前输入的文本"""
+        if self._text_str is None:
+            self._text_str = "".join(self._chars)
+        return self._text_str
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self._chars = list(value)
+        self._text_str = value
+
     def handle_event(self, event: pygame.event.Event) -> None:
         """处理键盘和鼠标事件
         
@@ -97,14 +156,11 @@ class TextInput:
             # 只在输入框激活状态下处理键盘输入
             if event.key == pygame.K_RETURN:
                 # Shift+Enter 换行；Enter 发送
-                try:
-                    mods = event.mod if hasattr(event, "mod") else pygame.key.get_mods()
-                except Exception:
-                    mods = 0
-                if mods & pygame.KMOD_SHIFT:
+                if event.mod & pygame.KMOD_SHIFT:
                     # 换行（限制总长度）
-                    if len(self.text) < 64:
-                        self.text += "\n"
+                    if len(self._chars) < MAX_TEXT_LENGTH:
+                        self._chars.append("\n")
+                        self._text_str = None
                 else:
                     # Enter 键：提交输入
                     if self.on_submit and self.text.strip():
@@ -129,16 +185,18 @@ class TextInput:
                 self.comp_length = 0
             elif event.key == pygame.K_BACKSPACE:
                 # Backspace 键：删除最后一个字符
-                if self.text:
-                    self.text = self.text[:-1]
+                if self._chars:
+                    self._chars.pop()
+                    self._text_str = None
             # 注意：不再在KEYDOWN中处理字符输入，避免双击问题
             # 字符输入通过TEXTINPUT事件处理，支持输入法
         elif event.type == pygame.TEXTINPUT and self.active:
             # 处理中文等输入法提交事件（已选定候选）
-            if event.text:
-                remaining = 64 - len(self.text)
-                if remaining > 0:
-                    self.text += event.text[:remaining]
+            # 已满时直接忽略，不再切片；未满时只追加剩余容量内的字符
+            remaining = MAX_TEXT_LENGTH - len(self._chars)
+            if event.text and remaining > 0:
+                self._chars.extend(event.text[:remaining])
+                self._text_str = None
             # 提交后清除组合态预览
             self.composition_text = ""
             self.comp_start = 0
@@ -154,64 +212,125 @@ class TextInput:
                 self.comp_start = 0
                 self.comp_length = 0
 
+    def _text_width(self, text: str) -> int:
+        """文本排版宽度（缓存）：只做 font.size 测量，不渲染"""
+        width = self._width_cache.get(text)
+        if width is None:
+            if len(self._width_cache) >= TEXT_CACHE_SIZE:
+                self._width_cache.pop(next(iter(self._width_cache)))
+            width = self._width_cache[text] = self.font.size(text)[0]
+        return width
+
+    def _render_cached(self, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """渲染文本并缓存"""
+        key = (text, color)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) >= TEXT_CACHE_SIZE:
+                self._text_cache.pop(next(iter(self._text_cache)))
+            surf = self._text_cache[key] = self.font.render(text, True, color)
+        return surf
+
+    def _render_composite(self) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        """合成阴影、背景、边框与文本，返回 (Surface, 相对 rect 左上角的偏移)
+
+        文本过长时会超出输入框，合成范围取外观与文本区域的并集。
+        """
+        # 阴影、圆角背景与边框（激活时蓝色高亮）：复用预先绘制的外观
+        border_color = (80, 120, 200) if self.active else (180, 180, 180)
+        chrome = _chrome_surface(self.rect.size, tuple(self.bg_color), border_color)
+
+        # 决定显示的文本：若有输入或激活则显示输入内容（渲染结果缓存），否则显示预先渲染的占位符
+        if self.text or self.active:
+            surf = self._render_cached(self.text, self.text_color)
+        else:
+            surf = self._placeholder_surf
+        # 绘制在输入框内（左边距 8 像素，垂直居中）
+        text_rect = surf.get_rect(topleft=(8, (self.rect.height - surf.get_height()) // 2))
+
+        bounds = chrome.get_rect().union(text_rect)
+        composite = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        composite.blit(chrome, (-bounds.x, -bounds.y))
+        composite.blit(surf, (text_rect.x - bounds.x, text_rect.y - bounds.y))
+        return composite, bounds.topleft
+
+    def _render_comp_panel(self) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        """合成组字预览面板，返回 (Surface, 相对面板左上角的偏移)
+
+        面板位于输入框下方 4 像素处；组字串或选区超出面板时，合成范围取它们的并集。
+        """
+        # 面板尺寸根据文本宽度自适应
+        comp_surf = self._render_cached(self.composition_text, (20, 20, 20))
+        pad_x, pad_y = 8, 6
+        panel_w = min(max(120, comp_surf.get_width() + pad_x * 2), int(self.rect.width))
+        panel_h = comp_surf.get_height() + pad_y * 2
+        # 阴影、背景与边框：按面板尺寸缓存
+        chrome = _chrome_surface((panel_w, panel_h), (245, 248, 255), (140, 170, 220), (190, 200, 220))
+        text_rect = comp_surf.get_rect(topleft=(pad_x, pad_y))
+        bounds = chrome.get_rect().union(text_rect)
+
+        # 选区高亮（若有）
+        sel_rect = None
+        if self.comp_length > 0:
+            prefix = self.composition_text[:self.comp_start]
+            sel = self.composition_text[self.comp_start:self.comp_start + self.comp_length]
+            pre_w = self._text_width(prefix)
+            sel_w = self._text_width(sel)
+            sel_rect = pygame.Rect(pad_x + pre_w, pad_y, sel_w, comp_surf.get_height())
+            bounds.union_ip(sel_rect)
+
+        surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        ox, oy = -bounds.x, -bounds.y
+        surface.blits([(chrome, (ox, oy)), (comp_surf, text_rect.move(ox, oy))], doreturn=False)
+        if sel_rect is not None:
+            sel_rect.move_ip(ox, oy)
+            pygame.draw.rect(surface, (220, 235, 255), sel_rect)
+            pygame.draw.rect(surface, (120, 160, 220), sel_rect, 1)
+        return surface, bounds.topleft
+
     def draw(self, screen: pygame.Surface) -> None:
         """每帧渲染输入框到屏幕
-        
-        - 绘制背景矩形
-        - 绘制边框（激活时高亮）
-        - 显示输入文本或占位符
+
+        - 背景、边框与文本合成为一张 Surface，仅在状态变化时重建
         - 若处于组合态，显示输入法预览面板
         
         Args:
             screen: pygame 屏幕 Surface 对象
         """
-        # 阴影
-        shadow = pygame.Rect(self.rect.x + 3, self.rect.y + 3, self.rect.width, self.rect.height)
-        pygame.draw.rect(screen, (200, 200, 200), shadow, border_radius=6)
-        # 绘制背景矩形（圆角）
-        pygame.draw.rect(screen, self.bg_color, self.rect, border_radius=6)
-        # 绘制边框（激活时蓝色高亮）
-        border_color = (80, 120, 200) if self.active else (180, 180, 180)
-        pygame.draw.rect(screen, border_color, self.rect, 2, border_radius=6)
-        
-        # 决定显示的文本：若有输入或激活则显示输入内容，否则显示占位符
-        txt = self.text if (self.text or self.active) else self.placeholder
-        # 决定文字颜色：有输入或激活时黑色，占位符时浅灰色
-        color = self.text_color if self.text or self.active else (130, 130, 130)
-        # 渲染文本
-        surf = self.font.render(txt, True, color)
-        # 绘制在输入框内（左边距 8 像素，垂直居中）
-        screen.blit(surf, (self.rect.x + 8, self.rect.y + (self.rect.height - surf.get_height()) // 2))
-
+        # 每帧都会读取的属性先绑定到局部变量
+        rect = self.rect
+        active = self.active
+        x, y = rect.x, rect.y
         # 更新输入法候选框位置（若可用）
-        if self.active:
+        if active:
             try:
-                pygame.key.set_text_input_rect(self.rect)
+                pygame.key.set_text_input_rect(rect)
             except Exception:
                 pass
 
-        # 绘制组合态预览面板（类似输入法候选框的组字串）
-        if self.active and self.composition_text:
-            # 面板尺寸根据文本宽度自适应
-            comp_surf = self.font.render(self.composition_text, True, (20, 20, 20))
-            pad_x, pad_y = 8, 6
-            panel_w = min(max(120, comp_surf.get_width() + pad_x * 2), int(self.rect.width))
-            panel_h = comp_surf.get_height() + pad_y * 2
-            panel_rect = pygame.Rect(self.rect.x, self.rect.bottom + 4, panel_w, panel_h)
-            # 阴影
-            shadow = pygame.Rect(panel_rect.x + 3, panel_rect.y + 3, panel_rect.width, panel_rect.height)
-            pygame.draw.rect(screen, (190, 200, 220), shadow, border_radius=6)
-            # 背景与边框
-            pygame.draw.rect(screen, (245, 248, 255), panel_rect, border_radius=6)
-            pygame.draw.rect(screen, (140, 170, 220), panel_rect, 2, border_radius=6)
-            # 文本
-            screen.blit(comp_surf, (panel_rect.x + pad_x, panel_rect.y + pad_y))
-            # 选区高亮（若有）
-            if self.comp_length > 0:
-                prefix = self.composition_text[:self.comp_start]
-                sel = self.composition_text[self.comp_start:self.comp_start + self.comp_length]
-                pre_w = self.font.size(prefix)[0]
-                sel_w = self.font.size(sel)[0]
-                sel_rect = pygame.Rect(panel_rect.x + pad_x + pre_w, panel_rect.y + pad_y, sel_w, comp_surf.get_height())
-                pygame.draw.rect(screen, (220, 235, 255), sel_rect)
-                pygame.draw.rect(screen, (120, 160, 220), sel_rect, 1)
+        clip = screen.get_clip()
+        key = (rect.size, active, self.text, self.text_color, tuple(self.bg_color), self._placeholder_surf)
+        if self._composite is None or self._composite_key != key:
+            self._composite, self._composite_offset = self._render_composite()
+            self._composite_key = key
+        composite = self._composite
+        ox, oy = self._composite_offset
+        composite_pos = (x + ox, y + oy)
+        blits = []
+        # 输入框（含阴影与溢出的文字）完全在裁剪区域之外时跳过
+        if clip.colliderect(composite.get_rect(topleft=composite_pos)):
+            blits.append((composite, composite_pos))
+
+        # 绘制组合态预览面板（类似输入法候选框的组字串）：组字内容不变时复用合成好的面板；
+        # 面板左上角固定在输入框下方 4 像素处，起点已在裁剪区域右侧或下方时不必合成
+        panel_x, panel_y = x, rect.bottom + 4
+        if active and self.composition_text and panel_x < clip.right and panel_y < clip.bottom:
+            key = (self.composition_text, self.comp_start, self.comp_length, rect.width)
+            if self._comp_panel_surf is None or self._comp_panel_key != key:
+                self._comp_panel_surf, self._comp_panel_offset = self._render_comp_panel()
+                self._comp_panel_key = key
+            px, py = self._comp_panel_offset
+            blits.append((self._comp_panel_surf, (panel_x + px, panel_y + py)))
+
+        if blits:
+            screen.blits(blits, doreturn=False)
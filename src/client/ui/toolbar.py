@@ -1,6 +1,8 @@
 import pygame
 from typing import Callable, List, Tuple, Optional
 
+from src.client.ui.fonts import get_font
+
 
 class Toolbar:
     """
@@ -29,18 +31,8 @@ class Toolbar:
         self.on_brush: Optional[Callable[[int], None]] = None
         self.on_mode: Optional[Callable[[str], None]] = None
         self.on_clear: Optional[Callable[[], None]] = None
-        try:
-            # Use Chinese font if no font specified
-            if font_name is None:
-                font_name = "Microsoft YaHei"
-            self.font = pygame.font.SysFont(font_name, 18)
-        except Exception:
-            # Fallback to SimHei
-            try:
-                self.font = pygame.font.SysFont("SimHei", 18)
-            except Exception:
-                # Last resort
-                self.font = pygame.font.SysFont(None, 18)
+        # Use Chinese font (Microsoft YaHei) if no font specified; shared via the font cache
+        self.font = get_font(font_name, 18)
         self._current_mode = "draw"
         # 当前选中的颜色和笔刷索引（用于高亮显示）
         self.selected_color_index: Optional[int] = None
@@ -1,19 +1,40 @@
+import itertools
 import random
 import time
 import logging
-from typing import Dict, List, Optional, Tuple
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.server.models import Player
+from src.shared.protocols import dumps_bytes
 
 logger = logging.getLogger(__name__)
 
+# 词库（这里简化处理，实际应从词库加载）；所有房间共用
+WORDS: Tuple[str, ...] = ("苹果", "香蕉", "电脑", "汽车", "飞机", "西瓜", "兔子", "太阳")
+
+# 房间状态版本号的全局计数器：所有房间共用，重建的同名房间也不会与旧版本号重复
+_state_versions = itertools.count()
+
 
 class GameRoom:
     """
     游戏房间类，管理玩家、游戏状态和回合逻辑。
     """
 
+    # 房间属性固定，用 __slots__ 省去每个实例的 __dict__
+    __slots__ = (
+        "room_id", "players", "owner_id", "status", "current_word", "drawer_id",
+        "round_number", "max_rounds", "round_start_time", "round_duration",
+        "rest_time", "rest_start_time", "end_round_on_drawer_leave",
+        "drawer_order", "current_drawer_index",
+        "_word_bag", "_rng", "_player_ids_buf", "_public_state_cache",
+        "state_version",
+    )
+
     def __init__(self, room_id: str):
         self.room_id = room_id
-        self.players: Dict[str, Dict[str, any]] = {}  # player_id -> {name, score, is_drawer}
+        self.players: Dict[str, Player] = {}  # player_id -> Player(name, score, is_drawer)
         self.owner_id: Optional[str] = None
         # waiting: 未开始/大厅
         # playing: 正在绘画回合
@@ -24,14 +45,30 @@ class GameRoom:
         self.drawer_id: Optional[str] = None
         self.round_number = 0
         self.max_rounds = 5
-        self.round_start_time = 0
+        # 回合/休息开始时间取自 time.monotonic()（不受系统时间调整影响），0 表示未开始
+        self.round_start_time = 0.0
         self.round_duration = 60  # seconds
         self.rest_time = 10  # 轮与轮之间休息时间（秒）
-        self.rest_start_time = 0
+        self.rest_start_time = 0.0
         # 设置：绘画者退出时是否立刻终止本轮进入休息
         self.end_round_on_drawer_leave = True
         self.drawer_order: List[str] = []  # 随机生成的绘画顺序（player_id列表）
         self.current_drawer_index = 0  # 当前绘者在顺序中的索引
+        # 洗好的待用词语：依次取出，取完再整体重洗，一轮词库内不会重复
+        self._word_bag: Deque[str] = deque()
+        self._rng = random.Random()
+        # start_game 生成绘画顺序时复用的玩家 ID 缓冲区
+        self._player_ids_buf: List[str] = []
+        # 公开状态的 JSON 编码缓存：(是否包含词语, 剩余时间) -> bytes
+        # 房间内的修改都会调用 mark_dirty() 清空；外部直接修改属性后也需调用
+        self._public_state_cache: Dict[Tuple[bool, int], bytes] = {}
+        # 状态版本号：每次 mark_dirty() 都会换成新值，外部可据此判断自己的缓存是否过期
+        self.state_version = next(_state_versions)
+
+    def mark_dirty(self) -> None:
+        """房间状态已变化，丢弃缓存的公开状态编码并更新版本号"""
+        self._public_state_cache.clear()
+        self.state_version = next(_state_versions)
 
     def add_player(self, player_id: str, player_name: str) -> bool:
         """添加玩家到房间"""
@@ -42,17 +79,15 @@ class GameRoom:
         if not self.players:
             self.owner_id = player_id
 
-        self.players[player_id] = {
-            "name": player_name,
-            "score": 0,
-            "is_drawer": False
-        }
+        self.players[player_id] = Player(player_name)
+        self.mark_dirty()
         return True
 
     def remove_player(self, player_id: str):
         """从房间移除玩家"""
         if player_id in self.players:
             del self.players[player_id]
+            self.mark_dirty()
 
             # 如果房主离开，移交房主权限
             if self.owner_id == player_id:
@@ -78,57 +113,60 @@ class GameRoom:
                 self.round_number = 0
                 self.drawer_order = []
                 self.current_drawer_index = 0
-                self.round_start_time = 0
-                self.rest_start_time = 0
+                self.round_start_time = 0.0
+                self.rest_start_time = 0.0
 
-    def get_time_left(self) -> int:
+    def get_time_left(self, now: Optional[float] = None) -> int:
         """返回当前阶段剩余时间（秒）。
 
         - playing: round_duration 倒计时
         - resting: rest_time 倒计时
         - 其他: 0
+
+        Args:
+            now: time.monotonic() 时间戳；同一批计算可传入同一个值，省去重复取时
         """
-        now = time.time()
         if self.status == "playing" and self.round_start_time:
-            try:
-                elapsed = max(0.0, now - float(self.round_start_time))
-            except Exception:
-                elapsed = 0.0
-            return max(0, int(self.round_duration - elapsed))
+            if now is None:
+                now = time.monotonic()
+            return max(0, int(self.round_duration - max(0.0, now - self.round_start_time)))
         if self.status == "resting" and self.rest_start_time:
-            try:
-                elapsed = max(0.0, now - float(self.rest_start_time))
-            except Exception:
-                elapsed = 0.0
-            return max(0, int(self.rest_time - elapsed))
+            if now is None:
+                now = time.monotonic()
+            return max(0, int(self.rest_time - max(0.0, now - self.rest_start_time)))
         return 0
 
     def start_rest(self) -> None:
         """进入回合间休息阶段。"""
         self.status = "resting"
-        self.rest_start_time = time.time()
+        self.rest_start_time = time.monotonic()
         # 清空本回合数据，避免休息阶段泄露/误用
         self.current_word = None
-        self.round_start_time = 0
-        # 休息阶段不指定绘者，避免客户端继续显示词语
+        self.round_start_time = 0.0
+        # 休息阶段不指定绘者，避免客户端继续显示词语（只有当前绘者带有 is_drawer 标记）
+        drawer = self.players.get(self.drawer_id) if self.drawer_id else None
+        if drawer is not None:
+            drawer.is_drawer = False
         self.drawer_id = None
-        for p in self.players.values():
-            p["is_drawer"] = False
+        self.mark_dirty()
 
-    def tick(self) -> bool:
+    def tick(self, now: Optional[float] = None) -> bool:
         """服务器每秒调用一次的状态推进。
 
+        Args:
+            now: time.monotonic() 时间戳，服务器一次 tick 中所有房间共用
+
         Returns:
             True 表示房间状态发生了变化（需要广播事件/状态）。
         """
         if self.status == "playing":
-            time_left = self.get_time_left()
+            time_left = self.get_time_left(now)
             if time_left <= 0:
                 logger.info(f"[Room {self.room_id}] Playing -> Resting (time up)")
                 self.start_rest()
                 return True
         elif self.status == "resting":
-            time_left = self.get_time_left()
+            time_left = self.get_time_left(now)
             if time_left <= 0:
                 logger.info(f"[Room {self.room_id}] Resting -> next_round()")
                 # 休息结束：进入下一回合或结束游戏
@@ -136,6 +174,7 @@ class GameRoom:
                 if ok:
                     # next_round 成功，进入 playing 状态
                     self.status = "playing"
+                    self.mark_dirty()
                     logger.info(f"[Room {self.room_id}] -> Playing (round {self.round_number})")
                 else:
                     logger.info(f"[Room {self.room_id}] -> Ended (next_round failed)")
@@ -143,19 +182,20 @@ class GameRoom:
                 return True
         return False
 
-    def get_public_state(self, for_drawer: bool = False) -> dict:
+    def get_public_state(self, for_drawer: bool = False, now: Optional[float] = None) -> dict:
         """获取房间的公开状态（用于广播给所有玩家）
 
         Args:
             for_drawer: 如果为True，包含当前词语；否则隐藏词语（只有绘者看得到）
+            now: 计算剩余时间所用的 time.monotonic() 时间戳，默认取当前时间
         """
-        time_left = self.get_time_left()
+        time_left = self.get_time_left(now)
 
         return {
             "room_id": self.room_id,
             "owner_id": self.owner_id,
             "status": self.status,
-            "players": self.players,
+            "players": {pid: p.to_dict() for pid, p in self.players.items()},
             "drawer_id": self.drawer_id,
             "round_number": self.round_number,
             "max_rounds": self.max_rounds,
@@ -168,6 +208,25 @@ class GameRoom:
             "current_drawer_index": self.current_drawer_index,  # 当前轮次索引
         }
 
+    def get_public_state_json(self, for_drawer: bool = False, now: Optional[float] = None) -> bytes:
+        """获取公开状态的 JSON 编码（缓存，状态与剩余时间都未变化时直接复用）
+
+        同一次广播中所有非绘者收到的内容相同，只需编码一次。
+        """
+        # 缓存键与编码内容使用同一时刻的剩余时间
+        if now is None:
+            now = time.monotonic()
+        time_left = self.get_time_left(now)
+        key = (bool(for_drawer and self.status == "playing"), time_left)
+        cache = self._public_state_cache
+        data = cache.get(key)
+        if data is None:
+            if cache and next(iter(cache))[1] != time_left:
+                # 剩余时间已变化，旧的编码不会再用到
+                cache.clear()
+            data = cache[key] = dumps_bytes(self.get_public_state(for_drawer=for_drawer, now=now))
+        return data
+
     def start_game(self) -> bool:
         """开始游戏 - 生成随机绘画顺序"""
         if len(self.players) < 1: # 调试时允许 1 人
@@ -176,16 +235,22 @@ class GameRoom:
         self.round_number = 0
         self.current_drawer_index = 0
         # 记录当前回合开始时间，用于统一倒计时
-        self.round_start_time = time.time()
+        self.round_start_time = time.monotonic()
 
         # 生成随机绘画顺序（允许重复，使每个玩家都有机会绘画max_rounds次）
-        player_ids = list(self.players.keys())
-        self.drawer_order = []
+        # 每轮把复用的玩家 ID 缓冲区原地洗牌后追加（每段都是全部玩家的一个排列）
+        buf = self._player_ids_buf
+        buf[:] = self.players
+        order: List[str] = []
         for _ in range(self.max_rounds):
-            self.drawer_order.extend(random.sample(player_ids, len(player_ids)))
+            self._rng.shuffle(buf)
+            order.extend(buf)
+        self.drawer_order = order
 
         for p in self.players.values():
-            p["score"] = 0
+            p.score = 0
+            p.is_drawer = False
+        self.mark_dirty()
         return self.next_round()
 
     def next_round(self) -> bool:
@@ -197,6 +262,7 @@ class GameRoom:
         self.round_number += 1
 
         # 从预生成的顺序中获取当前绘者；若该玩家已离开，则跳过
+        prev_drawer_id = self.drawer_id
         self.drawer_id = None
         while self.current_drawer_index < len(self.drawer_order):
             candidate = self.drawer_order[self.current_drawer_index]
@@ -208,18 +274,25 @@ class GameRoom:
             self.end_game()
             return False
 
-        for pid, p in self.players.items():
-            p["is_drawer"] = (pid == self.drawer_id)
-
-        # 随机选词（这里简化处理，实际应从词库加载）
-        words = ["苹果", "香蕉", "电脑", "汽车", "飞机", "西瓜", "兔子", "太阳"]
-        self.current_word = random.choice(words)
+        # 只需更新上一位与本回合绘者的标记
+        prev = self.players.get(prev_drawer_id) if prev_drawer_id else None
+        if prev is not None:
+            prev.is_drawer = False
+        self.players[self.drawer_id].is_drawer = True
+
+        # 随机选词：从洗好的词袋中依次取出
+        if not self._word_bag:
+            bag = list(WORDS)
+            self._rng.shuffle(bag)
+            self._word_bag.extend(bag)
+        self.current_word = self._word_bag.popleft()
         # 新一轮开始时刷新回合开始时间
-        self.round_start_time = time.time()
+        self.round_start_time = time.monotonic()
 
         # 进入新回合时，清空休息计时
-        self.rest_start_time = 0
+        self.rest_start_time = 0.0
 
+        self.mark_dirty()
         return True
 
     def end_game(self):
@@ -227,6 +300,7 @@ class GameRoom:
         self.status = "ended"
         self.drawer_id = None
         self.current_word = None
+        self.mark_dirty()
 
     def submit_guess(self, player_id: str, guess_text: str) -> Tuple[bool, int]:
         """提交猜词"""
@@ -236,10 +310,11 @@ class GameRoom:
         if guess_text == self.current_word:
             # 猜对了，加分
             score_gain = 10
-            self.players[player_id]["score"] += score_gain
+            self.players[player_id].score += score_gain
             # 画手也加分
             if self.drawer_id:
-                self.players[self.drawer_id]["score"] += 5
+                self.players[self.drawer_id].score += 5
+            self.mark_dirty()
 
             # 简化：猜对后立即进入下一回合（实际可能需要等待计时结束）
             # self.next_round()
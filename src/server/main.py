@@ -5,8 +5,10 @@
 """
 
 import logging
+import signal
 import sys
 import os
+import threading
 from pathlib import Path
 
 # 添加项目根目录到路径
@@ -23,6 +25,9 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Windows 上阻塞的 Event.wait() 无法被 Ctrl+C 打断，需要定期醒来检查信号
+STOP_POLL_INTERVAL = 1.0 if os.name == "nt" else None
+
 
 def main():
     """启动服务器主函数"""
@@ -40,6 +45,15 @@ def main():
     logger.info(f"监听地址: {host}:{port}")
     logger.info("=" * 50)
 
+    # 收到 SIGINT/SIGTERM 时唤醒主线程，执行正常的关闭流程
+    stop_event = threading.Event()
+
+    def _request_stop(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+
     try:
         from src.server.network import NetworkServer
         server = NetworkServer(host, port)
@@ -47,10 +61,12 @@ def main():
 
         logger.info("服务器运行中，按 Ctrl+C 停止")
 
-        # 保持服务器运行
-        while True:
-            import time
-            time.sleep(1)
+        # 保持服务器运行：阻塞等待停止信号，期间不再周期性唤醒
+        while not stop_event.wait(STOP_POLL_INTERVAL):
+            pass
+
+        logger.info("\n服务器正在关闭...")
+        server.stop()
 
     except KeyboardInterrupt:
         logger.info("\n服务器正在关闭...")
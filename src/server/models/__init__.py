@@ -4,4 +4,25 @@
 定义游戏中的数据结构，如玩家、房间、游戏状态等。
 """
 
-# TODO: 实现数据模型
+from typing import Any, Dict
+
+
+class Player:
+    """房间内的玩家：名字、得分与是否为本回合绘者"""
+
+    __slots__ = ("name", "score", "is_drawer")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.score = 0
+        self.is_drawer = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """公开状态中的玩家信息"""
+        return {"name": self.name, "score": self.score, "is_drawer": self.is_drawer}
+
+    def __repr__(self) -> str:
+        return f"Player(name={self.name!r}, score={self.score}, is_drawer={self.is_drawer})"
+
+
+__all__ = ["Player"]
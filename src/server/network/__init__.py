@@ -7,12 +7,14 @@
 from __future__ import annotations
 
 import logging
+import selectors
 import socket
 import threading
 import json
 import traceback
 import time
-from typing import Dict, Optional, Tuple
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -37,9 +39,42 @@ from src.shared.constants import (
 	MSG_SET_GAME_CONFIG,
 	MSG_ERROR,
 )
-from src.shared.protocols import Message
+from src.shared.protocols import Message, dumps_bytes, loads_bytes
 from src.server.game import GameRoom
 
+# 事件循环等待 I/O 的最长时间（秒），同时也是房间状态定时广播的间隔
+TICK_INTERVAL = 1.0
+
+# 接收缓冲区中已解析的前缀超过该字节数（或超过缓冲区一半）时才整体前移
+RECV_COMPACT_THRESHOLD = 64 * 1024
+
+# 内容固定的应答（事件类型 -> 编码好的整行消息），导入时编码一次，发送时直接复用
+_ACK_BYTES: Dict[str, bytes] = {
+	event: Message("ack", {"ok": True, "event": event}).to_bytes() + b"\n"
+	for event in (MSG_CONNECT, MSG_LEAVE_ROOM, MSG_SET_GAME_CONFIG)
+}
+
+# 固定文本的错误消息（错误文本 -> 编码好的整行消息），同样只编码一次
+_ERROR_BYTES: Dict[str, bytes] = {
+	text: Message("error", {"msg": text}).to_bytes() + b"\n"
+	for text in (
+		"Could not join room",
+		"Room not found",
+		"Invalid config",
+		"Permission denied",
+		"Cannot start game with no players",
+	)
+}
+
+# 客户端连接的内核发送缓冲区大小（字节），让广播突发尽量直接写入内核而不是留在会话队列
+SEND_BUFFER_SIZE = 256 * 1024
+
+# 客户端编码的绘画消息的固定前缀（orjson 与标准库 json 两种格式），见 _relay_draw
+_DRAW_PREFIXES: Tuple[bytes, ...] = (b'{"type":"draw","data":', b'{"type": "draw", "data": ')
+
+# 单个会话待发送数据的上限（字节）：客户端长时间不读取时按断开处理，避免内存无限增长
+MAX_SEND_BACKLOG = 4 * 1024 * 1024
+
 
 class ClientSession:
 	"""客户端会话，封装连接与玩家信息"""
@@ -51,9 +86,16 @@ class ClientSession:
 		self.player_name: Optional[str] = None
 		self.room_id: Optional[str] = None
 		self._recv_buffer = bytearray()
+		self._head = 0  # _recv_buffer 中尚未解析部分的起始下标
+		# 待发送的已编码消息及其总字节数；_want_write 表示已向选择器登记 EVENT_WRITE
+		self._out: Deque[bytes] = deque()
+		self._out_size = 0
+		self._want_write = False
+		# 关闭后 conn.fileno() 会变为 -1，这里保存原值用于会话表与选择器注销
+		self._fileno = conn.fileno()
 
 	def fileno(self) -> int:
-		return self.conn.fileno()
+		return self._fileno
 
 	def close(self) -> None:
 		try:
@@ -69,11 +111,29 @@ class NetworkServer:
 		self.host = host
 		self.port = port
 		self._sock: Optional[socket.socket] = None
-		self._accept_thread: Optional[threading.Thread] = None
+		self._sel: Optional[selectors.BaseSelector] = None
+		# stop() 通过写入该套接字对唤醒阻塞在 select 上的事件循环
+		self._wakeup: Optional[Tuple[socket.socket, socket.socket]] = None
+		self._loop_thread: Optional[threading.Thread] = None
 		self._running = threading.Event()
 		self.sessions: Dict[int, ClientSession] = {}
 		self.rooms: Dict[str, GameRoom] = {}
-		self._tick_thread: Optional[threading.Thread] = None
+		# 房间 -> 房间内会话（fileno -> 会话）的索引，房间广播无需扫描全部会话；由 _set_room 维护
+		self.room_sessions: Dict[str, Dict[int, ClientSession]] = {}
+		# 玩家 id -> 会话，MSG_CONNECT 时登记、断开时移除（同一 id 以最近一次连接为准）
+		self.player_to_session: Dict[str, ClientSession] = {}
+		# 本轮事件处理中是否登记过房间列表广播（见 broadcast_rooms_update）
+		self._rooms_update_pending = False
+		# 房间状态整行编码的缓存：room_id -> (state_version, 剩余时间, {是否绘者: bytes})
+		self._state_cache: Dict[str, Tuple[int, int, Dict[bool, bytes]]] = {}
+		# 发送积压过多、需在本轮结束时断开的会话（fileno -> 会话）。广播途中不直接断开，
+		# 这样各广播可以直接遍历会话表，无需先复制一份
+		self._pending_disconnects: Dict[int, ClientSession] = {}
+		# 本轮事件处理中有新消息排队、尚未尝试写出的会话（fileno -> 会话）
+		self._pending_flush: Dict[int, ClientSession] = {}
+		# recv_into 使用的读缓冲区：所有会话都在事件循环线程中读取，共用一块即可
+		self._rbuf = bytearray(BUFFER_SIZE)
+		self._rview = memoryview(self._rbuf)
 
 	def _rooms_snapshot(self) -> list:
 		"""构建当前房间的简要列表快照。"""
@@ -86,152 +146,288 @@ class NetworkServer:
 			})
 		return rooms
 
+	def _set_room(self, sess: ClientSession, room_id: Optional[str]) -> None:
+		"""修改会话所在房间，并同步更新 room_sessions 索引"""
+		old = sess.room_id
+		if old is not None:
+			members = self.room_sessions.get(old)
+			if members is not None:
+				members.pop(sess.fileno(), None)
+				if not members:
+					del self.room_sessions[old]
+		sess.room_id = room_id
+		if room_id is not None:
+			self.room_sessions.setdefault(room_id, {})[sess.fileno()] = sess
+
 	def broadcast_rooms_update(self) -> None:
-		"""向所有连接广播房间列表更新。"""
-		payload = {"rooms": self._rooms_snapshot()}
-		for s in list(self.sessions.values()):
-			self._send(s, Message("rooms_update", payload))
+		"""登记一次房间列表广播。
+
+		同一轮事件处理中的多次登记（如踢人后紧接着离开）只在本轮结束时
+		构建并编码一次快照，由 _flush_rooms_update() 发送。
+		"""
+		self._rooms_update_pending = True
+
+	def _flush_rooms_update(self) -> None:
+		"""若本轮登记过房间列表广播，则向所有连接发送一次最新快照"""
+		if not self._rooms_update_pending:
+			return
+		self._rooms_update_pending = False
+		payload = self._encode(Message("rooms_update", {"rooms": self._rooms_snapshot()}))
+		for s in self.sessions.values():
+			self._send_bytes(s, payload)
 
 	# 服务器生命周期
 	def start(self) -> None:
-		"""启动服务器并进入 Accept 循环"""
+		"""启动服务器并在后台线程中运行事件循环"""
 		self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 		# // 允许快速重启服务
 		self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 		self._sock.bind((self.host, self.port))
 		self._sock.listen(32)
+		self._sock.setblocking(False)
+		self._wakeup = socket.socketpair()
+		self._wakeup[0].setblocking(False)
+		# 监听套接字与唤醒套接字的 data 为 None，客户端连接的 data 为对应的 ClientSession
+		self._sel = selectors.DefaultSelector()
+		self._sel.register(self._sock, selectors.EVENT_READ)
+		self._sel.register(self._wakeup[0], selectors.EVENT_READ)
 		self._running.set()
-		self._accept_thread = threading.Thread(target=self._accept_loop, name="accept-loop", daemon=True)
-		self._accept_thread.start()
-		# 启动房间状态定时广播线程，用于统一倒计时（服务器统一计算剩余时间）
-		self._tick_thread = threading.Thread(target=self._tick_loop, name="room-tick", daemon=True)
-		self._tick_thread.start()
+		self._loop_thread = threading.Thread(target=self._serve_loop, name="io-loop", daemon=True)
+		self._loop_thread.start()
 
 	def stop(self) -> None:
-		"""停止服务器并关闭所有会话"""
+		"""停止服务器并关闭所有会话（实际的清理由事件循环线程完成）"""
 		self._running.clear()
+		if self._wakeup:
+			try:
+				self._wakeup[1].send(b"\0")
+			except OSError:
+				pass
+		if self._loop_thread and self._loop_thread is not threading.current_thread():
+			self._loop_thread.join(timeout=TICK_INTERVAL * 2)
+
+	# 事件循环
+	def _serve_loop(self) -> None:
+		"""单线程事件循环：selectors 等待所有套接字可读（Linux 上为 epoll），
+		并每隔 TICK_INTERVAL 秒推进一次房间状态。所有会话与房间只在该线程中访问。
+		"""
+		sel = self._sel
+		next_tick = time.monotonic() + TICK_INTERVAL
 		try:
-			if self._sock:
-				# // 触发 accept 退出
-				try:
-					self._sock.shutdown(socket.SHUT_RDWR)
-				except Exception:
-					pass
-				self._sock.close()
+			while self._running.is_set():
+				events = sel.select(max(0.0, next_tick - time.monotonic()))
+				for key, mask in events:
+					sess = key.data
+					if sess is not None:
+						if mask & selectors.EVENT_WRITE:
+							self._flush(sess)
+						# 写出失败时会话已被移除
+						if mask & selectors.EVENT_READ and self.sessions.get(sess.fileno()) is sess:
+							self._on_readable(sess)
+					elif key.fileobj is self._sock:
+						self._on_accept()
+					else:
+						self._drain_wakeup()
+				now = time.monotonic()
+				if now >= next_tick:
+					self._tick(now)
+					next_tick = now + TICK_INTERVAL
+				self._drain_disconnects()
+				# 本轮产生的消息合并后每个会话只写一次
+				self._flush_rooms_update()
+				self._flush_pending()
+		except Exception:
+			traceback.print_exc()
 		finally:
-			self._sock = None
-		# // 关闭所有客户端连接
+			self._close_all()
+
+	def _close_all(self) -> None:
+		"""关闭所有客户端连接、监听套接字与选择器"""
 		for sess in list(self.sessions.values()):
 			sess.close()
 		self.sessions.clear()
+		for sock in (self._sock, *(self._wakeup or ())):
+			if sock:
+				sock.close()
+		self._sock = None
+		self._wakeup = None
+		if self._sel:
+			self._sel.close()
+			self._sel = None
+
+	def _drain_wakeup(self) -> None:
+		try:
+			self._wakeup[0].recv(64)  # type: ignore[index]
+		except OSError:
+			pass
 
-	# 接入与会话线程
-	def _accept_loop(self) -> None:
-		"""Accept 新连接并为其创建会话线程"""
-		while self._running.is_set():
-			try:
-				conn, addr = self._sock.accept()  # type: ignore[arg-type]
-			except OSError:
-				# // 套接字已关闭或出错，退出循环
-				break
-			sess = ClientSession(conn, addr)
-			self.sessions[conn.fileno()] = sess
-			t = threading.Thread(target=self._session_loop, args=(sess,), daemon=True)
-			t.start()
-
-	def _session_loop(self, sess: ClientSession) -> None:
-		"""单会话收发循环：按行（\n）读取 JSON 消息并路由"""
-		conn = sess.conn
+	def _on_accept(self) -> None:
+		"""接入新连接并注册到选择器"""
 		try:
-			while self._running.is_set():
-				data = conn.recv(BUFFER_SIZE)
-				if not data:
-					break
-				sess._recv_buffer.extend(data)
-				# // 简单分包：按换行符划分消息
-				while True:
-					try:
-						idx = sess._recv_buffer.index(ord("\n"))
-					except ValueError:
-						break
-					raw = sess._recv_buffer[:idx]
-					del sess._recv_buffer[: idx + 1]
-					self._handle_raw_message(sess, raw)
-		except ConnectionResetError:
+			conn, addr = self._sock.accept()  # type: ignore[union-attr]
+		except (BlockingIOError, InterruptedError):
+			return
+		except OSError:
+			logger.exception("accept 失败")
+			return
+		# 非阻塞收发：写不完的数据留在会话队列中，等 EVENT_WRITE 时继续
+		conn.setblocking(False)
+		try:
+			# 关闭 Nagle 算法：绘画同步是大量小消息，合并等待会带来明显延迟
+			conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+			conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_SIZE)
+		except OSError:
 			pass
+		sess = ClientSession(conn, addr)
+		self.sessions[sess.fileno()] = sess
+		self._sel.register(conn, selectors.EVENT_READ, sess)  # type: ignore[union-attr]
+
+	def _on_readable(self, sess: ClientSession) -> None:
+		"""读取会话上已到达的数据，按行（\n）切分 JSON 消息并路由"""
+		try:
+			n = sess.conn.recv_into(self._rview)
+		except (BlockingIOError, InterruptedError):
+			return
+		except OSError:
+			n = 0
+		if not n:
+			self._on_disconnect(sess)
+			return
+		buf = sess._recv_buffer
+		start = len(buf)
+		buf += self._rview[:n]
+		try:
+			self._parse_lines(sess, start)
 		except Exception:
 			traceback.print_exc()
-		finally:
 			self._on_disconnect(sess)
 
-	def _tick_loop(self) -> None:
-		"""定时广播正在进行中的房间状态，由服务器统一计算剩余时间。
+	def _parse_lines(self, sess: ClientSession, start: int) -> None:
+		"""按换行符切分会话缓冲区中的完整消息；start 之前的未解析数据已确认没有换行符。
+
+		通过 _head 记录解析位置，不再每条消息都删除缓冲区前缀（每次删除都要
+		移动其后的全部字节）；只有已解析部分足够大时才一次性前移剩余数据。
+		每条消息以 memoryview 切片交给解析器，不复制字节。
+		"""
+		buf = sess._recv_buffer
+		head = sess._head
+		# memoryview 存在期间不能改变 buf 大小，需在前移之前释放
+		with memoryview(buf) as view:
+			while True:
+				idx = buf.find(b"\n", start)
+				if idx < 0:
+					break
+				self._handle_raw_message(sess, view[head:idx])
+				head = start = idx + 1
+				# 处理过程中会话可能已断开（如 MSG_DISCONNECT 或发送失败）
+				if self.sessions.get(sess.fileno()) is not sess:
+					return
+		if head >= len(buf):
+			buf.clear()
+			head = 0
+		elif head > RECV_COMPACT_THRESHOLD or head > len(buf) // 2:
+			del buf[:head]
+			head = 0
+		sess._head = head
+
+	def _tick(self, now: float) -> None:
+		"""推进并广播正在进行中的房间状态，由服务器统一计算剩余时间。
 
 		这样所有客户端都以服务器为准更新倒计时，避免各自本地计时产生偏差。
+		本次 tick 中所有房间共用同一个时间戳 now。
 		"""
-		while self._running.is_set():
-			try:
-				for rid, room in list(self.rooms.items()):
-					# 推进房间状态（playing->resting->next round）
+		try:
+			for rid, room in self.rooms.items():
+				# 推进房间状态（playing->resting->next round）
+				changed = False
+				try:
+					changed = bool(room.tick(now))
+				except Exception:
 					changed = False
-					try:
-						changed = bool(room.tick())
-					except Exception:
-						changed = False
 
-					if room.status in ("playing", "resting"):
-						# 每秒广播一次，保证倒计时平滑
-						self.broadcast_room_state(rid)
+				if room.status in ("playing", "resting"):
+					# 每秒广播一次，保证倒计时平滑
+					self.broadcast_room_state(rid)
 
-					# 若刚从休息推进到新回合，发送 NEXT_ROUND 事件（让客户端清空画布等）
-					if changed and room.status == "playing":
-						try:
-							players = room.players or {}
-							drawer_name = None
-							if room.drawer_id and room.drawer_id in players:
-								drawer_name = players[room.drawer_id].get("name")
-						except Exception:
-							drawer_name = None
-						self.broadcast_room(rid, Message("event", {
-							"type": MSG_NEXT_ROUND,
-							"ok": True,
-							"drawer_id": room.drawer_id,
-							"drawer_name": drawer_name,
-							"round_number": room.round_number,
-							"round": room.round_number,
-							"max_rounds": room.max_rounds,
-						}))
+				# 若刚从休息推进到新回合，发送 NEXT_ROUND 事件（让客户端清空画布等）
+				if changed and room.status == "playing":
+					try:
+						players = room.players or {}
+						drawer_name = None
+						if room.drawer_id and room.drawer_id in players:
+							drawer_name = players[room.drawer_id].name
+					except Exception:
+						drawer_name = None
+					self.broadcast_room(rid, Message("event", {
+						"type": MSG_NEXT_ROUND,
+						"ok": True,
+						"drawer_id": room.drawer_id,
+						"drawer_name": drawer_name,
+						"round_number": room.round_number,
+						"round": room.round_number,
+						"max_rounds": room.max_rounds,
+					}))
 
-					# 若回合结束后房间进入 ended，则广播一次最终状态
-					if changed and room.status == "ended":
-						self.broadcast_room_state(rid)
-			except Exception:
-				traceback.print_exc()
-			# 每秒钟广播一次即可保证较平滑的倒计时显示
-			time.sleep(1.0)
+				# 若回合结束后房间进入 ended，则广播一次最终状态
+				if changed and room.status == "ended":
+					self.broadcast_room_state(rid)
+		except Exception:
+			traceback.print_exc()
 
 	# 消息处理
-	def _handle_raw_message(self, sess: ClientSession, raw: bytes) -> None:
-		"""原始字节消息 -> JSON -> Message 并路由"""
+	def _handle_raw_message(self, sess: ClientSession, raw: memoryview) -> None:
+		"""原始字节消息 -> JSON -> Message 并路由（直接解析字节，不先解码为 str）"""
+		if self._relay_draw(sess, raw):
+			return
 		try:
-			text = raw.decode("utf-8", errors="replace")
-			msg = Message.from_json(text)
+			msg = Message.from_bytes(raw)
 		except Exception:
 			# // 非法消息，忽略
 			return
 		self._route_message(sess, msg)
 
+	def _relay_draw(self, sess: ClientSession, raw: memoryview) -> bool:
+		"""绘画消息不重新编码，直接把原始 data 字节拼进 draw_sync 转发给房间内其他玩家
+
+		只处理形如 {"type":"draw","data":...} 的消息（客户端 to_bytes() 的输出）；
+		不符合该格式时返回 False，交给常规解析流程。拼接前先确认 data 部分恰好是
+		一个完整的 JSON 值，否则形如 `0},"type":"event",...` 的内容会伪造出其他消息。
+		"""
+		if raw[-1:] != b"}":
+			return False
+		for prefix in _DRAW_PREFIXES:
+			if raw[:len(prefix)] == prefix:
+				break
+		else:
+			return False
+		body = raw[len(prefix):-1]
+		try:
+			loads_bytes(body)
+		except Exception:
+			return False
+		if sess.room_id:
+			data = b"".join((b'{"by":', dumps_bytes(sess.player_id), b',"data":', body, b"}"))
+			self.broadcast_room_bytes(sess.room_id, Message.encode_raw("draw_sync", data) + b"\n", exclude=sess)
+		return True
+
 	def _route_message(self, sess: ClientSession, msg: Message) -> None:
 		"""根据消息类型路由到对应处理函数"""
 		t = msg.type
 		data = msg.data
-		logger.info(f"收到消息: type={t}, from={sess.player_name or sess.addr}")
+		# 绘画/猜词消息量大且逐条记录意义不大，降为 DEBUG；使用 % 占位符，日志级别未开启时不做格式化
+		logger.log(
+			logging.DEBUG if t in (MSG_DRAW, MSG_GUESS) else logging.INFO,
+			"收到消息: type=%s, from=%s", t, sess.player_name or sess.addr,
+		)
 
 		if t == MSG_CONNECT:
 			# // 注册玩家，要求 data: {player_id, name}
+			if sess.player_id and self.player_to_session.get(sess.player_id) is sess:
+				del self.player_to_session[sess.player_id]
 			sess.player_id = str(data.get("player_id") or sess.addr[0])
+			self.player_to_session[sess.player_id] = sess
 			sess.player_name = str(data.get("name") or f"Player-{sess.addr[1]}")
-			self._send(sess, Message("ack", {"ok": True, "event": MSG_CONNECT}))
+			self._send_bytes(sess, _ACK_BYTES[MSG_CONNECT])
 
 		elif t == MSG_CREATE_ROOM:
 			# 创建房间
@@ -242,7 +438,7 @@ class NetworkServer:
 			# 自动加入
 			if sess.player_id and sess.player_name:
 				new_room.add_player(sess.player_id, sess.player_name)
-				sess.room_id = room_id
+				self._set_room(sess, room_id)
 
 				self._send(sess, Message("ack", {"ok": True, "event": MSG_CREATE_ROOM, "room_id": room_id}))
 			self.broadcast_room_state(room_id)
@@ -250,14 +446,7 @@ class NetworkServer:
 			self.broadcast_rooms_update()
 		elif t == MSG_LIST_ROOMS:
 			# 获取房间列表
-			room_list = []
-			for rid, r in self.rooms.items():
-				room_list.append({
-					"room_id": rid,
-					"player_count": len(r.players),
-					"status": r.status
-				})
-			self._send(sess, Message("ack", {"ok": True, "event": MSG_LIST_ROOMS, "rooms": room_list}))
+			self._send(sess, Message("ack", {"ok": True, "event": MSG_LIST_ROOMS, "rooms": self._rooms_snapshot()}))
 
 		elif t == MSG_JOIN_ROOM:
 			# 加入房间
@@ -266,21 +455,22 @@ class NetworkServer:
 				room = self.rooms[target_room_id]
 				if sess.player_id and sess.player_name:
 					if room.add_player(sess.player_id, sess.player_name):
-						sess.room_id = target_room_id
+						self._set_room(sess, target_room_id)
 						# 容错：若房主缺失，指定为已有的第一个玩家
 						if room.owner_id is None:
 							try:
 								room.owner_id = next(iter(room.players))
 							except Exception:
 								room.owner_id = sess.player_id
+							room.mark_dirty()
 						self._send(sess, Message("ack", {"ok": True, "event": MSG_JOIN_ROOM, "room_id": target_room_id}))
 						self.broadcast_room_state(target_room_id)
 						# 广播房间列表更新（人数变化）
 						self.broadcast_rooms_update()
 					else:
-						self._send(sess, Message("error", {"msg": "Could not join room"}))
+						self._send_bytes(sess, _ERROR_BYTES["Could not join room"])
 			else:
-				self._send(sess, Message("error", {"msg": "Room not found"}))
+				self._send_bytes(sess, _ERROR_BYTES["Room not found"])
 		elif t == MSG_SET_GAME_CONFIG:
 			# 房主更新游戏参数
 			if sess.room_id and sess.room_id in self.rooms:
@@ -288,6 +478,7 @@ class NetworkServer:
 				# 若尚未设定房主，则将当前请求者设为房主（容错）
 				if room.owner_id is None and sess.player_id:
 					room.owner_id = sess.player_id
+					room.mark_dirty()
 				if room.owner_id == sess.player_id:
 					try:
 						max_rounds = data.get("max_rounds")
@@ -318,14 +509,15 @@ class NetworkServer:
 								pass
 						if isinstance(end_on_leave, bool):
 							room.end_round_on_drawer_leave = end_on_leave
+						room.mark_dirty()
 						logger.info(f"游戏配置更新: max_rounds={room.max_rounds}, round_duration={room.round_duration}, rest_time={room.rest_time}")
-						self._send(sess, Message("ack", {"ok": True, "event": MSG_SET_GAME_CONFIG}))
+						self._send_bytes(sess, _ACK_BYTES[MSG_SET_GAME_CONFIG])
 						self.broadcast_room_state(sess.room_id)
 					except Exception as e:
 						logger.error(f"设置游戏配置出错: {e}")
-						self._send(sess, Message("error", {"msg": "Invalid config"}))
+						self._send_bytes(sess, _ERROR_BYTES["Invalid config"])
 				else:
-					self._send(sess, Message("error", {"msg": "Permission denied"}))
+					self._send_bytes(sess, _ERROR_BYTES["Permission denied"])
 
 		elif t == MSG_LEAVE_ROOM:
 			# 离开房间
@@ -338,9 +530,10 @@ class NetworkServer:
 				self.broadcast_rooms_update()
 				if not room.players:
 					del self.rooms[sess.room_id]
+					self._state_cache.pop(sess.room_id, None)
 
-			sess.room_id = None
-			self._send(sess, Message("ack", {"ok": True, "event": MSG_LEAVE_ROOM}))
+			self._set_room(sess, None)
+			self._send_bytes(sess, _ACK_BYTES[MSG_LEAVE_ROOM])
 
 		elif t == MSG_KICK_PLAYER:
 			# 踢出玩家
@@ -353,13 +546,12 @@ class NetworkServer:
 						room.remove_player(target_player_id)
 					self.broadcast_room_state(sess.room_id)
 					self.broadcast_rooms_update()
-					for s in self.sessions.values():
-						if s.player_id == target_player_id:
-							s.room_id = None
-							self._send(s, Message("event", {"type": MSG_KICK_PLAYER, "room_id": room.room_id}))
-							break
+					target = self.player_to_session.get(target_player_id)
+					if target is not None:
+						self._set_room(target, None)
+						self._send(target, Message("event", {"type": MSG_KICK_PLAYER, "room_id": room.room_id}))
 				else:
-					self._send(sess, Message("error", {"msg": "Permission denied"}))
+					self._send_bytes(sess, _ERROR_BYTES["Permission denied"])
 
 		elif t == MSG_START_GAME:
 			# 启动游戏 - 生成随机绘画顺序
@@ -368,6 +560,7 @@ class NetworkServer:
 				# 若尚未设定房主，则将当前请求者设为房主（容错）
 				if room.owner_id is None and sess.player_id:
 					room.owner_id = sess.player_id
+					room.mark_dirty()
 				if room.owner_id == sess.player_id:
 					# 调用 start_game 生成随机顺序并进入第一轮
 					ok = room.start_game()
@@ -379,7 +572,7 @@ class NetworkServer:
 							players = room.players or {}
 							drawer_name = None
 							if room.drawer_id and room.drawer_id in players:
-								drawer_name = players[room.drawer_id].get("name")
+								drawer_name = players[room.drawer_id].name
 						except Exception:
 							drawer_name = None
 						self.broadcast_room(sess.room_id, Message("event", {
@@ -394,11 +587,11 @@ class NetworkServer:
 							"max_rounds": room.max_rounds,
 						}))
 					else:
-						self._send(sess, Message("error", {"msg": "Cannot start game with no players"}))
+						self._send_bytes(sess, _ERROR_BYTES["Cannot start game with no players"])
 				else:
-					self._send(sess, Message("error", {"msg": "Permission denied"}))
+					self._send_bytes(sess, _ERROR_BYTES["Permission denied"])
 			else:
-				self._send(sess, Message("error", {"msg": "Room not found"}))
+				self._send_bytes(sess, _ERROR_BYTES["Room not found"])
 
 		elif t == MSG_NEXT_ROUND:
 			# 进入下一回合
@@ -413,7 +606,7 @@ class NetworkServer:
 						players = room.players or {}
 						drawer_name = None
 						if room.drawer_id and room.drawer_id in players:
-							drawer_name = players[room.drawer_id].get("name")
+							drawer_name = players[room.drawer_id].name
 					except Exception:
 						drawer_name = None
 					self.broadcast_room(sess.room_id, Message("event", {
@@ -434,6 +627,7 @@ class NetworkServer:
 				room = self.rooms[sess.room_id]
 				# room.end_game()
 				room.status = "ended"
+				room.mark_dirty()
 				self.broadcast_room_state(sess.room_id)
 				self.broadcast_room(sess.room_id, Message("event", {"type": MSG_END_GAME, "ok": True}))
 
@@ -448,6 +642,12 @@ class NetworkServer:
 					ok, score = False, 0
 					self._send(sess, Message("guess_result", {"ok": ok, "score": score}))
 				self.broadcast_room_state(sess.room_id)
+		elif t == MSG_DRAW:
+			# 绘画同步：原样转发给房间内其他玩家（"line"/"points"/"paint"/"clear" 等均不解析）
+			# 客户端的常规格式已由 _relay_draw 直接转发，这里只处理其他格式的绘画消息
+			if sess.room_id:
+				payload = {"by": sess.player_id, "data": data}
+				self.broadcast_room(sess.room_id, Message("draw_sync", payload), exclude=sess)
 		elif t == MSG_CHAT:
 			# 聊天
 			if sess.room_id:
@@ -495,20 +695,80 @@ class NetworkServer:
 			self._send(sess, Message("error", {"msg": f"unknown type: {t}"}))
 
 	# 发送/广播
+	@staticmethod
+	def _encode(msg: Message) -> bytes:
+		# to_bytes() 直接产出 UTF-8 字节串（可用时由 orjson 编码），无需再 encode
+		return msg.to_bytes() + b"\n"
+
 	def _send(self, sess: ClientSession, msg: Message) -> None:
+		self._send_bytes(sess, self._encode(msg))
+
+	def _send_bytes(self, sess: ClientSession, payload: bytes) -> None:
+		"""将已编码好的消息（需以换行符结尾）加入会话的发送队列
+
+		不在此处写 socket：本轮事件处理结束后由 _flush_pending() 合并写出，
+		发送缓冲区已满的会话则等选择器报告可写时再继续。
+		"""
+		if self.sessions.get(sess.fileno()) is not sess:
+			return
+		sess._out.append(payload)
+		sess._out_size += len(payload)
+		if sess._out_size > MAX_SEND_BACKLOG:
+			if sess.fileno() not in self._pending_disconnects:
+				logger.warning(f"客户端 {sess.player_name or sess.addr} 待发送数据过多，断开连接")
+				self._pending_disconnects[sess.fileno()] = sess
+			return
+		if not sess._want_write:
+			self._pending_flush[sess.fileno()] = sess
+
+	def _drain_disconnects(self) -> None:
+		"""断开本轮登记的会话（断开时的广播可能再登记新的会话，循环直到清空）"""
+		while self._pending_disconnects:
+			pending, self._pending_disconnects = self._pending_disconnects, {}
+			for sess in pending.values():
+				self._on_disconnect(sess)
+
+	def _flush_pending(self) -> None:
+		"""写出本轮排队了新消息的会话"""
+		while self._pending_flush:
+			pending, self._pending_flush = self._pending_flush, {}
+			for sess in pending.values():
+				self._flush(sess)
+
+	def _flush(self, sess: ClientSession) -> None:
+		"""将会话队列中的消息拼接后尽量一次写出，剩余部分等待 EVENT_WRITE"""
+		out = sess._out
+		if not out or self.sessions.get(sess.fileno()) is not sess:
+			return
+		data = out[0] if len(out) == 1 else b"".join(out)
 		try:
-			text = msg.to_json() + "\n"
-			sess.conn.sendall(text.encode("utf-8"))
-		except Exception:
+			n = sess.conn.send(data)
+		except (BlockingIOError, InterruptedError):
+			n = 0
+		except OSError:
 			self._on_disconnect(sess)
+			return
+		out.clear()
+		if n < len(data):
+			out.append(data[n:])
+		sess._out_size = len(data) - n
+		want_write = bool(out)
+		if want_write != sess._want_write:
+			sess._want_write = want_write
+			events = selectors.EVENT_READ | (selectors.EVENT_WRITE if want_write else 0)
+			self._sel.modify(sess.conn, events, sess)  # type: ignore[union-attr]
 
 	def broadcast_room(self, room_id: str, msg: Message, exclude: Optional[ClientSession] = None) -> None:
-		"""向特定房间广播消息"""
-		for s in list(self.sessions.values()):
-			if s.room_id == room_id:
-				if exclude and s is exclude:
-					continue
-				self._send(s, msg)
+		"""向特定房间广播消息（消息只编码一次）"""
+		if self.room_sessions.get(room_id):
+			self.broadcast_room_bytes(room_id, self._encode(msg), exclude)
+
+	def broadcast_room_bytes(self, room_id: str, payload: bytes, exclude: Optional[ClientSession] = None) -> None:
+		"""向特定房间广播已编码好的消息（需以换行符结尾）"""
+		for s in self.room_sessions.get(room_id, {}).values():
+			if exclude and s is exclude:
+				continue
+			self._send_bytes(s, payload)
 
 	def broadcast_room_state(self, room_id: str) -> None:
 		"""向房间广播房间状态，但对非绘者隐藏当前词语"""
@@ -516,33 +776,60 @@ class NetworkServer:
 			return
 		room = self.rooms[room_id]
 
-		for s in list(self.sessions.values()):
-			if s.room_id == room_id:
-				# 如果该玩家是绘者，发送包含词语的状态；否则隐藏词语
-				is_drawer = (s.player_id == room.drawer_id)
-				state = room.get_public_state(for_drawer=is_drawer)
-				self._send(s, Message(MSG_ROOM_UPDATE, state))
+		# // 绘者与非绘者各最多编码一次；房间版本号与剩余时间都未变化时（如聊天刷屏期间）
+		# // 直接复用上次广播的整行消息
+		now = time.monotonic()
+		time_left = room.get_time_left(now)
+		cached = self._state_cache.get(room_id)
+		if cached is not None and cached[0] == room.state_version and cached[1] == time_left:
+			encoded = cached[2]
+		else:
+			encoded = {}
+			self._state_cache[room_id] = (room.state_version, time_left, encoded)
+		for s in self.room_sessions.get(room_id, {}).values():
+			# 如果该玩家是绘者，发送包含词语的状态；否则隐藏词语
+			is_drawer = (s.player_id == room.drawer_id)
+			payload = encoded.get(is_drawer)
+			if payload is None:
+				state = room.get_public_state_json(for_drawer=is_drawer, now=now)
+				payload = encoded[is_drawer] = Message.encode_raw(MSG_ROOM_UPDATE, state) + b"\n"
+			self._send_bytes(s, payload)
 
 	def broadcast(self, msg: Message, exclude: Optional[ClientSession] = None) -> None:
 		"""向所有连接广播 (慎用)"""
-		for s in list(self.sessions.values()):
+		payload = self._encode(msg)
+		for s in self.sessions.values():
 			if exclude and s is exclude:
 				continue
-			self._send(s, msg)
+			self._send_bytes(s, payload)
 
 	# 断开清理
 	def _on_disconnect(self, sess: ClientSession) -> None:
+		# 广播时发送失败也会触发断开清理，同一会话只处理一次
+		if self.sessions.pop(sess.fileno(), None) is None:
+			return
+		self._pending_flush.pop(sess.fileno(), None)
+		self._pending_disconnects.pop(sess.fileno(), None)
+		if sess.player_id and self.player_to_session.get(sess.player_id) is sess:
+			del self.player_to_session[sess.player_id]
+		if self._sel:
+			try:
+				self._sel.unregister(sess.conn)
+			except (KeyError, ValueError):
+				pass
+		room_id = sess.room_id
 		try:
-			if sess.room_id and sess.room_id in self.rooms:
-				room = self.rooms[sess.room_id]
+			self._set_room(sess, None)
+			if room_id and room_id in self.rooms:
+				room = self.rooms[room_id]
 				if sess.player_id:
 					room.remove_player(sess.player_id)
-					self.broadcast_room(sess.room_id, Message(MSG_ROOM_UPDATE, room.get_public_state()))
+					self.broadcast_room(room_id, Message(MSG_ROOM_UPDATE, room.get_public_state()))
 					if not room.players:
-						del self.rooms[sess.room_id]
-			sess.close()
+						del self.rooms[room_id]
+						self._state_cache.pop(room_id, None)
 		finally:
-			self.sessions.pop(sess.fileno(), None)
+			sess.close()
 
 
 __all__ = [
@@ -5,7 +5,26 @@
 """
 
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库 json
+    orjson = None
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """将对象编码为 UTF-8 JSON 字节串（可用时使用 orjson）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def loads_bytes(raw: Union[bytes, bytearray, memoryview]) -> Any:
+    """解析 UTF-8 JSON 字节串（可用时使用 orjson）；内容必须恰好是一个完整的 JSON 值"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(bytes(raw))
 
 
 class Message:
@@ -32,6 +51,27 @@ class Message:
         obj = json.loads(json_str)
         return cls(obj["type"], obj.get("data", {}))
 
+    def to_bytes(self) -> bytes:
+        """将消息转换为 UTF-8 编码的 JSON 字节串（可用时使用 orjson）"""
+        return dumps_bytes({"type": self.type, "data": self.data})
+
+    @staticmethod
+    def encode_raw(msg_type: str, data: bytes) -> bytes:
+        """用已编码好的 data（JSON 字节串）拼出完整消息，与 to_bytes() 解析结果相同
+
+        用于广播时复用缓存的数据编码，避免为每个接收者重复序列化。
+        """
+        return b'{"type":' + dumps_bytes(msg_type) + b',"data":' + data + b"}"
+
+    @classmethod
+    def from_bytes(cls, raw: Union[bytes, bytearray, memoryview]) -> "Message":
+        """从 UTF-8 编码的 JSON 字节串创建消息，省去先解码为 str 的步骤
+
+        orjson 可直接解析 memoryview，标准库 json 则需要先转为 bytes。
+        """
+        obj = loads_bytes(raw)
+        return cls(obj["type"], obj.get("data", {}))
+
     def __repr__(self):
         return f"Message(type={self.type}, data={self.data})"
 
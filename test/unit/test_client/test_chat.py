@@ -0,0 +1,40 @@
+"""
+Chat panel tests.
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from src.client.ui.chat import ChatPanel  # noqa: E402
+
+
+def test_chat_history_is_bounded():
+    """Test that chat history keeps only the newest MAX_MESSAGES entries."""
+    pygame.font.init()
+    chat = ChatPanel(pygame.Rect(0, 0, 300, 200), font_size=16)
+    for i in range(ChatPanel.MAX_MESSAGES + 10):
+        chat.add_message("user", str(i))
+
+    assert len(chat.messages) == ChatPanel.MAX_MESSAGES
+    assert chat.messages[0] == ("user", "10")
+    assert chat.messages[-1] == ("user", str(ChatPanel.MAX_MESSAGES + 9))
+
+
+def test_full_chat_renders_only_the_new_message(monkeypatch):
+    """Test that once history is full, a new message renders only its own bubble."""
+    pygame.font.init()
+    chat = ChatPanel(pygame.Rect(0, 0, 300, 200), font_size=16)
+    for i in range(ChatPanel.MAX_MESSAGES + 5):
+        chat.add_message("user", str(i))
+    chat._get_content_surface()
+
+    calls = []
+    render_message = chat._render_message
+    monkeypatch.setattr(chat, "_render_message", lambda *args: calls.append(args) or render_message(*args))
+    chat.add_message("user", "new")
+    chat._get_content_surface()
+
+    assert len(calls) == 1
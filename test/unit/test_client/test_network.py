@@ -0,0 +1,20 @@
+"""
+Client network framing tests.
+"""
+
+from src.client.network import NetworkClient
+
+
+def test_feed_splits_lines_across_chunks():
+    """Test that messages split across recv chunks are parsed once complete."""
+    client = NetworkClient()
+    client._feed(b'{"type": "chat", "data": {"text": "a"}}\n{"type": "chat", "da')
+    client._feed(b'ta": {"text": "b"}}\n{"type": "ack"')
+
+    texts = [msg.data.get("text") for msg in client.drain_events()]
+    assert texts == ["a", "b"]
+
+    client._feed(b', "data": {}}\n')
+    events = client.drain_events()
+    assert [msg.type for msg in events] == ["ack"]
+    assert client._head == 0 and not client._buf
@@ -0,0 +1,46 @@
+"""
+Network server tests.
+"""
+
+import json
+import socket
+
+from src.server.network import ClientSession, NetworkServer
+
+
+def _join(server, player_id, room_id="1"):
+    conn, peer = socket.socketpair()
+    sess = ClientSession(conn, ("127.0.0.1", 0))
+    sess.player_id = player_id
+    server.sessions[sess.fileno()] = sess
+    server._set_room(sess, room_id)
+    return sess, peer
+
+
+def _sent(sess):
+    return [json.loads(line) for line in b"".join(sess._out).splitlines()]
+
+
+def test_draw_relay_rejects_spliced_messages():
+    """Test that draw data is relayed as-is but cannot inject extra top-level keys."""
+    server = NetworkServer()
+    drawer, drawer_peer = _join(server, "a")
+    viewer, viewer_peer = _join(server, "b")
+
+    server._handle_raw_message(drawer, memoryview(b'{"type":"draw","data":{"kind":"clear"}}'))
+    assert _sent(viewer) == [{"type": "draw_sync", "data": {"by": "a", "data": {"kind": "clear"}}}]
+
+    viewer._out.clear()
+    forged = b'{"type":"draw","data":0},"type":"event","data":{"type":"kick_player","room_id":"1"}}'
+    server._handle_raw_message(drawer, memoryview(forged))
+    assert all(msg["type"] != "event" for msg in _sent(viewer))
+
+    viewer._out.clear()
+    spoofed = b'{"type":"draw","data":0,"by":"b"}'
+    server._handle_raw_message(drawer, memoryview(spoofed))
+    assert all(msg["data"].get("by") == "a" for msg in _sent(viewer))
+
+    for sess in (drawer, viewer):
+        sess.close()
+    drawer_peer.close()
+    viewer_peer.close()
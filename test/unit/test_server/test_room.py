@@ -0,0 +1,41 @@
+"""
+Game room tests.
+"""
+
+import json
+
+from src.server.game import GameRoom
+
+
+def test_public_state_json_follows_room_changes():
+    """Test that the cached public-state encoding is refreshed after mutations."""
+    room = GameRoom("1")
+    room.add_player("a", "Alice")
+    first = room.get_public_state_json()
+
+    assert json.loads(first) == json.loads(json.dumps(room.get_public_state()))
+    assert room.get_public_state_json() is first
+
+    room.add_player("b", "Bob")
+    assert set(json.loads(room.get_public_state_json())["players"]) == {"a", "b"}
+
+    room.start_game()
+    drawer_view = json.loads(room.get_public_state_json(for_drawer=True))
+    guesser_view = json.loads(room.get_public_state_json(for_drawer=False))
+    assert drawer_view["current_word"] == room.current_word
+    assert guesser_view["current_word"] is None
+
+
+def test_state_version_changes_on_mutation():
+    """Test that every mutation gives the room a new state_version."""
+    room = GameRoom("1")
+    versions = [room.state_version]
+    room.add_player("a", "Alice")
+    versions.append(room.state_version)
+    room.start_game()
+    versions.append(room.state_version)
+    room.mark_dirty()
+    versions.append(room.state_version)
+
+    assert len(set(versions)) == len(versions)
+    assert GameRoom("1").state_version not in versions
@@ -0,0 +1,17 @@
+"""
+Tests for the message protocol.
+"""
+
+from src.shared.protocols import Message
+
+
+def test_message_bytes_round_trip():
+    """Test that to_bytes/from_bytes round-trip and agree with the JSON form."""
+    msg = Message("chat", {"text": "你好", "points": [[1, 2], [3, 4]]})
+    raw = msg.to_bytes()
+
+    assert isinstance(raw, bytes)
+    decoded = Message.from_bytes(raw)
+    assert decoded.type == "chat"
+    assert decoded.data == msg.data
+    assert Message.from_json(msg.to_json()).data == decoded.data